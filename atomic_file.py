@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+from profiler import profiler
+
+DURABILITY_ALWAYS = "always"  # fsync при каждом сохранении
+DURABILITY_BATCHED = "batched"  # Снимок — с fsync, журнал — не чаще раза в SYNC_INTERVAL секунд
+DURABILITY_NONE = "none"  # Без fsync: защита только от сбоя процесса, но не от отключения питания
+DURABILITY_MODES = (DURABILITY_ALWAYS, DURABILITY_BATCHED, DURABILITY_NONE)
+
+
+def fsync_directory(path: str):
+    """
+    Сбрасывает на диск запись каталога, чтобы переименование или создание файла пережило сбой.
+    На системах, где каталог нельзя открыть (Windows), ничего не делает.
+
+    :param path: Путь к файлу, каталог которого нужно сбросить.
+    """
+    if os.name != "posix":
+        return
+    descriptor = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def backup_path(filename: str, number: int):
+    """
+    Возвращает путь к резервной копии файла с указанным номером (1 — самая свежая).
+
+    :param filename: Имя файла.
+    :param number: Номер копии.
+    :return: str
+    """
+    return f"{filename}.bak{number}"
+
+
+class AtomicFile:
+    """
+    Запись файла целиком с атомарной заменой.
+
+    Данные пишутся во временный файл в том же каталоге, сбрасываются на диск
+    (fsync) и только затем подменяют прежний файл через os.replace. При сбое
+    на любом шаге на диске остаётся либо старая, либо новая версия, но не
+    оборванная. Перед заменой прежняя версия может сохраняться в ротируемые
+    резервные копии.
+
+    Использование::
+
+        with AtomicFile("notes_data.json") as temp:
+            write_everything(temp)
+    """
+    def __init__(self, filename: str, durability: str = DURABILITY_ALWAYS, backups: int = 0):
+        """
+        Инициализация записи.
+
+        :param filename: Имя итогового файла.
+        :param durability: Режим надёжности (DURABILITY_ALWAYS, DURABILITY_BATCHED или DURABILITY_NONE).
+        :param backups: Количество хранимых резервных копий прежних версий (0 — не хранить).
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Неизвестный режим надёжности: {durability}")
+        self.filename = filename
+        self.durability = durability
+        self.backups = backups
+        self.temp = None  # Путь к временному файлу на время записи
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        descriptor, self.temp = tempfile.mkstemp(
+            prefix=os.path.basename(self.filename) + ".", suffix=".tmp", dir=directory)
+        os.close(descriptor)
+        return self.temp
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.commit()
+        finally:
+            if os.path.exists(self.temp):
+                os.remove(self.temp)
+        return False
+
+    def commit(self):
+        """
+        Сбрасывает временный файл на диск и атомарно подменяет им итоговый файл.
+        """
+        if self.durability != DURABILITY_NONE:
+            with open(self.temp, 'ab') as file:
+                os.fsync(file.fileno())
+        if profiler.enabled:
+            profiler.count("bytes_written", os.path.getsize(self.temp))
+        if self.backups > 0:
+            self._rotate_backups()
+        os.replace(self.temp, self.filename)
+        if self.durability != DURABILITY_NONE:
+            fsync_directory(self.filename)
+
+    def _rotate_backups(self):
+        """
+        Сдвигает резервные копии на один номер и делает копию текущей версии файла.
+        Текущий файл не перемещается, а связывается жёсткой ссылкой (или копируется),
+        поэтому он существует на диске в любой момент ротации.
+        """
+        if not os.path.exists(self.filename):
+            return
+        for number in range(self.backups - 1, 0, -1):
+            if os.path.exists(backup_path(self.filename, number)):
+                os.replace(backup_path(self.filename, number), backup_path(self.filename, number + 1))
+        newest = backup_path(self.filename, 1)
+        if os.path.exists(newest):
+            os.remove(newest)
+        try:
+            os.link(self.filename, newest)
+        except OSError:  # Файловая система без жёстких ссылок
+            shutil.copyfile(self.filename, newest)
@@ -0,0 +1,78 @@
+"""
+Замер сжатых снимков: размер файла, время записи и потоковой загрузки для gzip,
+xz и zlib со словарём по сравнению с обычным JSON.
+
+Кроме синтетического набора замеряется небольшой файл из первых заметок
+(--small), на котором заметнее выигрыш от предустановленного словаря,
+и, если указан, настоящий файл заметок (--file).
+
+Запуск: python benchmarks/bench_compression.py [--count 100000] [--small 200] [--file notes_data.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compressed_file import COMPRESSION_MODES
+from data_serializer import DataSerializer
+from note import Note
+from synthetic import generate_notes
+
+
+def measure(notes, filename, compression, repeat):
+    """Возвращает размер файла и лучшее время записи и загрузки (секунды) для способа сжатия."""
+    DataSerializer.COMPRESSION = compression
+    save = load = float("inf")
+    for _ in range(repeat):
+        DataSerializer.fragments(filename).clear()  # Замеряется полная запись, а не только изменённых заметок
+        started = time.perf_counter()
+        DataSerializer.save(notes, filename)
+        save = min(save, time.perf_counter() - started)
+        started = time.perf_counter()
+        for _ in DataSerializer.iter_load(filename):
+            pass
+        load = min(load, time.perf_counter() - started)
+    return {"bytes": os.path.getsize(filename), "save": save, "load": load}
+
+
+def compare(notes, directory, repeat):
+    """Замеряет все способы сжатия на одном наборе заметок."""
+    results = {}
+    for compression in (None,) + COMPRESSION_MODES:
+        filename = os.path.join(directory, f"notes_{compression or 'json'}.json")
+        results[compression or "json"] = measure(notes, filename, compression, repeat)
+    plain = results["json"]["bytes"]
+    for result in results.values():
+        result["ratio"] = round(plain / result["bytes"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="количество заметок")
+    parser.add_argument("--small", type=int, default=200, help="количество заметок в небольшом файле")
+    parser.add_argument("--file", help="файл заметок, который замеряется дополнительно")
+    parser.add_argument("--repeat", type=int, default=3, help="количество повторов (берётся лучшее время)")
+    parser.add_argument("--seed", type=int, default=1, help="начальное значение генератора")
+    args = parser.parse_args()
+
+    DataSerializer.DURABILITY = "none"  # Замеряется сжатие и запись, а не fsync
+    DataSerializer.LAZY_CONTENT = False
+    notes = list(generate_notes(args.count, args.seed))
+    with tempfile.TemporaryDirectory() as directory:
+        results = {"count": args.count, "results": compare(notes, directory, args.repeat),
+                   "small": {"count": args.small, "results": compare(notes[:args.small], directory, args.repeat)}}
+        if args.file:
+            # Элементы читаются без журнала: загрузка файла старого формата переписала бы его
+            sample = [Note.from_dict(item) for item in DataSerializer.iter_items_from_file(args.file)]
+            results["file"] = {"count": len(sample), "results": compare(sample, directory, args.repeat)}
+
+    print(json.dumps(results, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Замер записи снимка с кэшем JSON-фрагментов: время сохранения в зависимости
+от количества изменённых заметок и полная перекодировка для сравнения.
+
+Время кодирования растёт с количеством правок, время записи — с размером файла.
+
+Запуск: python benchmarks/bench_incremental_save.py [--count 100000] [--edits 0 10 100 1000 10000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_serializer import DataSerializer
+from synthetic import generate_notes
+
+
+def timed_save(notes, filename):
+    """Возвращает время записи снимка в секундах."""
+    started = time.perf_counter()
+    DataSerializer.save(notes, filename)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="количество заметок")
+    parser.add_argument("--edits", type=int, nargs="+", default=[0, 10, 100, 1000, 10000],
+                        help="количество изменённых заметок между сохранениями")
+    parser.add_argument("--seed", type=int, default=1, help="начальное значение генератора")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    DataSerializer.DURABILITY = "none"  # Замеряется кодирование и запись, а не fsync
+    notes = list(generate_notes(args.count, args.seed))
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "notes_data.json")
+        DataSerializer.CACHE_FRAGMENTS = False
+        full = timed_save(notes, filename)
+        DataSerializer.CACHE_FRAGMENTS = True
+        results = {"full_encode": full, "first_cached_save": timed_save(notes, filename), "edits": {}}
+        for edits in args.edits:
+            for note in random.sample(notes, edits):
+                note.title = note.title + "!"
+            # Кодирование (растёт с количеством правок) замеряется отдельно от записи файла (растёт с его размером)
+            fragments = DataSerializer.fragments(filename)
+            started = time.perf_counter()
+            for _ in fragments.fragments(notes):
+                pass
+            encode = time.perf_counter() - started
+            encoded, reused = fragments.misses, fragments.hits
+            write = timed_save(notes, filename)
+            results["edits"][edits] = {"encode": encode, "write": write, "save": encode + write,
+                                       "encoded": encoded, "reused": reused}
+
+    print(json.dumps({"count": args.count, "results": results}, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
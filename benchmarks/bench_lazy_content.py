@@ -0,0 +1,67 @@
+"""
+Сравнение памяти после загрузки двоичного снимка: тексты заметок в памяти
+и тексты, оставленные в файле (ленивая загрузка с кэшем недавно прочитанных).
+
+Запуск: python benchmarks/bench_lazy_content.py [--count 100000] [--length 2000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from note import Note
+from binary_snapshot import BinarySnapshot
+
+CATEGORIES = ["Работа", "Дом", "Здоровье и Спорт", "Люди", "Документы", "Финансы", "Разное"]
+
+
+def make_snapshot(filename, count, length):
+    """Записывает двоичный снимок с заметками заданной длины текста."""
+    body = ("Текст заметки " * (length // 14 + 1))[:length]
+    BinarySnapshot.save((Note(f"Заметка {i}", body, CATEGORIES[i % len(CATEGORIES)], f"{i:032x}")
+                         for i in range(count)), filename)
+
+
+def measure(filename, count, lazy):
+    """
+    Возвращает (время загрузки в секундах, байт на заметку после загрузки,
+    байт на заметку после чтения текстов ста заметок).
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    notes = [Note.from_dict(item) for item in BinarySnapshot.iter_items(filename, lazy=lazy)]
+    elapsed = time.perf_counter() - started
+    loaded_size = tracemalloc.get_traced_memory()[0]
+    for note in notes[:100]:
+        note.content
+    viewed_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del notes
+    return elapsed, loaded_size / count, viewed_size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="количество заметок")
+    parser.add_argument("--length", type=int, default=2000, help="длина текста заметки в символах")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "notes.bin")
+        make_snapshot(filename, args.count, args.length)
+        eager = measure(filename, args.count, lazy=False)
+        lazy = measure(filename, args.count, lazy=True)
+
+    print(f"Заметок: {args.count}, длина текста: {args.length}")
+    print(f"{'':<12}{'загрузка, с':>14}{'байт/заметку':>16}{'после просмотра':>18}")
+    for name, (elapsed, loaded_size, viewed_size) in (("тексты", eager), ("заголовки", lazy)):
+        print(f"{name:<12}{elapsed:>14.2f}{loaded_size:>16.0f}{viewed_size:>18.0f}")
+    print(f"Память после загрузки: {100 * (1 - lazy[1] / eager[1]):.0f}% меньше.")
+
+
+if __name__ == "__main__":
+    main()
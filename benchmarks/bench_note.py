@@ -0,0 +1,94 @@
+"""
+Сравнение расхода памяти и времени загрузки заметок:
+прежнее представление (атрибуты в __dict__, разбор дат при загрузке)
+и текущее (__slots__, интернированные категории, ленивый разбор дат).
+
+Запуск: python benchmarks/bench_note.py [--count 1000000]
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from note import Note
+
+CATEGORIES = ["Работа", "Дом", "Здоровье и Спорт", "Люди", "Документы", "Финансы", "Разное"]
+
+
+class EagerNote:
+    """Прежнее представление заметки (для сравнения)."""
+    def __init__(self, title, content, category="Разное"):
+        self._title = title
+        self._content = content
+        self._category = category
+        self._created_at = datetime.datetime.now()
+        self._modified_at = datetime.datetime.now()
+
+    @staticmethod
+    def from_dict(data):
+        note = EagerNote(data["title"], data["content"], data.get("category", "Разное"))
+        note._created_at = datetime.datetime.fromisoformat(data["created_at"])
+        note._modified_at = datetime.datetime.fromisoformat(data["modified_at"])
+        return note
+
+
+def make_json(count):
+    """Текст JSON-файла с заметками."""
+    stamp = datetime.datetime(2024, 12, 14, 17, 23)
+    return json.dumps([{
+        "id": f"{i:032x}",
+        "title": f"Заметка {i}",
+        "content": "Текст",
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "created_at": (stamp + datetime.timedelta(seconds=i)).isoformat(),
+        "modified_at": (stamp + datetime.timedelta(seconds=i, microseconds=5)).isoformat(),
+    } for i in range(count)], ensure_ascii=False)
+
+
+def measure(factory, text, count):
+    """
+    Возвращает (время построения заметок в секундах, байт на заметку сразу после загрузки,
+    байт на заметку после обращения к датам всех заметок).
+    Учитывается всё, что остаётся в памяти после загрузки, включая строки из разобранного JSON.
+    """
+    tracemalloc.start()
+    items = json.loads(text)
+    started = time.perf_counter()
+    notes = [factory(item) for item in items]
+    elapsed = time.perf_counter() - started
+    del items  # Словари из JSON больше не нужны; остаётся только то, на что ссылаются заметки
+    loaded_size = tracemalloc.get_traced_memory()[0]
+    if isinstance(notes[0], Note):
+        for note in notes:
+            note.created_at, note.modified_at
+    parsed_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del notes
+    return elapsed, loaded_size / count, parsed_size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="количество заметок")
+    args = parser.parse_args()
+
+    text = make_json(args.count)
+    eager = measure(EagerNote.from_dict, text, args.count)
+    compact = measure(Note.from_dict, text, args.count)
+
+    print(f"Заметок: {args.count}")
+    print(f"{'':<12}{'загрузка, с':>14}{'байт/заметку':>16}{'после разбора дат':>20}")
+    for name, (elapsed, loaded_size, parsed_size) in (("прежняя", eager), ("компактная", compact)):
+        print(f"{name:<12}{elapsed:>14.2f}{loaded_size:>16.0f}{parsed_size:>20.0f}")
+    print(f"Ускорение загрузки: {eager[0] / compact[0]:.1f}x; "
+          f"память после разбора дат: {100 * (1 - compact[2] / eager[2]):.0f}% меньше. "
+          f"Пока даты не разобраны, строки ISO занимают больше, чем объекты datetime.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Сравнение одного файла заметок и хранилища, разделённого на части:
+холодная загрузка, построение поискового индекса и выгрузка в JSON
+в одном процессе и в нескольких процессах.
+
+Запуск: python benchmarks/bench_sharded.py [--count 200000] [--shards 8] [--workers 4]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_serializer import DataSerializer
+from search_index import SearchIndex
+from sharded_serializer import ShardedSerializer
+from synthetic import generate_notes
+
+
+def timed(function, *args):
+    """Возвращает время выполнения функции в секундах."""
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def measure_single(filename, output):
+    """Замеры для одного файла (DataSerializer)."""
+    notes = []
+    return {
+        "load": timed(lambda: notes.extend(DataSerializer.iter_load(filename))),
+        "search_index": timed(lambda: SearchIndex().sync(notes)),
+        "export": timed(DataSerializer.export_json, notes, output),
+    }
+
+
+def measure_sharded(directory, output, workers):
+    """Замеры для каталога частей (ShardedSerializer) с заданным количеством процессов."""
+    ShardedSerializer.WORKERS = workers
+    notes = []
+    return {
+        "load": timed(lambda: notes.extend(ShardedSerializer.iter_load(directory))),
+        "search_index": timed(ShardedSerializer.search_index, notes, directory),
+        "export": timed(ShardedSerializer.export_json, directory, output),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="количество заметок")
+    parser.add_argument("--shards", type=int, default=8, help="количество частей")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="количество процессов")
+    args = parser.parse_args()
+
+    ShardedSerializer.SHARDS = args.shards
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "notes_data.json")
+        shards = os.path.join(directory, "notes_data.shards")
+        output = os.path.join(directory, "export.json")
+        notes = list(generate_notes(args.count))
+        DataSerializer.save(notes, filename)
+        ShardedSerializer.save(notes, shards)
+        del notes
+        results = {
+            "single_file": measure_single(filename, output),
+            "sharded_1_process": measure_sharded(shards, output, 1),
+            f"sharded_{args.workers}_processes": measure_sharded(shards, output, args.workers),
+        }
+
+    print(json.dumps({"count": args.count, "shards": args.shards, "cpus": os.cpu_count(), "results": results},
+                     ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
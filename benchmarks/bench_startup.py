@@ -0,0 +1,57 @@
+"""
+Замер холодного запуска приложения: время до показа окна с первым экраном
+и до окончания загрузки всех заметок.
+
+Приложение запускается отдельным процессом (Qt в режиме offscreen) в пустом
+каталоге с синтетическим файлом заметок. Первый запуск идёт без кэшей
+(поисковый индекс и первый экран строятся заново), следующие — с кэшами,
+сохранёнными при закрытии предыдущего.
+
+Запуск: python benchmarks/bench_startup.py [--count 100000] [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_serializer import DataSerializer
+from synthetic import generate_notes
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+STAGES = ("imports", "startup_window", "startup_loaded")  # Этапы запуска из трассировки приложения
+
+
+def start_once(directory: str):
+    """
+    Запускает приложение до окончания загрузки и возвращает длительности этапов запуска в секундах.
+    """
+    trace_file = os.path.join(directory, "trace.json")
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    subprocess.run([sys.executable, MAIN, "--quit-after-load", "--trace", trace_file],
+                   cwd=directory, env=environment, check=True, capture_output=True)
+    with open(trace_file, encoding="utf-8") as file:
+        events = json.load(file)["traceEvents"]
+    return {event["name"]: event["dur"] / 1e6 for event in events if event["name"] in STAGES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="количество заметок")
+    parser.add_argument("--runs", type=int, default=3, help="количество запусков с кэшами")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        DataSerializer.save_to_file(generate_notes(args.count), os.path.join(directory, "notes_data.json"))
+        results = {"cold": start_once(directory)}
+        warm = [start_once(directory) for _ in range(args.runs)]
+        results["cached"] = {name: min(run[name] for run in warm) for name in STAGES}
+
+    print(json.dumps({"count": args.count, "results": results}, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
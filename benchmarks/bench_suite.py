@@ -0,0 +1,185 @@
+"""
+Замеры производительности хранения, поиска и обновления списка заметок.
+
+Для каждого размера набора (синтетические заметки, см. synthetic.py) замеряются
+сохранение (с кэшем JSON-фрагментов и без него) и загрузка (JSON и двоичный
+снимок), Note.from_dict и to_dict, построение поискового индекса и поиск,
+фильтр по категории, сортировка и обновление модели списка в Qt без экрана
+(offscreen). Время каждой операции — лучшее из нескольких повторов. Результаты
+выводятся в JSON и могут быть сравнены с сохранённым эталоном: замедление
+больше допуска считается регрессией.
+
+Запуск:
+    python benchmarks/bench_suite.py [--sizes 10000 100000 1000000] [--output results.json]
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json [--tolerance 0.5]
+    python benchmarks/bench_suite.py --sizes 10000 --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+from note import Note
+from note_store import NoteStore
+from note_category import CategoryIndex
+from note_table import NoteTable
+from note_list_model import NoteListModel
+from search_index import SearchIndex
+from data_serializer import DataSerializer
+from synthetic import generate_notes, search_queries
+
+DEFAULT_SIZES = [10_000, 100_000]  # Размеры наборов по умолчанию (1 000 000 — по запросу)
+DEFAULT_REPEAT = 3  # Количество повторов каждого замера
+DEFAULT_TOLERANCE = 0.5  # Допустимое замедление относительно эталона (0.5 — на 50%)
+FIRST_SCREEN = 50  # Количество строк списка, отрисовываемых после обновления
+
+
+def best_of(repeat: int, action, setup=None):
+    """
+    Возвращает лучшее время выполнения action из repeat повторов (в секундах).
+    setup (если задан) вызывается перед каждым повтором и в замер не входит.
+    """
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_size(count: int, repeat: int, seed: int):
+    """
+    Выполняет замеры для набора из count заметок.
+
+    :return: dict "операция -> время в секундах"
+    """
+    notes = list(generate_notes(count, seed))
+    repeat_heavy = 1 if count >= 1_000_000 else repeat  # Тяжёлые операции на миллионе заметок — один раз
+    results = {}
+
+    items = [note.to_dict() for note in notes]
+    results["to_dict"] = best_of(repeat_heavy, lambda: [note.to_dict() for note in notes])
+    results["from_dict"] = best_of(repeat_heavy, lambda: [Note.from_dict(item) for item in items])
+    del items
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, binary in (("json", False), ("binary", True)):
+            filename = os.path.join(directory, f"notes.{name}")
+
+            def save():
+                DataSerializer.save_to_file(notes, filename, binary=binary)
+
+            # Холодное сохранение: кэш JSON-фрагментов сбрасывается, и каждая заметка кодируется заново
+            results[f"save_{name}"] = best_of(repeat_heavy, save, DataSerializer.fragments(filename).clear)
+            if not binary:
+                # Повторное сохранение без изменений: фрагменты берутся из кэша
+                results["save_json_cached"] = best_of(repeat_heavy, save)
+            results[f"load_{name}"] = best_of(repeat_heavy, lambda: DataSerializer.load(filename))
+
+    def build_index():
+        index = SearchIndex()
+        for note in notes:
+            index.add(note)
+        return index
+
+    store = NoteStore(notes)
+    results["index_build"] = best_of(repeat_heavy, build_index)
+    index = build_index()
+    queries = search_queries()
+    results["search"] = best_of(repeat, lambda: [index.search(query) for query in queries]) / len(queries)
+
+    table = NoteTable(notes)
+    categories = CategoryIndex(notes)
+    results["category_filter"] = best_of(repeat, lambda: categories.ids("Работа"))
+    results["category_filter_table"] = best_of(repeat, lambda: table.view(category="Работа"))
+    results["sort_title"] = best_of(repeat, lambda: table.view(sort="title"))
+    results["sort_created_at"] = best_of(repeat, lambda: table.view(sort="created_at", descending=True))
+
+    model = NoteListModel(store, table=table, categories=categories)
+
+    def refresh(sort_key):
+        model.filter.sort_key = sort_key
+        model.refresh()
+        for row in range(min(FIRST_SCREEN, model.rowCount())):
+            model.data(model.index(row), Qt.DisplayRole)
+
+    results["list_refresh"] = best_of(repeat, lambda: refresh(None))
+    results["list_refresh_sorted"] = best_of(repeat, lambda: refresh("title"))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """
+    Сравнивает результаты с эталоном.
+
+    :param results: Результаты замеров ("размер -> операция -> время").
+    :param baseline: Эталон в том же виде; допуск отдельной операции можно задать
+                     в его разделе "thresholds" ("операция -> допуск").
+    :param tolerance: Допуск по умолчанию (доля допустимого замедления).
+    :return: list of str — описания регрессий
+    """
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    for size, timings in results.items():
+        reference = baseline.get("results", {}).get(size, {})
+        for name, elapsed in timings.items():
+            if name not in reference:
+                continue
+            limit = reference[name] * (1 + thresholds.get(name, tolerance))
+            if elapsed > limit:
+                regressions.append(f"{size}/{name}: {elapsed:.4f} с при эталоне {reference[name]:.4f} с "
+                                   f"(допуск {thresholds.get(name, tolerance):.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="размеры наборов заметок")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="количество повторов замера")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора заметок")
+    parser.add_argument("--output", help="файл для результатов в JSON (по умолчанию — вывод на экран)")
+    parser.add_argument("--baseline", help="эталон для проверки регрессий")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="допустимое замедление")
+    parser.add_argument("--save-baseline", help="сохранить результаты как эталон")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])  # Модели Qt нужен экземпляр приложения
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": {str(count): run_size(count, args.repeat, args.seed) for count in args.sizes},
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(dict(report, thresholds={}), file, ensure_ascii=False, indent=4)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(report["results"], json.load(file), args.tolerance)
+        for line in regressions:
+            print(f"Регрессия: {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
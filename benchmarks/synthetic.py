@@ -0,0 +1,90 @@
+"""
+Генератор синтетических заметок для замеров производительности.
+
+Распределения приближены к реальным: категории встречаются с разной частотой,
+слова выбираются по закону Ципфа из словаря в несколько тысяч слов, длина
+текста распределена логнормально (много коротких заметок и редкие длинные),
+даты создания разбросаны по трём годам. Генерация детерминирована зерном.
+"""
+import datetime
+import itertools
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from note import Note
+
+# Категории и их доли среди заметок
+CATEGORY_WEIGHTS = {
+    "Работа": 0.28, "Дом": 0.20, "Люди": 0.12, "Разное": 0.12,
+    "Здоровье и Спорт": 0.10, "Финансы": 0.10, "Документы": 0.08,
+}
+BASE_WORDS = [
+    "отчёт", "встреча", "проект", "задача", "план", "купить", "позвонить", "врач", "тренировка",
+    "бюджет", "счёт", "договор", "паспорт", "ремонт", "квартира", "подарок", "день", "рождения",
+    "неделя", "месяц", "квартал", "срочно", "важно", "идея", "список", "покупки", "молоко", "хлеб",
+    "клиент", "презентация", "письмо", "ответить", "оплатить", "налог", "страховка", "отпуск",
+    "билеты", "гостиница", "бег", "бассейн", "витамины", "анализы", "запись", "мама", "друзья",
+    "коллеги", "собрание", "релиз", "ошибка", "исправить", "проверить", "документы", "справка",
+]
+SYLLABLES = ["ка", "ро", "ми", "ла", "то", "ве", "ни", "су", "да", "ре", "по", "ль", "ст", "ор", "ан", "ек"]
+VOCABULARY_SIZE = 5000  # Размер словаря (базовые слова и составленные из слогов)
+CONTENT_MEDIAN = 300  # Медианная длина текста в символах
+CONTENT_SIGMA = 1.0  # Разброс логарифма длины текста
+CONTENT_MAX = 20000  # Наибольшая длина текста в символах
+START = datetime.datetime(2022, 1, 1)  # Начало диапазона дат создания
+SPAN_SECONDS = 3 * 365 * 24 * 3600  # Ширина диапазона дат создания
+
+
+def vocabulary(size: int = VOCABULARY_SIZE):
+    """
+    Возвращает словарь: сначала частые базовые слова, затем слова из слогов.
+
+    :param size: Количество слов.
+    :return: list of str
+    """
+    words = list(BASE_WORDS)
+    for length in itertools.count(2):
+        for parts in itertools.product(SYLLABLES, repeat=length):
+            if len(words) >= size:
+                return words
+            words.append("".join(parts))
+
+
+def generate_notes(count: int, seed: int = 0):
+    """
+    Генерирует заметки с реалистичными распределениями категорий, слов и длины текста.
+
+    :param count: Количество заметок.
+    :param seed: Зерно генератора случайных чисел.
+    :return: iterator of Note
+    """
+    rng = random.Random(seed)
+    words = vocabulary()
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))  # Закон Ципфа
+    categories = list(CATEGORY_WEIGHTS)
+    category_weights = list(itertools.accumulate(CATEGORY_WEIGHTS.values()))
+    log_median = math.log(CONTENT_MEDIAN)
+    for number in range(count):
+        title = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(1, 6))).capitalize()
+        length = min(int(rng.lognormvariate(log_median, CONTENT_SIGMA)), CONTENT_MAX)
+        content = " ".join(rng.choices(words, cum_weights=cum_weights, k=max(1, length // 8)))
+        note = Note(title, content, rng.choices(categories, cum_weights=category_weights)[0], f"{number:032x}")
+        created = START + datetime.timedelta(seconds=rng.randrange(SPAN_SECONDS))
+        note._created_at = created
+        note._modified_at = created if rng.random() < 0.6 else created + datetime.timedelta(
+            seconds=rng.randrange(30 * 24 * 3600))
+        yield note
+
+
+def search_queries():
+    """
+    Возвращает запросы разной избирательности: частое слово, редкое слово, префикс и два слова.
+
+    :return: list of str
+    """
+    words = vocabulary()
+    return [words[0], words[len(words) // 2], words[1][:3], f"{words[2]} {words[5]}"]
@@ -0,0 +1,155 @@
+import datetime
+import mmap
+import struct
+from note_body import BodyFile, LazyBody
+from note_table import to_micros
+
+MAGIC = b"NOTEBIN\x00"  # Признак двоичного снимка в начале файла
+VERSION = 1  # Версия формата
+
+# Заголовок: признак, версия, флаги, количество заметок, количество категорий
+_HEADER = struct.Struct("<8sHHII")
+# Длина названия категории в таблице строк
+_STRING = struct.Struct("<H")
+# Запись заметки: код категории, дата создания и дата изменения (микросекунды от 1970-01-01),
+# длины идентификатора, заголовка и текста в байтах UTF-8; за записью следуют сами строки
+_RECORD = struct.Struct("<hqqHII")
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class BinarySnapshot:
+    """
+    Компактный двоичный снимок заметок.
+
+    Файл начинается с заголовка с признаком формата и версией, затем идёт
+    таблица строк с названиями категорий, затем записи заметок. В записи
+    категория хранится кодом из таблицы строк, даты — целыми числами
+    фиксированной ширины, а строки — с префиксом длины. Файл читается через
+    mmap без разбора текста, поэтому это быстрый путь загрузки;
+    JSON остаётся форматом для экспорта.
+
+    Длина текста записана перед строками, поэтому загрузчик может прочитать
+    только заголовки заметок, а текст оставить в файле (iter_items с lazy=True).
+    """
+    @staticmethod
+    def is_binary(filename: str):
+        """
+        Проверяет по первым байтам, является ли файл двоичным снимком.
+
+        :param filename: Имя файла.
+        :return: bool
+        """
+        try:
+            with open(filename, 'rb') as file:
+                return file.read(len(MAGIC)) == MAGIC
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def save(data, filename: str):
+        """
+        Сохраняет заметки в двоичный снимок. Тексты, оставленные в файле (LazyBody),
+        копируются байтами без декодирования.
+
+        :param data: Итерируемый набор заметок.
+        :param filename: Имя файла.
+        :return: list of (LazyBody, смещение текста в новом снимке) — для BodyFile.rebind
+        """
+        moved = []
+        notes = list(data)
+        categories = {}
+        for note in notes:
+            categories.setdefault(note.category, len(categories))
+        with open(filename, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, 0, len(notes), len(categories)))
+            for name in categories:
+                encoded = name.encode('utf-8')
+                file.write(_STRING.pack(len(encoded)) + encoded)
+            offset = file.tell()
+            for note in notes:
+                note_id = note.id.encode('utf-8')
+                title = note.title.encode('utf-8')
+                body = note.body
+                content = body.encode('utf-8') if isinstance(body, str) else body.raw()
+                file.write(_RECORD.pack(
+                    categories[note.category],
+                    to_micros(note.created_at),
+                    to_micros(note.modified_at),
+                    len(note_id), len(title), len(content),
+                ))
+                file.write(note_id + title + content)
+                offset += _RECORD.size + len(note_id) + len(title)
+                if not isinstance(body, str):
+                    moved.append((body, offset))
+                offset += len(content)
+        return moved
+
+    @staticmethod
+    def iter_items(filename: str, lazy: bool = False, cache_size: int = None):
+        """
+        Потоково читает заметки из двоичного снимка в виде словарей (как из JSON,
+        но с датами в виде datetime).
+
+        :param filename: Имя файла.
+        :param lazy: Не читать тексты: вместо текста в словаре будет ссылка на него в файле (LazyBody).
+        :param cache_size: Размер кэша прочитанных текстов при lazy=True (по умолчанию BodyFile.CACHE_SIZE).
+        :return: iterator of dict
+        :raises ValueError: Если файл не является снимком, оборван или версия формата не поддерживается.
+        """
+        if lazy:
+            # Отображение файла остаётся открытым, пока заметки ссылаются на тексты
+            yield from BinarySnapshot._iter_view(BodyFile(filename, cache_size))
+            return
+        with open(filename, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield from BinarySnapshot._iter_view(view)
+
+    @staticmethod
+    def _iter_view(source):
+        """
+        Разбирает снимок из отображения файла. Если передан BodyFile, тексты не читаются.
+        """
+        lazy = isinstance(source, BodyFile)
+        view = source.view if lazy else source
+        if len(view) < _HEADER.size:
+            raise ValueError("Двоичный снимок оборван.")
+        magic, version, _, count, category_count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Файл не является двоичным снимком заметок.")
+        if version > VERSION:
+            raise ValueError(f"Неподдерживаемая версия двоичного снимка: {version}.")
+        offset = _HEADER.size
+        categories = []
+        for _ in range(category_count):
+            if offset + _STRING.size > len(view):
+                raise ValueError("Двоичный снимок оборван.")
+            (length,) = _STRING.unpack_from(view, offset)
+            offset += _STRING.size
+            if offset + length > len(view):
+                raise ValueError("Двоичный снимок оборван.")
+            categories.append(view[offset:offset + length].decode('utf-8'))
+            offset += length
+        for _ in range(count):
+            if offset + _RECORD.size > len(view):
+                raise ValueError("Двоичный снимок оборван.")
+            code, created, modified, id_length, title_length, content_length = _RECORD.unpack_from(view, offset)
+            offset += _RECORD.size
+            if offset + id_length + title_length + content_length > len(view):
+                raise ValueError("Двоичный снимок оборван.")
+            note_id = view[offset:offset + id_length].decode('utf-8')
+            offset += id_length
+            title = view[offset:offset + title_length].decode('utf-8')
+            offset += title_length
+            if lazy:
+                content = LazyBody(source, offset, content_length)
+            else:
+                content = view[offset:offset + content_length].decode('utf-8')
+            offset += content_length
+            yield {
+                "id": note_id,
+                "title": title,
+                "content": content,
+                "category": categories[code],
+                "created_at": _EPOCH + datetime.timedelta(microseconds=created),
+                "modified_at": _EPOCH + datetime.timedelta(microseconds=modified),
+            }
@@ -0,0 +1,202 @@
+import gzip
+import io
+import lzma
+import zlib
+from fragment_cache import encode_note
+
+COMPRESSION_GZIP = "gzip"  # gzip (совместим с утилитами gzip/zcat)
+COMPRESSION_LZMA = "lzma"  # xz: сжимает сильнее, но медленнее
+COMPRESSION_ZLIB = "zlib"  # zlib с предустановленным словарём: лучше на небольших файлах
+COMPRESSION_MODES = (COMPRESSION_GZIP, COMPRESSION_LZMA, COMPRESSION_ZLIB)
+
+GZIP_MAGIC = b"\x1f\x8b"  # Первые байты файла gzip
+LZMA_MAGIC = b"\xfd7zXZ\x00"  # Первые байты файла xz
+ZLIB_MAGIC = b"NOTEZLIB"  # Первые байты файла zlib со словарём (за ними — версия словаря)
+LEVELS = {COMPRESSION_GZIP: 6, COMPRESSION_LZMA: 3, COMPRESSION_ZLIB: 6}  # Уровни сжатия по умолчанию
+BUFFER_SIZE = 1 << 16  # Размер буфера записи и порции чтения сжатого файла (байт)
+DICTIONARY_VERSION = 1  # Версия словаря, с которой записываются новые файлы
+
+# Строки словаря версии 1. Не меняются: от словаря зависят уже записанные файлы
+_DICTIONARY_KEYS = ("id", "title", "content", "category", "created_at", "modified_at")
+_DICTIONARY_CATEGORIES = ("Все", "Работа", "Дом", "Здоровье и Спорт", "Люди", "Документы", "Финансы", "Разное")
+_dictionaries = {}  # Версия -> словарь (строится при первом обращении)
+
+# Ошибки, с которыми обрывается чтение повреждённого сжатого файла
+DECOMPRESSION_ERRORS = (EOFError, zlib.error, lzma.LZMAError, gzip.BadGzipFile)
+
+
+def dictionary(version: int = DICTIONARY_VERSION):
+    """
+    Возвращает предустановленный словарь zlib: элементы снимка с именами полей
+    и категориями в том виде, в каком они записываются в JSON. Строки, которые
+    встречаются чаще, стоят ближе к концу словаря — zlib кодирует их короче.
+
+    :param version: Версия словаря (записана в заголовке файла).
+    :return: bytes
+    :raises ValueError: Если версия неизвестна.
+    """
+    if version != 1:
+        raise ValueError(f"Неизвестная версия словаря сжатия: {version}.")
+    if version not in _dictionaries:
+        stamp = "2024-01-01T00:00:00.000000"
+        fragments = [encode_note(dict(zip(_DICTIONARY_KEYS, ("", "", "", category, stamp, stamp))))
+                     for category in reversed(_DICTIONARY_CATEGORIES)]
+        _dictionaries[version] = b"[\n" + b",\n".join(fragments) + b"\n]"
+    return _dictionaries[version]
+
+
+def detect(filename: str):
+    """
+    Определяет способ сжатия файла по первым байтам.
+
+    :param filename: Имя файла.
+    :return: COMPRESSION_GZIP, COMPRESSION_LZMA, COMPRESSION_ZLIB или None (файл не сжат).
+    :raises FileNotFoundError: Если файла нет.
+    """
+    with open(filename, 'rb') as file:
+        head = file.read(len(ZLIB_MAGIC))
+    if head.startswith(GZIP_MAGIC):
+        return COMPRESSION_GZIP
+    if head.startswith(LZMA_MAGIC):
+        return COMPRESSION_LZMA
+    if head == ZLIB_MAGIC:
+        return COMPRESSION_ZLIB
+    return None
+
+
+def open_write(filename: str, compression: str = None, level: int = None):
+    """
+    Открывает файл для потоковой записи со сжатием.
+    Данные сжимаются по мере записи, весь файл в памяти не собирается.
+
+    :param filename: Имя файла.
+    :param compression: Способ сжатия (None — без сжатия).
+    :param level: Уровень сжатия (по умолчанию из LEVELS).
+    :return: Двоичный файловый объект для записи.
+    :raises ValueError: Если способ сжатия неизвестен.
+    """
+    if compression is None:
+        return open(filename, 'wb')
+    if compression not in COMPRESSION_MODES:
+        raise ValueError(f"Неизвестный способ сжатия: {compression}.")
+    level = LEVELS[compression] if level is None else level
+    if compression == COMPRESSION_GZIP:
+        raw = _GzipWriter(filename, level)
+    elif compression == COMPRESSION_LZMA:
+        raw = lzma.LZMAFile(filename, 'wb', preset=level)
+    else:
+        raw = _ZlibWriter(filename, level)
+    return io.BufferedWriter(raw, BUFFER_SIZE)  # Мелкие записи (фрагменты заметок) сжимаются порциями
+
+
+def open_read(filename: str):
+    """
+    Открывает файл для потокового чтения, распаковывая его, если он сжат.
+
+    :param filename: Имя файла.
+    :return: Двоичный файловый объект для чтения.
+    :raises FileNotFoundError: Если файла нет.
+    """
+    compression = detect(filename)
+    if compression is None:
+        return open(filename, 'rb')
+    if compression == COMPRESSION_GZIP:
+        return gzip.open(filename, 'rb')
+    if compression == COMPRESSION_LZMA:
+        return lzma.open(filename, 'rb')
+    return io.BufferedReader(_ZlibReader(filename), BUFFER_SIZE)
+
+
+def open_text(filename: str):
+    """
+    Открывает файл для потокового чтения текста UTF-8, распаковывая его, если он сжат.
+
+    :param filename: Имя файла.
+    :return: Текстовый файловый объект.
+    :raises FileNotFoundError: Если файла нет.
+    """
+    if detect(filename) is None:
+        return open(filename, 'r', encoding='utf-8')
+    return io.TextIOWrapper(open_read(filename), encoding='utf-8')
+
+
+class _GzipWriter(gzip.GzipFile):
+    """
+    Запись gzip без имени и времени в заголовке: одинаковые данные дают одинаковый файл.
+    """
+
+    def __init__(self, filename: str, level: int):
+        self._target = open(filename, 'wb')
+        super().__init__(filename="", mode='wb', compresslevel=level, fileobj=self._target, mtime=0)
+
+    def close(self):
+        target, self._target = self._target, None
+        try:
+            super().close()
+        finally:
+            if target is not None:
+                target.close()
+
+
+class _ZlibWriter(io.RawIOBase):
+    """
+    Запись потока zlib с предустановленным словарём после заголовка ZLIB_MAGIC и версии словаря.
+    """
+
+    def __init__(self, filename: str, level: int):
+        self._file = open(filename, 'wb')
+        self._file.write(ZLIB_MAGIC + bytes([DICTIONARY_VERSION]))
+        self._compressor = zlib.compressobj(level, zdict=dictionary())
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._file.write(self._compressor.compress(data))
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._file.write(self._compressor.flush())
+            finally:
+                self._file.close()
+        super().close()
+
+
+class _ZlibReader(io.RawIOBase):
+    """
+    Чтение потока zlib с предустановленным словарём (версия словаря — из заголовка).
+    """
+
+    def __init__(self, filename: str):
+        self._file = open(filename, 'rb')
+        header = self._file.read(len(ZLIB_MAGIC) + 1)
+        try:
+            self._decompressor = zlib.decompressobj(zdict=dictionary(header[-1]))
+        except ValueError:
+            self._file.close()
+            raise
+        self._buffer = b""  # Распакованные, но ещё не прочитанные данные
+        self._position = 0  # Позиция чтения в _buffer
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while self._position == len(self._buffer):
+            if self._decompressor.eof:
+                return 0
+            chunk = self._file.read(BUFFER_SIZE)
+            if not chunk:
+                raise EOFError("Сжатый файл оборван до конца потока.")
+            self._buffer, self._position = self._decompressor.decompress(chunk), 0
+        size = min(len(target), len(self._buffer) - self._position)
+        target[:size] = self._buffer[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
@@ -1,25 +1,275 @@
 import json
+import os
+import shutil
+from atomic_file import AtomicFile, DURABILITY_ALWAYS, backup_path
 from note import Note
+from note_body import BodyFile
+from note_journal import NoteJournal
+from note_store import NoteStore
+from binary_snapshot import BinarySnapshot
+from compressed_file import DECOMPRESSION_ERRORS, open_text, open_write
+from file_lock import FileLock
+from fragment_cache import FragmentCache, encode_note, write_array
+from search_index import SearchIndex
 
 class DataSerializer:
+    COMPACT_THRESHOLD = 1000  # Количество записей журнала, после которого делается новый снимок
+    CHUNK_SIZE = 1 << 16  # Размер порции чтения файла при потоковой загрузке (символов)
+    BINARY_SNAPSHOTS = False  # Записывать снимки в двоичном формате вместо JSON
+    LAZY_CONTENT = True  # Тексты заметок из двоичного снимка читаются с диска при обращении (JSON читается целиком)
+    DURABILITY = DURABILITY_ALWAYS  # Режим надёжности записи: "always", "batched" или "none"
+    BACKUP_COUNT = 0  # Количество резервных копий прежних снимков (0 — не хранить)
+    DAMAGED_SUFFIX = ".damaged"  # Суффикс копии повреждённого файла
+    CACHE_FRAGMENTS = True  # Хранить JSON-фрагменты заметок: снимок кодирует заново только изменённые
+    COMPRESSION = None  # Сжатие JSON-снимка: None, "gzip", "lzma" или "zlib" (со словарём)
+    _journals = {}  # Журналы, открытые для каждого файла данных
+    _fragments = {}  # Кэш JSON-фрагментов заметок для каждого файла данных
+    _locks = {}  # Межпроцессные блокировки для каждого файла данных
+
     @staticmethod
-    def save_to_file(data, filename: str):
-        """Сохраняет данные в файл"""
-        with open(filename, 'w', encoding='utf-8') as file:
-            json.dump([note.to_dict() for note in data], file, ensure_ascii=False, indent=4)
+    def journal(filename="notes_data.json"):
+        """Возвращает журнал изменений для файла данных"""
+        if filename not in DataSerializer._journals:
+            DataSerializer._journals[filename] = NoteJournal(filename)
+        journal = DataSerializer._journals[filename]
+        journal.durability = DataSerializer.DURABILITY
+        return journal
 
     @staticmethod
-    def load_from_file(filename: str):
-        """Загружает данные из файла"""
+    def fragments(filename="notes_data.json"):
+        """Возвращает кэш JSON-фрагментов заметок для файла данных"""
+        if filename not in DataSerializer._fragments:
+            DataSerializer._fragments[filename] = FragmentCache()
+        return DataSerializer._fragments[filename]
+
+    @staticmethod
+    def lock(filename="notes_data.json"):
+        """Возвращает межпроцессную блокировку файла данных (под ней пишутся снимок и журнал)"""
+        if filename not in DataSerializer._locks:
+            DataSerializer._locks[filename] = FileLock(filename)
+        return DataSerializer._locks[filename]
+
+    @staticmethod
+    def generation(filename="notes_data.json"):
+        """Возвращает номер поколения данных: он растёт при каждой записи полного снимка"""
+        return DataSerializer.lock(filename).generation()
+
+    @staticmethod
+    def version(filename="notes_data.json"):
+        """
+        Возвращает дешёвую метку состояния файла данных: (поколение, размер журнала).
+        Если метка не изменилась, другие процессы ничего не записали.
+        """
+        return DataSerializer.generation(filename), DataSerializer.journal(filename).size()
+
+    @staticmethod
+    def mark_changed(note_ids, filename="notes_data.json"):
+        """
+        Сообщает об изменённых заметках: при следующем снимке они будут закодированы заново.
+        Изменения, записанные в журнал (record_*), отмечаются сами.
+        """
+        DataSerializer.fragments(filename).mark_changed(note_ids)
+
+    @staticmethod
+    def save_to_file(data, filename: str, binary: bool = None):
+        """
+        Сохраняет данные в файл (полный снимок) и очищает журнал.
+        Снимок пишется во временный файл и атомарно подменяет прежний, поэтому
+        сбой во время записи не оставляет оборванный файл. Журнал очищается
+        только после того, как новый снимок оказался на месте.
+        Формат снимка (JSON или двоичный) по умолчанию задаёт BINARY_SNAPSHOTS,
+        сжатие JSON-снимка (потоковое, по мере записи) — COMPRESSION.
+        Запись выполняется под блокировкой файла и увеличивает номер поколения.
+        Тексты, оставленные в прежнем двоичном снимке (LAZY_CONTENT), переводятся на новый.
+        """
+        if binary is None:
+            binary = DataSerializer.BINARY_SNAPSHOTS
+        with DataSerializer.lock(filename) as lock:
+            with AtomicFile(filename, DataSerializer.DURABILITY, DataSerializer.BACKUP_COUNT) as temp:
+                moved = []
+                if binary:
+                    moved = BinarySnapshot.save(data, temp)
+                elif DataSerializer.CACHE_FRAGMENTS:
+                    # Заново кодируются только изменённые заметки, готовые фрагменты остальных вставляются как есть
+                    with open_write(temp, DataSerializer.COMPRESSION) as file:
+                        write_array(DataSerializer.fragments(filename).fragments(data), file)
+                else:
+                    DataSerializer._dump_json(data, temp, DataSerializer.COMPRESSION)
+                # Отображение прежнего снимка закрывается до замены: на Windows файл с mmap не заменить
+                BodyFile.release(filename, moved)
+            BodyFile.rebind(moved, filename)
+            DataSerializer.journal(filename).clear()
+            lock.bump()
+
+    @staticmethod
+    def export_json(data, filename: str):
+        """Записывает заметки в JSON-файл (формат для экспорта и обмена)"""
+        with AtomicFile(filename, DataSerializer.DURABILITY) as temp:
+            DataSerializer._dump_json(data, temp)
+
+    @staticmethod
+    def _dump_json(data, filename: str, compression: str = None):
+        with open_write(filename, compression) as file:
+            write_array((encode_note(note.to_dict()) for note in data), file)
+
+    @staticmethod
+    def sync(filename="notes_data.json"):
+        """Сбрасывает на диск записи журнала, накопленные в пакетном режиме"""
+        DataSerializer.journal(filename).sync()
+
+    @staticmethod
+    def recover_items(filename: str, prefix=None):
+        """
+        Восстанавливает данные повреждённого файла вместо того, чтобы отбросить их.
+        Копия повреждённого файла сохраняется рядом (с суффиксом DAMAGED_SUFFIX),
+        чтобы следующее сохранение её не затёрло. Возвращаются уцелевшие элементы
+        из начала файла, а если не уцелело ничего — содержимое самой свежей
+        читаемой резервной копии.
+
+        :param filename: Имя повреждённого файла.
+        :param prefix: Элементы, успешно прочитанные до места повреждения.
+        :return: list of dict
+        """
+        DataSerializer._keep_damaged(filename)
+        if prefix:
+            return list(prefix)
+        number = 1
+        while os.path.exists(backup_path(filename, number)):
+            try:
+                items = list(DataSerializer.iter_items_from_file(backup_path(filename, number)))
+                print(f"Заметки восстановлены из резервной копии {backup_path(filename, number)}.")
+                return items
+            except ValueError:
+                number += 1
+        return []
+
+    @staticmethod
+    def _keep_damaged(filename: str):
+        """Сохраняет копию повреждённого файла рядом с ним"""
+        try:
+            shutil.copyfile(filename, filename + DataSerializer.DAMAGED_SUFFIX)
+        except OSError:
+            pass
+
+    @staticmethod
+    def iter_items_from_file(filename: str, chunk_size: int = None):
+        """
+        Потоково читает элементы JSON-массива верхнего уровня по одному.
+        В памяти находится только текущая порция файла и разбираемый элемент,
+        поэтому расход памяти не зависит от размера файла.
+        Двоичный снимок распознаётся по первым байтам и читается через mmap;
+        при LAZY_CONTENT тексты заметок остаются в файле до обращения к ним.
+        Из JSON-снимка (формат по умолчанию) тексты всегда читаются в память.
+        Сжатый JSON-снимок (gzip, xz или zlib со словарём) распаковывается по мере чтения.
+        """
+        if BinarySnapshot.is_binary(filename):
+            yield from BinarySnapshot.iter_items(filename, lazy=DataSerializer.LAZY_CONTENT)
+            return
+        chunk_size = chunk_size or DataSerializer.CHUNK_SIZE
+        with open_text(filename) as file:
+            try:
+                yield from DataSerializer._iter_array_items(file, chunk_size)
+            except DECOMPRESSION_ERRORS as error:
+                raise ValueError(f"Сжатый файл повреждён: {error}") from error
+
+    @staticmethod
+    def _iter_array_items(file, chunk_size: int):
+        """Читает элементы JSON-массива из открытого текстового файла порциями по chunk_size символов"""
+        decoder = json.JSONDecoder()
+        buffer, position, started, eof = "", 0, False, False
+        while True:
+            # Пропускаем пробелы и разделители между элементами
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position == len(buffer):
+                if eof:
+                    raise json.JSONDecodeError("Неожиданный конец файла", buffer, position)
+                buffer, position = file.read(chunk_size), 0
+                eof = not buffer
+                continue
+            if not started:
+                if buffer[position] != "[":
+                    raise json.JSONDecodeError("Ожидался массив заметок", buffer, position)
+                started, position = True, position + 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Элемент не поместился в буфер целиком: дочитываем файл
+                more = "" if eof else file.read(max(chunk_size, len(buffer)))
+                if not more:
+                    raise
+                buffer, position = buffer[position:] + more, 0
+                continue
+            if end == len(buffer) and not eof:
+                # Число или литерал могли оборваться на границе порции: дочитываем и разбираем заново
+                more = file.read(chunk_size)
+                if more:
+                    buffer, position = buffer[position:] + more, 0
+                    continue
+                eof = True
+            yield item
+            position = end
+
+    @staticmethod
+    def iter_from_file(filename: str, chunk_size: int = None):
+        """
+        Потоково загружает заметки из файла по одной (генератор) с учётом журнала изменений.
+        Подходит для очень больших файлов: в памяти не держится весь список заметок.
+        """
         try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                return [Note.from_dict(item) for item in json.load(file)]
+            items = DataSerializer.iter_items_from_file(filename, chunk_size)
+            first = next(items, None)
         except FileNotFoundError:
             print("Файл не найден. Будет создан новый.")
-            return []
-        except json.JSONDecodeError:
-            print("Ошибка чтения файла. Файл будет очищен.")
-            return []
+            first, items = None, iter(())
+        except ValueError:  # json.JSONDecodeError или повреждённый двоичный снимок
+            print("Ошибка чтения файла. Восстанавливаются уцелевшие данные.")
+            items = iter(DataSerializer.recover_items(filename))
+            first = next(items, None)
+        if first is not None and "id" not in first:
+            # Старый формат без идентификаторов требует однократной полной загрузки
+            yield from DataSerializer.load_store_from_file(filename)
+            return
+
+        def notes():
+            if first is None:
+                return
+            yield Note.from_dict(first)
+            try:
+                for item in items:
+                    yield Note.from_dict(item)
+            except ValueError:  # json.JSONDecodeError или повреждённый двоичный снимок
+                print("Ошибка чтения файла. Загружена только начальная часть заметок.")
+                DataSerializer._keep_damaged(filename)
+
+        yield from DataSerializer.journal(filename).apply_stream(notes())
+
+    @staticmethod
+    def load_store_from_file(filename: str):
+        """Загружает хранилище заметок из файла и применяет к нему журнал изменений"""
+        items = []
+        try:
+            for item in DataSerializer.iter_items_from_file(filename):
+                items.append(item)
+        except FileNotFoundError:
+            print("Файл не найден. Будет создан новый.")
+        except ValueError:  # json.JSONDecodeError или повреждённый двоичный снимок
+            print("Ошибка чтения файла. Восстанавливаются уцелевшие данные.")
+            items = DataSerializer.recover_items(filename, items)
+        store = DataSerializer.journal(filename).replay(NoteStore(Note.from_dict(item) for item in items))
+        if any("id" not in item for item in items):
+            # Старый формат без идентификаторов: сразу сохраняем снимок,
+            # чтобы выданные идентификаторы стали постоянными
+            DataSerializer.save_to_file(store, filename)
+        return store
+
+    @staticmethod
+    def load_from_file(filename: str):
+        """Загружает данные из файла"""
+        return list(DataSerializer.load_store_from_file(filename))
 
     @staticmethod
     def save(data, filename="notes_data.json"):
@@ -30,3 +280,54 @@ class DataSerializer:
     def load(filename="notes_data.json"):
         """Упрощённая функция загрузки"""
         return DataSerializer.load_from_file(filename)
+
+    @staticmethod
+    def load_store(filename="notes_data.json"):
+        """Упрощённая функция загрузки в хранилище заметок"""
+        return DataSerializer.load_store_from_file(filename)
+
+    @staticmethod
+    def iter_load(filename="notes_data.json", chunk_size: int = None):
+        """Упрощённая функция потоковой загрузки (генератор заметок)"""
+        return DataSerializer.iter_from_file(filename, chunk_size)
+
+    @staticmethod
+    def search_index(notes, filename="notes_data.json"):
+        """Возвращает поисковый индекс, сохранённый рядом с файлом, синхронизированный с заметками"""
+        return SearchIndex.for_notes(notes, filename)
+
+    @staticmethod
+    def record_add(note, filename="notes_data.json"):
+        """Записывает в журнал добавление заметки"""
+        DataSerializer.mark_changed([note.id], filename)
+        with DataSerializer.lock(filename):
+            DataSerializer.journal(filename).append(NoteJournal.add_record(note))
+
+    @staticmethod
+    def record_update(note, filename="notes_data.json"):
+        """Записывает в журнал изменение заметки"""
+        DataSerializer.mark_changed([note.id], filename)
+        with DataSerializer.lock(filename):
+            DataSerializer.journal(filename).append(NoteJournal.update_record(note))
+
+    @staticmethod
+    def record_delete(note_id, filename="notes_data.json"):
+        """Записывает в журнал удаление заметки с указанным идентификатором"""
+        DataSerializer.mark_changed([note_id], filename)
+        with DataSerializer.lock(filename):
+            DataSerializer.journal(filename).append(NoteJournal.delete_record(note_id))
+
+    @staticmethod
+    def record_many(records, filename="notes_data.json"):
+        """Записывает в журнал несколько изменений одной операцией записи"""
+        if not records:
+            return
+        DataSerializer.mark_changed([record["id"] if "id" in record else record["note"]["id"]
+                                     for record in records if "id" in record or "note" in record], filename)
+        with DataSerializer.lock(filename):
+            DataSerializer.journal(filename).append_many(records)
+
+    @staticmethod
+    def needs_compaction(filename="notes_data.json"):
+        """Проверяет, пора ли свернуть журнал в новый снимок"""
+        return len(DataSerializer.journal(filename)) >= DataSerializer.COMPACT_THRESHOLD
@@ -0,0 +1,140 @@
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Межпроцессная рекомендательная (advisory) блокировка файла данных.
+
+    Блокировка держится на отдельном файле рядом с данными (имя + SUFFIX):
+    на POSIX — через flock, на Windows — через msvcrt.locking. Внутри процесса
+    блокировка повторно входима: вложенные захваты в том же потоке не ждут,
+    а другие потоки ждут её освобождения так же, как другие процессы.
+
+    В файле блокировки хранится номер поколения данных. Его увеличивает каждая
+    запись полного снимка, поэтому другой процесс по одному числу понимает,
+    что файл переписан целиком и нужна полная перезагрузка.
+    """
+    SUFFIX = ".lock"
+    TIMEOUT = 10.0  # Наибольшее время ожидания блокировки по умолчанию (секунды)
+    RETRY_INTERVAL = 0.01  # Пауза между попытками захватить занятую блокировку (секунды)
+    WINDOWS_OFFSET = 1 << 30  # Байт, который блокируется на Windows (за пределами номера поколения)
+
+    def __init__(self, filename: str):
+        """
+        Инициализация блокировки.
+
+        :param filename: Имя файла данных, доступ к которому защищает блокировка.
+        """
+        self.path = filename + self.SUFFIX  # Путь к файлу блокировки
+        self._thread_lock = threading.RLock()  # Исключает другие потоки этого процесса
+        self._depth = 0  # Глубина вложенных захватов
+        self._file = None  # Открытый файл блокировки, пока она захвачена
+
+    def acquire(self, timeout: float = None):
+        """
+        Захватывает блокировку.
+
+        :param timeout: Наибольшее время ожидания в секундах (по умолчанию TIMEOUT, 0 — не ждать).
+        :return: bool — удалось ли захватить блокировку.
+        """
+        if timeout is None:
+            timeout = self.TIMEOUT
+        deadline = time.monotonic() + timeout
+        if timeout > 0:
+            acquired = self._thread_lock.acquire(timeout=timeout)
+        else:
+            acquired = self._thread_lock.acquire(blocking=False)
+        if not acquired:
+            return False
+        if self._depth == 0:
+            file = open(self.path, 'a+b')
+            while not self._lock_file(file):
+                if time.monotonic() >= deadline:
+                    file.close()
+                    self._thread_lock.release()
+                    return False
+                time.sleep(self.RETRY_INTERVAL)
+            self._file = file
+        self._depth += 1
+        return True
+
+    def release(self):
+        """
+        Освобождает блокировку (внешний захват снимает блокировку файла).
+        """
+        self._depth -= 1
+        if self._depth == 0:
+            file, self._file = self._file, None
+            self._unlock_file(file)
+            file.close()
+        self._thread_lock.release()
+
+    @property
+    def locked(self):
+        """
+        Проверяет, захвачена ли блокировка этим процессом.
+
+        :return: bool
+        """
+        return self._depth > 0
+
+    def generation(self):
+        """
+        Возвращает номер поколения данных (0, если снимок ещё не записывался).
+        Читается без захвата блокировки, поэтому годится для дешёвой проверки.
+
+        :return: int
+        """
+        try:
+            with open(self.path, 'rb') as file:
+                return int(file.read(32) or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump(self):
+        """
+        Увеличивает номер поколения данных. Вызывается под захваченной блокировкой.
+
+        :return: int — новый номер поколения.
+        """
+        generation = self.generation() + 1
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(str(generation).encode("ascii"))
+        self._file.flush()
+        return generation
+
+    def __enter__(self):
+        if not self.acquire():
+            raise TimeoutError(f"Файл {self.path} занят другим процессом.")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    @classmethod
+    def _lock_file(cls, file):
+        try:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                file.seek(cls.WINDOWS_OFFSET)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    @classmethod
+    def _unlock_file(cls, file):
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        else:
+            file.seek(cls.WINDOWS_OFFSET)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,88 @@
+import json
+import os
+from atomic_file import AtomicFile, DURABILITY_NONE
+from note import Note
+from note_journal import NoteJournal
+
+
+class FirstScreen:
+    """
+    Кэш первого экрана: последнее выбранное представление списка (категория
+    и сортировка) и заголовки первых заметок в нём.
+
+    Кэш сохраняется рядом с файлом данных при закрытии приложения и читается
+    при запуске до загрузки заметок, поэтому окно сразу показывает первые
+    строки списка, а остальные заметки загружаются в фоне. Вместе с кэшем
+    запоминаются размер и время изменения файла данных и журнала: если файл
+    с тех пор менялся, заголовки не используются (представление — используется).
+    """
+    SUFFIX = ".first"  # Суффикс файла кэша рядом с файлом данных
+    SIZE = 50  # Количество заметок первого экрана
+    VERSION = 1  # Версия формата кэша
+
+    @staticmethod
+    def stamp(filename: str):
+        """
+        Возвращает размер и время изменения файла данных и журнала.
+
+        :param filename: Имя файла данных.
+        :return: list
+        """
+        paths = (filename, filename + NoteJournal.SUFFIX)
+        if os.path.isdir(filename):  # Каталог частей (ShardedSerializer): учитываются файлы всех частей
+            paths = [os.path.join(filename, name) for name in sorted(os.listdir(filename))]
+        stamps = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                stamps.append([stat.st_size, stat.st_mtime_ns])
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    @staticmethod
+    def save(filename: str, view: dict, notes):
+        """
+        Сохраняет кэш первого экрана.
+
+        :param filename: Имя файла данных.
+        :param view: Представление списка (например, {"category": "Все", "sort": "title"}).
+        :param notes: Первые заметки списка в порядке отображения.
+        """
+        data = {
+            "version": FirstScreen.VERSION,
+            "source": FirstScreen.stamp(filename),
+            "view": view,
+            "notes": [{
+                "id": note.id,
+                "title": note.title,
+                "category": note.category,
+                "created_at": note.created_at_iso,
+                "modified_at": note.modified_at_iso,
+            } for note in notes],
+        }
+        # Кэш восстанавливается при следующем закрытии, поэтому fsync не нужен
+        with AtomicFile(filename + FirstScreen.SUFFIX, DURABILITY_NONE) as temp:
+            with open(temp, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+
+    @staticmethod
+    def load(filename: str):
+        """
+        Читает кэш первого экрана.
+
+        :param filename: Имя файла данных.
+        :return: (представление, список заметок без текста) или None, если кэша нет или он повреждён.
+                 Если файл данных изменился после сохранения кэша, список заметок пуст.
+        """
+        try:
+            with open(filename + FirstScreen.SUFFIX, encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get("version") != FirstScreen.VERSION:
+                return None
+            view = dict(data["view"])
+            if data["source"] != FirstScreen.stamp(filename):
+                return view, []
+            return view, [Note.from_dict(dict(item, content="")) for item in data["notes"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,91 @@
+import json
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode  # Строки кодируются функцией на C
+
+
+def encode_note(item: dict):
+    """
+    Кодирует словарь заметки в элемент JSON-массива снимка.
+    Результат совпадает с тем, что записывает json.dump(..., indent=4),
+    но строки кодируются без медленного пути форматирования с отступами.
+
+    :param item: Словарь заметки (Note.to_dict).
+    :return: bytes (UTF-8)
+    """
+    fields = ",\n".join(f"        {_encode(key)}: {_encode(value)}" for key, value in item.items())
+    return f"    {{\n{fields}\n    }}".encode("utf-8")
+
+
+def write_array(fragments, file):
+    """
+    Записывает элементы в двоичный файл JSON-массивом.
+
+    :param fragments: Итерируемый набор закодированных элементов (bytes).
+    :param file: Файл, открытый в режиме "wb".
+    """
+    separator = b"[\n"
+    for fragment in fragments:
+        file.write(separator)
+        file.write(fragment)
+        separator = b",\n"
+    file.write(b"[]" if separator == b"[\n" else b"\n]")
+
+
+class FragmentCache:
+    """
+    Готовые JSON-фрагменты заметок для записи снимка.
+
+    Для каждой заметки хранится закодированный элемент массива вместе с датой
+    изменения, для которой он построен. При записи снимка заново кодируются
+    только изменённые заметки (другая дата или отмеченные mark_changed), а
+    фрагменты остальных вставляются как есть. Фрагменты удалённых заметок
+    не переживают следующую запись.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого кэша.
+        """
+        self._fragments = {}  # Идентификатор -> (дата изменения, фрагмент)
+        self.hits = 0  # Количество заметок, взятых из кэша при последней записи
+        self.misses = 0  # Количество заметок, закодированных заново при последней записи
+
+    def mark_changed(self, note_ids):
+        """
+        Отмечает заметки как изменённые: при следующей записи они будут закодированы заново.
+
+        :param note_ids: Идентификаторы заметок.
+        """
+        for note_id in note_ids:
+            self._fragments.pop(note_id, None)
+
+    def fragments(self, notes):
+        """
+        Перебирает фрагменты заметок, кодируя только изменённые.
+        Кэш заменяется фрагментами перебранных заметок.
+
+        :param notes: Итерируемый набор заметок.
+        :return: iterator of bytes
+        """
+        previous, current = self._fragments, {}
+        self.hits = self.misses = 0
+        for note in notes:
+            stamp = note.modified_at  # Разобранная дата хранится в заметке: сравнение не форматирует строк
+            entry = previous.get(note.id)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                entry = (stamp, encode_note(note.to_dict()))
+            else:
+                self.hits += 1
+            current[note.id] = entry
+            yield entry[1]
+        self._fragments = current
+
+    def clear(self):
+        """
+        Очищает кэш.
+        """
+        self._fragments = {}
+
+    def __len__(self):
+        return len(self._fragments)
@@ -1,16 +1,50 @@
-from PyQt5.QtWidgets import QApplication
-from main_form import MainForm
+import time
+
+STARTED = time.perf_counter()  # Начало запуска: от него отсчитывается время холодного старта
+
+import argparse
+import sys
+from profiler import profiler
 
 # Точка входа в приложение
 if __name__ == "__main__":
+    # Замеры производительности: ключи --profile и --trace или переменные NOTEAPP_PROFILE и NOTEAPP_TRACE
+    parser = argparse.ArgumentParser(description="NoteApp")
+    parser.add_argument("--profile", action="store_true", help="замерять время этапов и печатать сводку")
+    parser.add_argument("--trace", help="сохранить трассировку Chrome Trace в файл при выходе")
+    parser.add_argument("--quit-after-load", action="store_true",
+                        help="закрыть окно после загрузки заметок (для замера времени запуска)")
+    args, qt_args = parser.parse_known_args()
+    profiler.configure_from_env()
+    if args.profile or args.trace:
+        profiler.enable(args.trace or profiler.trace_file)
+
+    # Модули Qt и окна импортируются после разбора ключей: --help не ждёт их загрузки
+    imported = time.perf_counter()
+    from PyQt5.QtWidgets import QApplication
+    from main_form import MainForm
+    profiler.record("imports", imported)
+
     # Создаем экземпляр приложения
-    app = QApplication([])
+    app = QApplication(sys.argv[:1] + qt_args)
 
     # Создаем главное окно приложения
-    window = MainForm()
+    with profiler.stage("window"):
+        window = MainForm()
 
     # Отображаем главное окно
     window.show()
+    profiler.record("startup_window", STARTED)  # Окно с первым экраном показано
+
+    def on_loaded():
+        profiler.record("startup_loaded", STARTED)  # Все заметки загружены
+        if args.quit_after_load:
+            window.close()
+
+    window.loaded.connect(on_loaded)
 
     # Запускаем главный цикл приложения
     app.exec_()
+
+    # Итоговая сводка замеров и трассировка (если замеры включены)
+    profiler.finish()
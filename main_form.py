@@ -1,172 +1,73 @@
 import sys
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QPushButton, QLineEdit, QTextEdit, QLabel,
-    QComboBox, QListWidget, QDialog, QDialogButtonBox, QMessageBox, QHBoxLayout, QFrame
+    QApplication, QWidget, QVBoxLayout, QPushButton, QLineEdit, QLabel,
+    QComboBox, QListView, QDialog, QMessageBox, QHBoxLayout, QFrame
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPalette, QColor 
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from note import Note
+from note_store import NoteStore
+from note_events import NoteEvent
+from note_category import CategoryIndex
 from data_serializer import DataSerializer
-
-class AboutDialog(QDialog):
-    """
-    Класс для отображения окна "О программе".
-    """
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("О программе")
-        self.setFixedSize(400, 200)
-
-        layout = QVBoxLayout()
-
-        # Название программы
-        app_name_label = QLabel("NoteApp", self)
-        app_name_label.setStyleSheet("font-size: 16pt; font-weight: bold;")
-        layout.addWidget(app_name_label)
-
-        # Имя автора
-        author_label = QLabel("Автор: Бармотин С.А.", self)
-        author_label.setStyleSheet("font-size: 12pt;")
-        layout.addWidget(author_label)
-
-        # Почта
-        email_label = QLabel('<a href="mailto:Barmotins@gmail.com">Почта: Barmotins@gmail.com</a>', self)
-        email_label.setOpenExternalLinks(True)
-        email_label.setStyleSheet("font-size: 12pt; color: blue;")
-        layout.addWidget(email_label)
-
-        # GitHub
-        github_label = QLabel('<a href="https://github.com/Fufurum/NoteApp">GitHub: https://github.com/Fufurum/NoteApp</a>', self)
-        github_label.setOpenExternalLinks(True)
-        github_label.setStyleSheet("font-size: 12pt; color: blue;")
-        layout.addWidget(github_label)
-
-        # Кнопка закрытия
-        close_button = QDialogButtonBox(QDialogButtonBox.Ok)
-        close_button.accepted.connect(self.accept)
-        layout.addWidget(close_button)
-
-        self.setLayout(layout)
-
-
-class NoteEditorDialog(QDialog):
-    """
-    Класс для окна редактирования и создания заметок.
-    """
-    def __init__(self, note=None, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Редактор заметок" if note else "Создать заметку")
-        self.note = note
-
-        layout = QVBoxLayout()
-
-        # Поле для ввода заголовка
-        self.title_edit = QLineEdit(self)
-        self.title_edit.setPlaceholderText("Введите заголовок")
-        layout.addWidget(QLabel("Заголовок:"))
-        layout.addWidget(self.title_edit)
-
-        # Поле для ввода содержимого
-        self.content_edit = QTextEdit(self)
-        self.content_edit.setPlaceholderText("Введите содержимое (минимум 5 символов)")
-        layout.addWidget(QLabel("Содержимое:"))
-        layout.addWidget(self.content_edit)
-
-        # Выпадающий список для выбора категории
-        self.category_combo = QComboBox(self)
-        self.category_combo.addItems(["Все", "Работа", "Дом", "Здоровье и Спорт", "Люди", "Документы", "Финансы", "Разное"])
-        layout.addWidget(QLabel("Категория:"))
-        layout.addWidget(self.category_combo)
-
-        # Отображение даты создания заметки
-        self.date_label = QLabel(self)
-        layout.addWidget(QLabel("Дата создания:"))
-        layout.addWidget(self.date_label)
-
-        # Кнопки сохранения и отмены
-        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        buttons.accepted.connect(self.accept)
-        buttons.rejected.connect(self.reject)
-        layout.addWidget(buttons)
-
-        self.setLayout(layout)
-
-        # Если передана заметка, заполняем поля
-        if self.note:
-            self.title_edit.setText(note.title)
-            self.content_edit.setText(note.content)
-            self.category_combo.setCurrentText(note.category)
-            self.date_label.setText(note.created_at.strftime("%Y-%m-%d %H:%M:%S"))
-        else:
-            self.date_label.setText("Создаётся сейчас")
-
-    def validate_input(self):
-        """
-        Проверка полей ввода (заголовок и содержимое) на корректность.
-        """
-        valid = True
-        palette = self.title_edit.palette()
-
-        # Проверка заголовка
-        if not self.title_edit.text().strip():
-            valid = False
-            palette.setColor(QPalette.Base, QColor("red"))
-        else:
-            palette.setColor(QPalette.Base, QColor("green"))
-        self.title_edit.setPalette(palette)
-
-        # Проверка содержимого
-        content_palette = self.content_edit.palette()
-        if len(self.content_edit.toPlainText().strip()) < 5:
-            valid = False
-            content_palette.setColor(QPalette.Base, QColor("red"))
-        else:
-            content_palette.setColor(QPalette.Base, QColor("green"))
-        self.content_edit.setPalette(content_palette)
-
-        return valid
-
-    def accept(self):
-        """
-        Сохраняет изменения, если поля валидны.
-        """
-        if not self.validate_input():
-            QMessageBox.critical(self, "Ошибка", "Пожалуйста, заполните все обязательные поля.")
-            return
-        super().accept()
-
-    def get_note_data(self):
-        """
-        Возвращает данные заметки в виде словаря.
-        """
-        return {
-            "title": self.title_edit.text(),
-            "content": self.content_edit.toPlainText(),
-            "category": self.category_combo.currentText(),
-        }
-
+from search_index import SearchIndex
+from note_list_model import NoteListModel
+from note_table import NoteTable
+from note_query import NoteQuery, QueryPlanner
+from first_screen import FirstScreen
+from profiler import profiler
+from render_cache import RenderCache
+from storage_worker import StorageWorker
+from store_sync import StoreSync
+from search_worker import SearchWorker
 
 class MainForm(QWidget):
     """
     Основной класс приложения NoteApp.
     """
+    loaded = pyqtSignal()  # Загрузка заметок завершена, список показывает настоящие заметки
+
+    DATA_FILE = "notes_data.json"  # Файл с заметками
+    SERIALIZER = DataSerializer  # Способ хранения (SqliteSerializer — база "notes_data.db", ShardedSerializer — каталог)
+    SORT_LABELS = {"title": "Сортировка: По имени", "created_at": "Сортировка: По дате"}  # Ключ -> пункт списка
+    DETAILS_CACHE_SIZE = 64  # Количество заметок, тексты панели просмотра которых хранятся готовыми
+    SYNC_INTERVAL_MS = 1000  # Период проверки файла на изменения из других окон (0 — не проверять)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("NoteApp")
         self.resize(900, 600)  # Увеличен размер окна
         self.layout = QVBoxLayout(self)
-        self.notes = []
-        self.load_notes()
+        self.notes = NoteStore()
+        self.search_index = SearchIndex()
+        self.note_table = NoteTable()  # Колоночная копия полей заметок для фильтрации и сортировки
+        self.categories = CategoryIndex()  # Заметки по категориям; сам следит за сменой категории и заголовка
+        self.planner = QueryPlanner(self.note_table, self.categories, self.search_index)  # Запросы к заметкам по индексам
+        self.sort_key = None  # Выбранная сортировка списка (None — в порядке хранилища)
+        self.loading = False  # Идёт ли фоновая загрузка заметок
+        self.changed_while_loading = False  # Менялись ли заметки до готовности поискового индекса
+        self.sync = None  # Синхронизация с другими окнами, открывшими тот же файл (только DataSerializer)
+        if self.SERIALIZER is DataSerializer and self.SYNC_INTERVAL_MS:
+            self.sync = StoreSync(self.notes, self.DATA_FILE)
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setInterval(self.SYNC_INTERVAL_MS)
+        self.sync_timer.timeout.connect(self.poll_changes)
+        self.storage = StorageWorker(self.DATA_FILE, self, serializer=self.SERIALIZER, sync=self.sync)
+        self.storage.notes_loaded.connect(self.on_notes_loaded)
+        self.storage.load_finished.connect(self.on_load_finished)
+        self.storage.failed.connect(self.on_storage_failed)
+        self.storage.changes_fetched.connect(self.on_changes_fetched)
+        self.search = SearchWorker(self.planner, self)  # Запросы по мере ввода в фоновом потоке
+        self.search.results_ready.connect(self.on_query_results)
 
         # Поле поиска
         self.search_bar = QLineEdit(self)
-        self.search_bar.setPlaceholderText("Поиск по заголовкам...")
-        self.search_bar.textChanged.connect(self.filter_notes)
+        self.search_bar.setPlaceholderText("Поиск по заголовкам и содержимому...")
+        self.search_bar.textChanged.connect(self.on_search_text_changed)
         self.layout.addWidget(self.search_bar)
 
         # Выпадающий список сортировки
         self.sort_combo = QComboBox(self)
-        self.sort_combo.addItems(["Сортировка: По имени", "Сортировка: По дате"])
+        self.sort_combo.addItems(list(self.SORT_LABELS.values()))
         self.sort_combo.currentIndexChanged.connect(self.sort_notes)
         self.layout.addWidget(self.sort_combo)
 
@@ -177,11 +78,24 @@ class MainForm(QWidget):
         self.layout.addWidget(self.category_combo)
 
         # Список заметок
-        self.note_list = QListWidget(self)
-        self.note_list.itemClicked.connect(self.show_note_content)
-        self.note_list.itemDoubleClicked.connect(self.edit_note)
+        self.note_model = NoteListModel(self.notes, parent=self, table=self.note_table, categories=self.categories,
+                                        planner=self.planner)
+        self.note_model.filter.set_query(NoteQuery())
+        self.note_list = QListView(self)
+        self.note_list.setUniformItemSizes(True)  # Qt не запрашивает размеры всех строк
+        self.note_list.setModel(self.note_model)
+        self.note_list.clicked.connect(self.show_note_content)
+        self.note_list.doubleClicked.connect(self.edit_note)
         self.layout.addWidget(self.note_list)
 
+        # Индексы, список, журнал и поиск обновляются по событиям хранилища, в порядке подписки
+        self.notes.subscribe(self.planner.apply_events)  # Таблица, категории и поисковый индекс
+        self.notes.subscribe(self.note_model.apply_events)
+        self.notes.subscribe(self.storage.apply_events)
+        self.notes.subscribe(self.on_notes_changed)
+        self.details = RenderCache(self.detail_texts, self.DETAILS_CACHE_SIZE)  # Тексты панели просмотра
+        self.notes.subscribe(self.details.apply_events)
+
         # Фрейм с подробной информацией о заметке
         self.content_frame = QFrame(self)
         self.content_frame.setFrameShape(QFrame.StyledPanel)
@@ -220,138 +134,302 @@ class MainForm(QWidget):
 
         self.layout.addLayout(button_layout)
         self.setLayout(self.layout)
-        self.refresh_note_list()
+
+        # Сначала показывается первый экран из кэша, затем заметки загружаются в фоне
+        self.restore_first_screen()
+        self.load_notes()
 
     def show_about_dialog(self):
         """
         Открывает окно "О программе".
         """
+        from note_dialogs import AboutDialog  # Окно нужно редко: модуль загружается при первом открытии
         about_dialog = AboutDialog(self)
         about_dialog.exec_()
 
+    def restore_first_screen(self):
+        """
+        Восстанавливает последнее представление списка (категорию и сортировку)
+        и показывает сохранённые заголовки первых заметок до окончания загрузки.
+        """
+        cached = FirstScreen.load(self.DATA_FILE)
+        if cached is None:
+            return
+        view, notes = cached
+        for combo, text in ((self.category_combo, view.get("category")),
+                            (self.sort_combo, self.SORT_LABELS.get(view.get("sort")))):
+            if text is not None:
+                combo.blockSignals(True)  # Заметки ещё не загружены: пересчитывать список рано
+                combo.setCurrentText(text)
+                combo.blockSignals(False)
+        self.sort_key = view.get("sort")
+        self.note_model.filter.set_query(self.current_query())
+        if notes:
+            self.note_model.show_preview(notes)
+
+    def save_first_screen(self):
+        """
+        Сохраняет текущее представление списка и заголовки первых заметок в нём
+        (без строки поиска), чтобы при следующем запуске показать их сразу.
+        """
+        query = self.current_query().replace(text="", limit=FirstScreen.SIZE)
+        notes = [self.notes.get(note_id) for note_id in self.planner.execute(query).ids]
+        FirstScreen.save(self.DATA_FILE, {"category": self.category_combo.currentText(), "sort": self.sort_key}, notes)
 
     def load_notes(self):
         """
-        Загружает заметки из файла через DataSerializer.
-        Если происходит ошибка (например, файл отсутствует), создается пустой список заметок.
+        Запускает фоновую загрузку заметок из файла через DataSerializer.
+        Окно остаётся отзывчивым, заметки добавляются в список порциями.
+        """
+        self.loading = True
+        self.setWindowTitle("NoteApp (загрузка...)")
+        self.storage.load()
+
+    def on_notes_loaded(self, notes):
+        """
+        Добавляет очередную порцию загруженных заметок в хранилище
+        (таблица, категории и список обновляются по событию загрузки).
         """
-        try:
-            self.notes = DataSerializer.load()
-        except Exception as e:
-            self.notes = []
+        with profiler.stage("model_build", notes=len(notes)):
+            self.notes.load(notes)
+
+    def on_notes_changed(self, events):
+        """
+        Отмечает изменения заметок пользователем во время загрузки
+        и при необходимости сворачивает журнал.
+        """
+        events = [event for event in events if event.kind != NoteEvent.LOADED]
+        if not events:
+            return
+        if self.loading:
+            self.changed_while_loading = True
+        self.compact_notes_if_needed()
+        if self.note_model.filter.search_ids is not None and any(event.kind == NoteEvent.ADDED for event in events):
+            self.filter_notes()  # Новая заметка может подходить под текущий запрос
+
+    def on_load_finished(self, search_index):
+        """
+        Подключает поисковый индекс после окончания загрузки.
+        """
+        self.search_index = search_index
+        self.planner.set_search_index(search_index)
+        if self.changed_while_loading:
+            self.search_index.sync(self.notes)
+        self.loading = False
+        self.changed_while_loading = False
+        self.setWindowTitle("NoteApp")
+        if self.search_bar.text().strip() or self.note_model.previewing or self.note_model.unordered:
+            self.filter_notes()  # Первый экран из кэша или порции загрузки заменяются упорядоченным списком
+        if self.sync is not None:
+            self.sync_timer.start()
+        self.loaded.emit()
+
+    def on_storage_failed(self, message):
+        """
+        Сообщает об ошибке чтения или записи файла заметок.
+        Если не удалась загрузка, список показывает уже прочитанные заметки,
+        а файл больше не перезаписывается снимком (см. StorageWorker.load_error).
+        """
+        if not self.loading:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить заметки: {message}")
+            return
+        self.loading = False
+        self.search_index.sync(self.notes)  # Поиск по прочитанным заметкам; индекс на диск не сохраняется
+        self.planner.set_search_index(self.search_index)
+        self.setWindowTitle("NoteApp (заметки загружены не полностью)")
+        if self.note_model.previewing or self.note_model.unordered:
+            self.filter_notes()
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить заметки: {message}\n"
+                             "Файл не будет перезаписан: изменения только дописываются в журнал.")
+
+    def poll_changes(self):
+        """
+        Запрашивает проверку файла заметок на изменения, сделанные другими окнами.
+        Файл читается в рабочем потоке хранилища, результат приходит в on_changes_fetched.
+        """
+        self.storage.poll()
+
+    def on_changes_fetched(self, changes):
+        """
+        Применяет изменения файла заметок, сделанные другими окнами,
+        и сообщает о конфликтах правок одних и тех же заметок.
+        """
+        with profiler.stage("sync_apply"):
+            conflicts = self.sync.apply(changes)
+        if conflicts:
+            self.sync_timer.stop()  # Пока открыто сообщение, файл не проверяется
+            QMessageBox.warning(self, "Изменения в другом окне",
+                                "\n".join(conflict.describe() for conflict in conflicts))
+            self.sync_timer.start()
 
     def save_notes(self):
         """
-        Сохраняет текущие заметки в файл через DataSerializer.
+        Сохраняет текущие заметки в файл через DataSerializer (полный снимок) в фоновом потоке.
+        """
+        self.storage.save_snapshot(self.notes)
+
+    def save_search_index(self):
+        """
+        Сохраняет поисковый индекс рядом с файлом данных, чтобы не строить его заново при запуске.
         """
-        DataSerializer.save(self.notes)
+        if self.search_index.dirty:
+            self.search_index.save(self.DATA_FILE + SearchIndex.SUFFIX)
+
+    def closeEvent(self, event):
+        """
+        Дописывает накопленные изменения и сохраняет поисковый индекс и первый экран при закрытии окна.
+        """
+        self.sync_timer.stop()
+        self.search.shutdown()
+        self.storage.shutdown()
+        if not self.loading and self.storage.load_error is None:
+            self.save_search_index()
+            self.save_first_screen()
+        super().closeEvent(event)
+
+    def compact_notes_if_needed(self):
+        """
+        Сворачивает журнал изменений в новый снимок, если в нём накопилось много записей.
+        """
+        if self.SERIALIZER.needs_compaction(self.DATA_FILE):
+            self.save_notes()
 
     def refresh_note_list(self):
         """
         Обновляет список заметок в интерфейсе.
-        Очищает текущий список и добавляет все заметки из self.notes с краткой информацией.
+        Модель пересчитывает видимые заметки; строки форматируются только при отображении.
         """
-        self.note_list.clear()
-        for note in self.notes:
-            self.note_list.addItem(f"{note.title} ({note.category}) - {note.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        self.note_model.refresh()
+
+    def note_from_index(self, index):
+        """
+        Возвращает заметку, соответствующую строке списка.
+        """
+        return self.note_model.note_at(index)
 
     def add_note(self):
         """
         Открывает окно для добавления новой заметки.
-        Если пользователь подтверждает создание, заметка добавляется в self.notes, 
-        сохраняется и обновляется список заметок в интерфейсе.
+        Если пользователь подтверждает создание, заметка добавляется в self.notes;
+        по событию хранилища изменение записывается в журнал и в список добавляется одна строка.
         """
+        from note_dialogs import NoteEditorDialog
         dialog = NoteEditorDialog(parent=self)
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_note_data()
-            note = Note(title=data["title"], content=data["content"], category=data["category"])
-            self.notes.append(note)
-            self.save_notes()
-            self.refresh_note_list()
+            self.notes.add(Note(title=data["title"], content=data["content"], category=data["category"]))
 
-    def edit_note(self, item):
+    def edit_note(self, index):
         """
         Открывает окно для редактирования выбранной заметки.
-        Если пользователь подтверждает изменения, обновляются поля заметки, 
-        сохраняются изменения и обновляется список заметок в интерфейсе.
+        Если пользователь подтверждает изменения, поля заметки обновляются одним пакетом:
+        подписчики получают одно событие, в журнал попадает одна запись
+        и обновляется строка заметки в списке.
         """
-        index = self.note_list.row(item)
-        note = self.notes[index]
+        note = self.note_from_index(index)
+        if note is None:
+            return
+        from note_dialogs import NoteEditorDialog
         dialog = NoteEditorDialog(note=note, parent=self)
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_note_data()
-            note.title = data["title"]
-            note.content = data["content"]
-            note.category = data["category"]
-            self.save_notes()
-            self.refresh_note_list()
+            with self.notes.batch():
+                note.title = data["title"]
+                note.content = data["content"]
+                note.category = data["category"]
 
     def delete_note(self):
         """
         Удаляет выбранную заметку.
         Если ни одна заметка не выбрана, отображается предупреждение. 
-        Если пользователь подтверждает удаление, заметка удаляется из self.notes, 
-        сохраняется обновленный список и интерфейс обновляется.
+        Если пользователь подтверждает удаление, заметка удаляется из self.notes;
+        по событию хранилища удаление записывается в журнал и из списка убирается одна строка.
         """
-        current_item = self.note_list.currentItem()
-        if not current_item:
+        note = self.note_from_index(self.note_list.currentIndex())
+        if note is None:
             QMessageBox.warning(self, "Ошибка", "Выберите заметку для удаления.")
             return
 
-        index = self.note_list.row(current_item)
-        reply = QMessageBox.question(self, "Подтверждение", f"Удалить заметку '{self.notes[index].title}'?",
+        reply = QMessageBox.question(self, "Подтверждение", f"Удалить заметку '{note.title}'?",
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            del self.notes[index]
-            self.save_notes()
-            self.refresh_note_list()
+            self.notes.remove(note.id)
+
+    def current_query(self):
+        """
+        Составляет запрос из строки поиска, выбранной категории и сортировки.
+
+        :return: NoteQuery
+        """
+        category = self.category_combo.currentText()
+        return NoteQuery(text=self.search_bar.text(), categories=None if category == "Все" else {category},
+                         sort=self.sort_key)
+
+    def on_search_text_changed(self):
+        """
+        Запрашивает выполнение запроса после паузы ввода в строке поиска.
+        """
+        self.search.search(self.current_query())
 
     def filter_notes(self):
         """
-        Фильтрует заметки по заголовку.
-        Обновляет список заметок в интерфейсе, оставляя только те, которые содержат 
-        строку из поля поиска.
+        Сразу выполняет текущий запрос (без паузы ввода).
+        Результаты приходят в on_query_results (при поиске по тексту — асинхронно).
+        """
+        self.search.search_now(self.current_query())
+
+    def on_query_results(self, result):
+        """
+        Показывает результаты запроса: заметки выбранной категории, найденные по строке поиска,
+        в выбранном порядке (без сортировки — по релевантности). Пустой запрос показывает все заметки.
+
+        :param result: Результат запроса (QueryResult).
         """
-        query = self.search_bar.text().lower()
-        self.note_list.clear()
-        for note in self.notes:
-            if query in note.title.lower():
-                self.note_list.addItem(f"{note.title} ({note.category}) - {note.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        self.note_model.show_result(result)
 
     def filter_by_category(self):
         """
         Фильтрует заметки по категории.
         Если выбрана категория "Все", отображаются все заметки.
         """
-        selected_category = self.category_combo.currentText()
-        self.note_list.clear()
-        for note in self.notes:
-            if selected_category == "Все" or note.category == selected_category:
-                self.note_list.addItem(f"{note.title} ({note.category}) - {note.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        self.filter_notes()
 
     def sort_notes(self):
         """
         Сортирует заметки по выбранному критерию (имя или дата создания).
-        Обновляет список заметок в интерфейсе.
+        Сортируется только отображение, порядок заметок в хранилище не меняется.
         """
-        if self.sort_combo.currentText() == "Сортировка: По имени":
-            self.notes.sort(key=lambda note: note.title)
-        elif self.sort_combo.currentText() == "Сортировка: По дате":
-            self.notes.sort(key=lambda note: note.created_at)
-        self.refresh_note_list()
+        for key, label in self.SORT_LABELS.items():
+            if self.sort_combo.currentText() == label:
+                self.sort_key = key
+        self.filter_notes()
 
-    def show_note_content(self, item):
+    def show_note_content(self, index):
         """
         Отображает содержимое выбранной заметки в правом фрейме.
         Показывает заголовок, содержимое, категорию, дату создания и дату изменения.
         """
-        index = self.note_list.row(item)
-        note = self.notes[index]
-        self.content_title_label.setText(f"Заголовок: {note.title}")
-        self.content_body_label.setText(f"Содержимое: {note.content}")
-        self.content_category_label.setText(f"Категория: {note.category}")
-        self.content_created_label.setText(f"Дата создания: {note.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        note = self.note_from_index(index)
+        if note is None:
+            return
+        title, body, category, created, modified = self.details.get(note)
+        self.content_title_label.setText(title)
+        self.content_body_label.setText(body)
+        self.content_category_label.setText(category)
+        self.content_created_label.setText(created)
+        self.content_modified_label.setText(modified)
+
+    @staticmethod
+    def detail_texts(note):
+        """
+        Возвращает строки панели просмотра заметки.
+
+        :param note: Объект типа Note.
+        :return: (заголовок, содержимое, категория, дата создания, дата модификации)
+        """
         if note.modified_at != note.created_at:
-            self.content_modified_label.setText(f"Дата модификации: {note.modified_at.strftime('%Y-%m-%d %H:%M:%S')}")
+            modified = f"Дата модификации: {note.modified_at.strftime('%Y-%m-%d %H:%M:%S')}"
         else:
-            self.content_modified_label.setText("Дата модификации: Не изменено")
+            modified = "Дата модификации: Не изменено"
+        return (f"Заголовок: {note.title}", f"Содержимое: {note.content}", f"Категория: {note.category}",
+                f"Дата создания: {note.created_at.strftime('%Y-%m-%d %H:%M:%S')}", modified)
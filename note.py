@@ -1,24 +1,51 @@
 import datetime
+import sys
+import uuid
 
 class Note:
     """
     Класс для представления заметки.
 
-    Содержит заголовок, текст, категорию, дату создания и дату изменения заметки.
+    Содержит постоянный идентификатор, заголовок, текст, категорию,
+    дату создания и дату изменения заметки.
+
+    Заметка хранится компактно: атрибуты объявлены в __slots__, названия категорий
+    интернируются, а даты из файла остаются строками ISO до первого обращения.
+    Текст заметки, загруженной из двоичного снимка, может не храниться в памяти:
+    вместо него лежит ссылка на место в файле (LazyBody), и текст читается при обращении.
+
+    Об изменении заголовка, текста или категории через свойства сообщается
+    подписчикам заметки (subscribe) и хранилищу, в котором она лежит.
     """
-    def __init__(self, title: str, content: str, category: str = "Разное"):
+    __slots__ = ("_id", "_title", "_content", "_category", "_created_at", "_modified_at", "_store", "_observers")
+
+    def __init__(self, title: str, content: str, category: str = "Разное", note_id: str = None):
         """
         Инициализация заметки.
 
         :param title: Заголовок заметки.
         :param content: Текст заметки.
         :param category: Категория заметки (по умолчанию "Разное").
+        :param note_id: Идентификатор заметки (по умолчанию генерируется новый).
         """
+        self._id = note_id or uuid.uuid4().hex  # Уникальный идентификатор заметки
         self._title = title  # Заголовок заметки
         self._content = content  # Текст заметки
-        self._category = category  # Категория заметки
-        self._created_at = datetime.datetime.now()  # Дата и время создания заметки
-        self._modified_at = datetime.datetime.now()  # Дата и время последнего изменения заметки
+        self._category = sys.intern(category)  # Категория заметки (категорий мало, строки общие)
+        now = datetime.datetime.now()
+        self._created_at = now  # Дата и время создания заметки (datetime или строка ISO)
+        self._modified_at = now  # Дата и время последнего изменения заметки (datetime или строка ISO)
+        self._store = None  # Хранилище, в котором лежит заметка (NoteStore или None)
+        self._observers = None  # Подписчики на изменения полей (кортеж или None)
+
+    @property
+    def id(self):
+        """
+        Возвращает уникальный идентификатор заметки.
+
+        :return: str
+        """
+        return self._id
 
     @property
     def title(self):
@@ -39,16 +66,38 @@ class Note:
         """
         if not value:
             raise ValueError("Заголовок не может быть пустым.")
+        old = self._title
         self._title = value
         self._modified_at = datetime.datetime.now()  # Обновляем дату изменения
+        self._notify("title", old, value)
 
     @property
     def content(self):
         """
         Возвращает текст заметки.
+        Текст, оставленный в файле, читается оттуда (недавние — из кэша файла).
 
         :return: str
         """
+        value = self._content
+        return value if isinstance(value, str) else value.load()
+
+    @property
+    def content_loaded(self):
+        """
+        Проверяет, находится ли текст заметки в памяти.
+
+        :return: bool
+        """
+        return isinstance(self._content, str)
+
+    @property
+    def body(self):
+        """
+        Возвращает текст заметки или ссылку на него в файле (LazyBody), не читая текст.
+
+        :return: str или LazyBody
+        """
         return self._content
 
     @content.setter
@@ -58,8 +107,10 @@ class Note:
 
         :param value: Новый текст заметки.
         """
+        old = self.content
         self._content = value
         self._modified_at = datetime.datetime.now()  # Обновляем дату изменения
+        self._notify("content", old, value)
 
     @property
     def category(self):
@@ -77,27 +128,83 @@ class Note:
 
         :param value: Новая категория заметки.
         """
-        self._category = value
+        old = self._category
+        self._category = sys.intern(value)
         self._modified_at = datetime.datetime.now()  # Обновляем дату изменения
+        self._notify("category", old, self._category)
+
+    def subscribe(self, callback):
+        """
+        Подписывает на изменения полей заметки.
+
+        :param callback: Функция callback(note, field, old, new), вызывается после
+                         изменения заголовка, текста или категории.
+        """
+        self._observers = (self._observers or ()) + (callback,)
+
+    def unsubscribe(self, callback):
+        """
+        Отменяет подписку на изменения полей заметки.
+
+        :param callback: Ранее подписанная функция.
+        """
+        observers = tuple(observer for observer in self._observers or () if observer != callback)
+        self._observers = observers or None
+
+    def _notify(self, field: str, old, new):
+        """
+        Сообщает подписчикам и хранилищу об изменении поля.
+        """
+        if self._observers is not None:
+            for callback in self._observers:
+                callback(self, field, old, new)
+        if self._store is not None:
+            self._store.note_changed(self, field, old, new)
 
     @property
     def created_at(self):
         """
         Возвращает дату и время создания заметки.
+        Строка ISO, прочитанная из файла, разбирается при первом обращении.
 
         :return: datetime
         """
+        if isinstance(self._created_at, str):
+            self._created_at = datetime.datetime.fromisoformat(self._created_at)
         return self._created_at
 
     @property
     def modified_at(self):
         """
         Возвращает дату и время последнего изменения заметки.
+        Строка ISO, прочитанная из файла, разбирается при первом обращении.
 
         :return: datetime
         """
+        if isinstance(self._modified_at, str):
+            self._modified_at = datetime.datetime.fromisoformat(self._modified_at)
         return self._modified_at
 
+    @property
+    def created_at_iso(self):
+        """
+        Возвращает дату создания в формате ISO без разбора строки из файла.
+
+        :return: str
+        """
+        value = self._created_at
+        return value if isinstance(value, str) else value.isoformat()
+
+    @property
+    def modified_at_iso(self):
+        """
+        Возвращает дату изменения в формате ISO без разбора строки из файла.
+
+        :return: str
+        """
+        value = self._modified_at
+        return value if isinstance(value, str) else value.isoformat()
+
     def to_dict(self):
         """
         Преобразует объект заметки в словарь.
@@ -105,11 +212,12 @@ class Note:
         :return: dict
         """
         return {
+            "id": self._id,  # Идентификатор
             "title": self._title,  # Заголовок
-            "content": self._content,  # Текст
+            "content": self.content,  # Текст
             "category": self._category,  # Категория
-            "created_at": self._created_at.isoformat(),  # Дата создания в формате ISO
-            "modified_at": self._modified_at.isoformat(),  # Дата изменения в формате ISO
+            "created_at": self.created_at_iso,  # Дата создания в формате ISO
+            "modified_at": self.modified_at_iso,  # Дата изменения в формате ISO
         }
 
     @staticmethod
@@ -117,16 +225,21 @@ class Note:
         """
         Создает объект заметки из словаря.
 
-        :param data: Словарь с данными заметки.
+        :param data: Словарь с данными заметки (даты — строки ISO или datetime,
+                     текст — строка или ссылка на место в файле).
         :return: Note
         """
-        note = Note(
-            title=data["title"],
-            content=data["content"],
-            category=data.get("category", "Разное")  # Устанавливаем категорию, если она есть в словаре
-        )
-        note._created_at = datetime.datetime.fromisoformat(data["created_at"])  # Восстанавливаем дату создания
-        note._modified_at = datetime.datetime.fromisoformat(data["modified_at"])  # Восстанавливаем дату изменения
+        # Конструктор не вызывается: он бы дважды запросил текущее время
+        # и сгенерировал идентификатор, которые сразу же были бы перезаписаны
+        note = Note.__new__(Note)
+        note._id = data.get("id") or uuid.uuid4().hex  # Старые файлы без идентификатора получают новый
+        note._title = data["title"]
+        note._content = data["content"]
+        note._category = sys.intern(data.get("category", "Разное"))  # Категория по умолчанию, если её нет в словаре
+        note._created_at = data["created_at"]  # Дата создания разбирается при первом обращении
+        note._modified_at = data["modified_at"]  # Дата изменения разбирается при первом обращении
+        note._store = None
+        note._observers = None
         return note
 
     def __str__(self):
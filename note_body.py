@@ -0,0 +1,209 @@
+import mmap
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class BodyFile:
+    """
+    Тексты заметок, читаемые из файла по требованию.
+
+    Файл отображается в память (mmap) и остаётся открытым, пока на него
+    ссылаются заметки. Текст читается по смещению и длине без разбора
+    остального файла. Недавно прочитанные тексты хранятся в ограниченном
+    LRU-кэше, поэтому повторный показ заметки не обращается к диску, а
+    расход памяти не зависит от общего объёма текстов.
+
+    Перед атомарной заменой файла новым снимком отображение закрывается
+    (release — на Windows файл с открытым отображением не заменить), а после
+    замены ссылки на тексты, попавшие в новый снимок, переводятся на него
+    (rebind). Тексты, которых в новом снимке нет, переносятся в память,
+    поэтому ссылки остаются верными.
+    """
+    CACHE_SIZE = 256  # Количество текстов в кэше недавно прочитанных
+    _open = weakref.WeakSet()  # Отображённые файлы (для release перед заменой файла)
+
+    def __init__(self, filename: str, cache_size: int = None):
+        """
+        Инициализация источника текстов.
+
+        :param filename: Имя файла (None — тексты в памяти, см. _from_bytes).
+        :param cache_size: Размер кэша (по умолчанию CACHE_SIZE).
+        """
+        self.filename = filename
+        self.cache_size = self.CACHE_SIZE if cache_size is None else cache_size
+        self.view = None  # Отображение файла (None — закрыто и откроется при чтении)
+        self._bodies = []  # Ссылки на тексты этого источника (LazyBody), в том числе уже ненужные заметкам
+        self._cache = OrderedDict()  # Смещение -> текст
+        self._lock = threading.Lock()
+        self.hits = 0  # Количество текстов, взятых из кэша
+        self.misses = 0  # Количество текстов, прочитанных из файла
+        if filename is not None:
+            self._map()
+            BodyFile._open.add(self)
+
+    @classmethod
+    def _from_bytes(cls, data: bytes):
+        """
+        Источник текстов в памяти (для текстов, файл которых заменён).
+        """
+        source = cls(None, 0)
+        source.view = data
+        return source
+
+    def _map(self):
+        with open(self.filename, 'rb') as file:
+            self.view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # Отображение живёт дольше дескриптора
+
+    def raw(self, offset: int, length: int):
+        """
+        Возвращает байты текста (UTF-8) без декодирования. Закрытое отображение открывается заново.
+
+        :param offset: Смещение текста в файле.
+        :param length: Длина текста в байтах.
+        :return: bytes
+        """
+        with self._lock:
+            if self.view is None:
+                self._map()
+            return self.view[offset:offset + length]
+
+    def read(self, offset: int, length: int):
+        """
+        Возвращает текст по смещению и длине в байтах UTF-8.
+
+        :param offset: Смещение текста в файле.
+        :param length: Длина текста в байтах.
+        :return: str
+        """
+        with self._lock:
+            text = self._cache.get(offset)
+            if text is not None:
+                self._cache.move_to_end(offset)
+                self.hits += 1
+                return text
+            self.misses += 1
+        text = self.raw(offset, length).decode('utf-8')
+        if self.cache_size:
+            with self._lock:
+                self._cache[offset] = text
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return text
+
+    def close(self):
+        """
+        Закрывает отображение файла. Заметки, ссылающиеся на него, больше не читаются.
+        """
+        BodyFile._open.discard(self)
+        with self._lock:
+            self._cache.clear()
+            if isinstance(self.view, mmap.mmap):
+                self.view.close()
+
+    def _adopt(self, body, offset: int):
+        """
+        Переводит ссылку на текст на этот источник.
+        """
+        body._place = (self, offset)  # Источник и смещение меняются одним присваиванием (читающий поток)
+        self._bodies.append(body)
+
+    @classmethod
+    def release(cls, filename: str, moved=()):
+        """
+        Закрывает отображения файла перед его заменой новым снимком.
+        Тексты, которые в новый снимок не попали, переносятся в память; остальные
+        до rebind читаются из прежнего файла (если замена не удалась, он на месте).
+
+        :param filename: Имя заменяемого файла.
+        :param moved: Пары (LazyBody, смещение в новом снимке) от BinarySnapshot.save.
+        """
+        path = os.path.normcase(os.path.abspath(filename))
+        kept = {id(body) for body, _ in moved}
+        for source in list(cls._open):
+            if os.path.normcase(os.path.abspath(source.filename)) != path:
+                continue
+            orphans = [body for body in source._bodies if id(body) not in kept and body.source is source]
+            if orphans:
+                memory = cls._from_bytes(b"".join(source.raw(body.offset, body.length) for body in orphans))
+                size = 0
+                for body in orphans:
+                    memory._adopt(body, size)
+                    size += body.length
+                source._bodies = [body for body in source._bodies if body.source is source]
+            with source._lock:
+                if source.view is not None:
+                    source.view.close()
+                    source.view = None
+
+    @classmethod
+    def rebind(cls, moved, filename: str):
+        """
+        Переводит ссылки на тексты на новый снимок после его замены.
+
+        :param moved: Пары (LazyBody, смещение в новом снимке) от BinarySnapshot.save.
+        :param filename: Имя нового снимка.
+        """
+        if not moved:
+            return
+        previous = {id(body.source): body.source for body, _ in moved}
+        source = cls(filename, moved[0][0].source.cache_size)
+        for body, offset in moved:
+            source._adopt(body, offset)
+        for old in previous.values():
+            old._bodies = [body for body in old._bodies if body.source is old]
+
+
+class LazyBody:
+    """
+    Ссылка на текст заметки в файле (вместо самого текста).
+    """
+    __slots__ = ("_place", "length")
+
+    def __init__(self, source: BodyFile, offset: int, length: int):
+        """
+        Инициализация ссылки.
+
+        :param source: Файл с текстами (BodyFile).
+        :param offset: Смещение текста в файле.
+        :param length: Длина текста в байтах UTF-8.
+        """
+        self._place = (source, offset)  # Источник и смещение (переводятся на новый снимок вместе)
+        self.length = length
+        source._bodies.append(self)
+
+    @property
+    def source(self):
+        """
+        Возвращает файл с текстом (BodyFile).
+        """
+        return self._place[0]
+
+    @property
+    def offset(self):
+        """
+        Возвращает смещение текста в файле.
+        """
+        return self._place[1]
+
+    def load(self):
+        """
+        Читает текст (из кэша файла или с диска).
+
+        :return: str
+        """
+        source, offset = self._place
+        return source.read(offset, self.length)
+
+    def raw(self):
+        """
+        Читает байты текста (UTF-8) без декодирования, минуя кэш.
+
+        :return: bytes
+        """
+        source, offset = self._place
+        return source.raw(offset, self.length)
+
+    def __repr__(self):
+        return f"LazyBody({self.source.filename!r}, {self.offset}, {self.length})"
@@ -1,9 +1,28 @@
+import bisect
 from note import Note
+from note_events import NoteEvent
+
+# Категории заметок, поддерживаемые приложением
+CATEGORIES = ["Работа", "Дом", "Здоровье и Спорт", "Люди", "Документы", "Финансы", "Разное"]
+
+SORT_KEYS = ("created_at", "title")  # Порядки, которые категория поддерживает без сортировки
+
+
+def _discard(keys: list, key: tuple):
+    """
+    Удаляет ключ из отсортированного списка (двоичный поиск).
+    """
+    position = bisect.bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
+
 
 class NoteCategory:
     """
     Класс для управления категориями заметок.
-    Каждая категория содержит список заметок.
+    Каждая категория содержит заметки, проиндексированные по идентификатору,
+    и поддерживает их упорядоченными по дате создания и по заголовку,
+    поэтому заметки категории выдаются в нужном порядке без сортировки.
     """
     def __init__(self, name: str):
         """
@@ -12,7 +31,11 @@ class NoteCategory:
         :param name: Название категории.
         """
         self._name = name  # Название категории
-        self.notes = []  # Список заметок в категории
+        self._notes = {}  # Заметки категории: "идентификатор -> заметка"
+        self._titles = {}  # Заголовок, под которым заметка стоит в порядке заголовков
+        self._dates = {}  # Дата создания ISO, под которой заметка стоит в порядке дат
+        self._by_date = []  # Пары (дата создания ISO, идентификатор) по возрастанию
+        self._by_title = []  # Пары (заголовок, идентификатор) по возрастанию
 
     @property
     def name(self):
@@ -35,6 +58,15 @@ class NoteCategory:
             raise ValueError("Название категории не может быть пустым.")
         self._name = value
 
+    @property
+    def notes(self):
+        """
+        Возвращает список заметок в категории.
+
+        :return: list of Note
+        """
+        return list(self._notes.values())
+
     def add_note(self, note: Note):
         """
         Добавляет заметку в категорию.
@@ -44,15 +76,78 @@ class NoteCategory:
         """
         if not isinstance(note, Note):
             raise ValueError("Можно добавлять только объекты типа Note.")
-        self.notes.append(note)
+        if note.id in self._notes:
+            self.remove_note(note.id)
+        self._notes[note.id] = note
+        self._titles[note.id] = note.title
+        # Строка даты из файла может смениться после разбора (например, "2024-01-01" -> "2024-01-01T00:00:00"),
+        # поэтому удаляется заметка по ключу, под которым её вставили
+        self._dates[note.id] = note.created_at_iso
+        bisect.insort(self._by_date, (self._dates[note.id], note.id))
+        bisect.insort(self._by_title, (note.title, note.id))
+
+    def add_notes(self, notes):
+        """
+        Добавляет много заметок сразу (загрузка): ключи дописываются в конец,
+        и порядки сортируются один раз, а не вставкой каждой заметки.
+
+        :param notes: Заметки (Note) этой категории.
+        """
+        fresh = {note.id: note for note in notes}
+        for note_id in fresh.keys() & self._notes.keys():
+            self.remove_note(note_id)
+        for note_id, note in fresh.items():
+            self._notes[note_id] = note
+            self._titles[note_id] = note.title
+            self._dates[note_id] = note.created_at_iso
+            self._by_date.append((self._dates[note_id], note_id))
+            self._by_title.append((note.title, note_id))
+        # Уже упорядоченная часть и дописанный кусок сливаются сортировкой за один проход
+        self._by_date.sort()
+        self._by_title.sort()
+
+    def get_note(self, note_id: str):
+        """
+        Возвращает заметку категории по идентификатору.
+
+        :param note_id: Идентификатор заметки.
+        :return: Note или None, если заметки нет в категории.
+        """
+        return self._notes.get(note_id)
+
+    def remove_note(self, note_id: str):
+        """
+        Удаляет заметку из категории по её идентификатору.
+
+        :param note_id: Идентификатор заметки, которую нужно удалить.
+        """
+        note = self._notes.pop(note_id, None)
+        if note is None:
+            return
+        _discard(self._by_date, (self._dates.pop(note_id), note_id))
+        _discard(self._by_title, (self._titles.pop(note_id), note_id))
+
+    def retitle_note(self, note: Note):
+        """
+        Переставляет заметку в порядке заголовков после смены заголовка.
+
+        :param note: Объект типа Note.
+        """
+        old = self._titles.get(note.id)
+        if old is None or old == note.title:
+            return
+        _discard(self._by_title, (old, note.id))
+        bisect.insort(self._by_title, (note.title, note.id))
+        self._titles[note.id] = note.title
 
     def remove_note_by_title(self, title: str):
         """
-        Удаляет заметку из категории по её заголовку.
+        Удаляет заметки из категории по заголовку.
 
         :param title: Заголовок заметки, которую нужно удалить.
         """
-        self.notes = [note for note in self.notes if note.title != title]
+        for note in [note for note in self._notes.values() if note.title == title]:
+            self.remove_note(note.id)
 
     def get_notes(self):
         """
@@ -61,3 +156,179 @@ class NoteCategory:
         :return: list of Note
         """
         return self.notes
+
+    def sorted_ids(self, key: str = "created_at", descending: bool = False):
+        """
+        Возвращает идентификаторы заметок категории в порядке даты создания или заголовка.
+        Порядок поддерживается при изменениях, поэтому время пропорционально размеру категории.
+
+        :param key: "created_at" или "title".
+        :param descending: По убыванию.
+        :return: list of str
+        """
+        if key not in SORT_KEYS:
+            raise ValueError(f"Неизвестный ключ сортировки: {key}")
+        keys = self._by_date if key == "created_at" else self._by_title
+        ids = [note_id for _, note_id in keys]
+        if descending:
+            ids.reverse()
+        return ids
+
+    def sorted_notes(self, key: str = "created_at", descending: bool = False):
+        """
+        Возвращает заметки категории в порядке даты создания или заголовка.
+
+        :return: list of Note
+        """
+        return [self._notes[note_id] for note_id in self.sorted_ids(key, descending)]
+
+    def __contains__(self, note_id):
+        return note_id in self._notes
+
+    def __len__(self):
+        return len(self._notes)
+
+
+class CategoryIndex:
+    """
+    Индекс заметок по категориям: для каждой категории своя NoteCategory.
+
+    Индекс подписывается на события хранилища (apply_events), поэтому смена
+    категории или заголовка заметки через её свойства сразу переносит её
+    в нужную категорию и позицию, без перестройки индекса.
+    Количество заметок в категории известно сразу, а выборка категории
+    занимает время, пропорциональное числу её заметок, а не всех заметок.
+    """
+    def __init__(self, notes=None):
+        """
+        Инициализация индекса.
+
+        :param notes: Начальный набор заметок (необязательно).
+        """
+        self._categories = {name: NoteCategory(name) for name in CATEGORIES}  # Название -> категория
+        self._membership = {}  # Идентификатор заметки -> название её категории в индексе
+        self.add_many(notes or [])
+
+    def category(self, name: str):
+        """
+        Возвращает категорию по названию (пустую, если заметок в ней нет).
+
+        :param name: Название категории.
+        :return: NoteCategory
+        """
+        category = self._categories.get(name)
+        if category is None:
+            category = self._categories[name] = NoteCategory(name)
+        return category
+
+    def add(self, note: Note):
+        """
+        Добавляет заметку в категорию (или переносит уже добавленную).
+
+        :param note: Объект типа Note.
+        """
+        if note.id in self._membership:
+            self.remove(note.id)
+        self.category(note.category).add_note(note)
+        self._membership[note.id] = note.category
+
+    def add_many(self, notes):
+        """
+        Добавляет много заметок сразу (загрузка): каждая категория сортируется один раз.
+
+        :param notes: Заметки (Note).
+        """
+        groups = {}
+        for note in {note.id: note for note in notes}.values():
+            if note.id in self._membership:
+                self.remove(note.id)
+            groups.setdefault(note.category, []).append(note)
+            self._membership[note.id] = note.category
+        for name, group in groups.items():
+            self.category(name).add_notes(group)
+
+    def remove(self, note_id: str):
+        """
+        Удаляет заметку из индекса.
+
+        :param note_id: Идентификатор заметки.
+        """
+        name = self._membership.pop(note_id, None)
+        if name is None:
+            return
+        self._categories[name].remove_note(note_id)
+
+    def category_of(self, note_id: str):
+        """
+        Возвращает категорию заметки в индексе.
+
+        :param note_id: Идентификатор заметки.
+        :return: str или None, если заметки нет в индексе.
+        """
+        return self._membership.get(note_id)
+
+    def apply_events(self, events):
+        """
+        Обновляет индекс по событиям хранилища заметок (подписчик NoteStore).
+
+        :param events: Список NoteEvent.
+        """
+        loaded = []  # Подряд идущие загруженные заметки добавляются одной пачкой
+        for event in events:
+            if event.kind == NoteEvent.LOADED:
+                loaded.append(event.note)
+                continue
+            if loaded:
+                self.add_many(loaded)
+                loaded = []
+            if event.kind == NoteEvent.REMOVED:
+                self.remove(event.note_id)
+                continue
+            name = self._membership.get(event.note_id)
+            category = None if name is None else self._categories[name]
+            if category is not None and category.get_note(event.note_id) is event.note and name == event.note.category:
+                category.retitle_note(event.note)  # Та же заметка в той же категории: мог смениться только заголовок
+            else:
+                self.add(event.note)
+        if loaded:
+            self.add_many(loaded)
+
+    def count(self, name: str = None):
+        """
+        Возвращает количество заметок (всего или в категории).
+
+        :param name: Название категории (None — все категории).
+        :return: int
+        """
+        if name is None:
+            return len(self._membership)
+        category = self._categories.get(name)
+        return 0 if category is None else len(category)
+
+    def counts(self):
+        """
+        Возвращает количество заметок в каждой категории.
+
+        :return: dict
+        """
+        return {name: len(category) for name, category in self._categories.items()}
+
+    def ids(self, name: str, sort: str = None, descending: bool = False):
+        """
+        Возвращает идентификаторы заметок категории в нужном порядке.
+
+        :param name: Название категории.
+        :param sort: "created_at", "title" или None (по дате создания).
+        :param descending: По убыванию.
+        :return: list of str
+        """
+        category = self._categories.get(name)
+        if category is None:
+            return []
+        return category.sorted_ids(sort or "created_at", descending)
+
+    def __contains__(self, note_id):
+        return note_id in self._membership
+
+    def __len__(self):
+        return len(self._membership)
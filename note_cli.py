@@ -0,0 +1,529 @@
+"""
+Работа с заметками из командной строки, без окна приложения.
+
+Команды:
+    import  — массовый импорт из файлов и каталогов JSON, CSV и Markdown;
+    edit    — массовое изменение заметок, подходящих под запрос;
+    export  — выгрузка заметок (всех или подходящих под запрос) в JSON, CSV или Markdown;
+    stats   — сводка по файлу заметок.
+
+Запуск: python note_cli.py import notes/ --workers 4
+        python note_cli.py edit --category Дом --text ремонт --set-category Финансы
+        python note_cli.py export notes.csv --format csv --from 2024-01-01
+        python note_cli.py stats
+"""
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from atomic_file import AtomicFile
+from data_serializer import DataSerializer
+from note import Note
+from note_category import CATEGORIES, CategoryIndex
+from note_events import NoteEvent
+from note_journal import NoteJournal
+from note_query import NoteQuery, QueryPlanner
+from note_table import NoteTable
+from search_index import SearchIndex
+
+DATA_FILE = "notes_data.json"  # Файл с заметками по умолчанию (как у приложения)
+BATCH_SIZE = 1000  # Количество заметок, записываемых в журнал одной операцией
+FORMATS = {".json": "json", ".csv": "csv", ".md": "md", ".markdown": "md"}  # Расширение -> формат
+CSV_FIELDS = ("id", "title", "content", "category", "created_at", "modified_at")  # Столбцы CSV
+FILE_ERRORS = (OSError, ValueError, csv.Error)  # Ошибки чтения входного файла (в том числе JSONDecodeError)
+UNSAFE_NAME = re.compile(r"[^\w.-]+")  # Символы идентификатора, недопустимые в имени файла выгрузки
+
+
+def input_files(paths, fmt: str = None):
+    """
+    Перечисляет входные файлы: файлы как есть, каталоги — рекурсивно по известным расширениям.
+
+    :param paths: Пути к файлам и каталогам.
+    :param fmt: Формат всех файлов ("json", "csv" или "md"; по умолчанию — по расширению).
+    :return: iterator of (путь, формат)
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    detected = fmt or FORMATS.get(os.path.splitext(name)[1].lower())
+                    if detected is not None:
+                        yield os.path.join(root, name), detected
+        else:
+            yield path, fmt or FORMATS.get(os.path.splitext(path)[1].lower(), "json")
+
+
+def _check_item(item: dict):
+    """
+    Проверяет элемент импорта и приводит его к словарю заметки.
+    Даты записываются в том же виде ISO, что и у заметок приложения
+    (например, "2024-01-01" -> "2024-01-01T00:00:00"), дата с часовым поясом
+    переводится в местное время без пояса; идентификатор — строкой.
+
+    :return: dict или None, если элемент не годится (нет заголовка или дата не разбирается).
+    """
+    title = str(item.get("title") or "").strip()
+    if not title:
+        return None
+    result = {"title": title, "content": str(item.get("content") or ""),
+              "category": str(item.get("category") or "").strip() or "Разное"}
+    if item.get("id") not in (None, ""):
+        result["id"] = str(item["id"])
+    for field in ("created_at", "modified_at"):
+        value = item.get(field)
+        if value:
+            try:
+                parsed = datetime.datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                return None
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone().replace(tzinfo=None)
+            result[field] = parsed.isoformat()
+    return result
+
+
+def read_items(path: str, fmt: str):
+    """
+    Потоково читает элементы входного файла. Массив JSON читается по одному элементу
+    через DataSerializer.iter_items_from_file (в том числе сжатый), CSV — по строкам;
+    только обёртка {"notes": [...]} разбирается целиком.
+
+    :param path: Путь к файлу.
+    :param fmt: Формат ("json", "csv" или "md").
+    :return: iterator of dict (элементы могут быть и не словарями — они пропускаются)
+    :raises OSError, ValueError, csv.Error: Если файл не читается или не разбирается.
+    """
+    if fmt == "json":
+        with open(path, "rb") as file:
+            wrapped = file.read(64).lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"{")
+        if not wrapped:
+            yield from DataSerializer.iter_items_from_file(path)
+            return
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        yield from data.get("notes", [])
+        return
+    with open(path, encoding="utf-8", newline="" if fmt == "csv" else None) as file:
+        if fmt == "csv":
+            yield from csv.DictReader(file)
+        else:
+            yield _markdown_item(path, file.read())
+
+
+def parse_items(job):
+    """
+    Разбирает элементы одного входного файла по мере чтения.
+
+    :param job: (путь, формат).
+    :return: iterator of dict или None для элемента, который не годится
+    :raises OSError, ValueError, csv.Error: Если файл не читается или не разбирается.
+    """
+    path, fmt = job
+    for item in read_items(path, fmt):
+        yield _check_item(item) if isinstance(item, dict) else None
+
+
+def parse_file(job):
+    """
+    Разбирает один входной файл целиком (в отдельном процессе).
+
+    :param job: (путь, формат).
+    :return: (путь, список словарей заметок и None для негодных элементов,
+              текст ошибки чтения или None) — элементы до ошибки сохраняются
+    """
+    items = []
+    try:
+        items.extend(parse_items(job))
+    except FILE_ERRORS as error:
+        return job[0], items, str(error)
+    return job[0], items, None
+
+
+def _markdown_item(path: str, text: str):
+    """
+    Заметка из файла Markdown: заголовок — первая строка "# ...", иначе имя файла;
+    категория — строка "Категория: ..." сразу после заголовка, иначе имя каталога,
+    если это известная категория.
+    """
+    lines = text.splitlines()
+    title = os.path.splitext(os.path.basename(path))[0]
+    if lines and lines[0].startswith("# "):
+        title, lines = lines[0][2:].strip(), lines[1:]
+    category = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    category = category if category in CATEGORIES else None
+    if lines and lines[0].lower().startswith("категория:"):
+        category, lines = lines[0].split(":", 1)[1].strip(), lines[1:]
+    return {"title": title, "content": "\n".join(lines).strip("\n"), "category": category}
+
+
+def iter_parsed(jobs, workers: int = 1):
+    """
+    Разбирает входные файлы по порядку, при workers > 1 — в нескольких процессах
+    (тогда каждый файл разбирается целиком в своём процессе, иначе — потоком).
+    Ошибка чтения одного файла не прерывает разбор остальных.
+
+    :return: iterator of (путь, словарь заметки или None, если элемент не годится,
+             текст ошибки чтения файла или None)
+    """
+    if workers <= 1:
+        for job in jobs:
+            try:
+                for item in parse_items(job):
+                    yield job[0], item, None
+            except FILE_ERRORS as error:
+                yield job[0], None, str(error)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, items, error in executor.map(parse_file, jobs, chunksize=16):
+            for item in items:
+                yield path, item, None
+            if error is not None:
+                yield path, None, error
+
+
+def note_from_item(item: dict, category: str = None):
+    """
+    Создаёт заметку из словаря импорта. Отсутствующие даты заменяются текущим временем.
+
+    :param item: Словарь заметки.
+    :param category: Категория, заменяющая категорию из файла (необязательно).
+    :return: Note
+    """
+    now = datetime.datetime.now().isoformat()
+    return Note.from_dict({
+        "id": item.get("id"),
+        "title": item["title"],
+        "content": item["content"],
+        "category": category or item["category"],
+        "created_at": item.get("created_at") or now,
+        "modified_at": item.get("modified_at") or item.get("created_at") or now,
+    })
+
+
+def batched(iterable, size: int):
+    """
+    Делит поток на списки не длиннее size.
+
+    :return: iterator of list
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def journal_records(events):
+    """
+    Возвращает записи журнала для событий хранилища (как StorageWorker).
+
+    :param events: Список NoteEvent.
+    :return: list of dict
+    """
+    records = []
+    for event in events:
+        if event.kind == NoteEvent.ADDED:
+            records.append(NoteJournal.add_record(event.note))
+        elif event.kind == NoteEvent.CHANGED:
+            records.append(NoteJournal.update_record(event.note))
+        elif event.kind == NoteEvent.REMOVED:
+            records.append(NoteJournal.delete_record(event.note_id))
+    return records
+
+
+def compact(filename: str):
+    """
+    Сворачивает журнал в новый снимок, если в нём накопилось много записей.
+    Чтение и запись идут под одной блокировкой файла, поэтому записи,
+    дописанные другим процессом (например, открытым окном), не теряются.
+
+    :return: bool — был ли записан снимок
+    """
+    with DataSerializer.lock(filename):
+        if not DataSerializer.needs_compaction(filename):
+            return False
+        DataSerializer.save(DataSerializer.load_store(filename), filename)
+    return True
+
+
+def query_from_args(args):
+    """
+    Составляет запрос из ключей --text, --category, --from и --to.
+
+    :return: NoteQuery или None, если ни один ключ не задан.
+    """
+    dates = []
+    for value in (args.created_from, args.created_to):
+        dates.append(None if value is None else datetime.datetime.fromisoformat(value))
+    if not args.text and not args.category and dates == [None, None]:
+        return None
+    if args.created_to is not None and len(args.created_to) == 10:
+        dates[1] += datetime.timedelta(days=1, microseconds=-1)  # Дата без времени включает весь день
+    return NoteQuery(text=args.text or "", categories=args.category or None,
+                     created_from=dates[0], created_to=dates[1], sort="created_at")
+
+
+def select(filename: str, query: NoteQuery):
+    """
+    Загружает заметки и выполняет запрос по индексам.
+
+    :return: (хранилище, идентификаторы подходящих заметок)
+    """
+    store = DataSerializer.load_store(filename)
+    notes = list(store)
+    search_index = SearchIndex.for_notes(notes, filename) if query.has_text else SearchIndex()
+    planner = QueryPlanner(NoteTable(notes), CategoryIndex(notes), search_index)
+    return store, planner.execute(query).ids
+
+
+def command_import(args):
+    """
+    Импортирует заметки: файлы разбираются потоком, заметки дописываются в журнал порциями.
+    """
+    jobs = list(input_files(args.paths, args.format))
+    imported, bad, failed = 0, Counter(), []
+
+    def stream():
+        for path, item, error in iter_parsed(jobs, args.workers):
+            if error is not None:
+                failed.append(path)
+                print(f"{path}: файл не прочитан: {error}", file=sys.stderr)
+            elif item is None:
+                bad[path] += 1
+            else:
+                yield item
+
+    for batch in batched(stream(), args.batch_size):
+        # Каждая порция дописывается в журнал одной операцией: прерванный импорт сохраняет готовые порции
+        DataSerializer.record_many([NoteJournal.add_record(note_from_item(item, args.category)) for item in batch],
+                                   args.file)
+        imported += len(batch)
+    for path, count in bad.items():
+        print(f"{path}: пропущено элементов без заголовка или с неверной датой: {count}", file=sys.stderr)
+    skipped = sum(bad.values())
+    compacted = not args.no_compact and compact(args.file)
+    print(f"Импортировано заметок: {imported} из файлов: {len(jobs)}"
+          f"{f', пропущено: {skipped}' if skipped else ''}"
+          f"{f', не прочитано файлов: {len(failed)}' if failed else ''}"
+          f"{'; журнал свёрнут в снимок' if compacted else ''}.")
+    return 1 if failed else 0
+
+
+def command_edit(args):
+    """
+    Изменяет или удаляет заметки, подходящие под запрос; изменения пишутся в журнал порциями.
+    """
+    query = query_from_args(args)
+    if query is None:
+        print("Укажите запрос: --text, --category, --from или --to.", file=sys.stderr)
+        return 2
+    if not args.delete and not args.set_category:
+        print("Укажите изменение: --set-category или --delete.", file=sys.stderr)
+        return 2
+    store, note_ids = select(args.file, query)
+    if args.dry_run:
+        print(f"Подходит заметок: {len(note_ids)} (без изменений).")
+        return 0
+    records = []
+    store.subscribe(lambda events: records.extend(journal_records(events)))
+    for batch in batched(note_ids, args.batch_size):
+        with store.batch():
+            for note_id in batch:
+                if args.delete:
+                    store.remove(note_id)
+                else:
+                    store.get(note_id).category = args.set_category
+        DataSerializer.record_many(records, args.file)
+        records.clear()
+    compact(args.file)
+    print(f"{'Удалено' if args.delete else 'Изменено'} заметок: {len(note_ids)}.")
+    return 0
+
+
+def command_export(args):
+    """
+    Выгружает заметки в JSON, CSV или каталог Markdown.
+    """
+    query = query_from_args(args)
+    if query is None:
+        notes = DataSerializer.iter_load(args.file)  # Без запроса заметки выгружаются потоком
+    else:
+        store, note_ids = select(args.file, query)
+        notes = (store.get(note_id) for note_id in note_ids)
+    fmt = args.format or FORMATS.get(os.path.splitext(args.output)[1].lower(), "md")
+    if fmt == "md":
+        count = _export_markdown(notes, args.output)
+    else:
+        with AtomicFile(args.output, DataSerializer.DURABILITY) as temp:
+            with open(temp, "w", encoding="utf-8", newline="" if fmt == "csv" else None) as file:
+                count = (_write_csv if fmt == "csv" else _write_json)(notes, file)
+    print(f"Выгружено заметок: {count}.")
+    return 0
+
+
+def _write_json(notes, file: io.TextIOBase):
+    """
+    Пишет заметки JSON-массивом по одной, не собирая их в список.
+    """
+    count = 0
+    file.write("[")
+    for note in notes:
+        file.write(",\n" if count else "\n")
+        file.write(json.dumps(note.to_dict(), ensure_ascii=False))
+        count += 1
+    file.write("\n]\n")
+    return count
+
+
+def _write_csv(notes, file: io.TextIOBase):
+    """
+    Пишет заметки в CSV по одной.
+    """
+    writer = csv.DictWriter(file, CSV_FIELDS)
+    writer.writeheader()
+    count = 0
+    for note in notes:
+        writer.writerow(note.to_dict())
+        count += 1
+    return count
+
+
+def _export_markdown(notes, directory: str):
+    """
+    Пишет каждую заметку в отдельный файл Markdown (формат, который понимает импорт).
+    """
+    os.makedirs(directory, exist_ok=True)
+    count, used = 0, set()
+    for note in notes:
+        name = _markdown_name(note.id, used)
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as file:
+            file.write(f"# {note.title}\nКатегория: {note.category}\n\n{note.content}\n")
+        count += 1
+    return count
+
+
+def _markdown_name(note_id: str, used: set):
+    """
+    Имя файла заметки внутри каталога выгрузки: идентификатор без разделителей пути и
+    прочих недопустимых символов. Если от него ничего не осталось или имя уже занято
+    (например, другой заметкой после замены символов), берётся случайный uuid.
+
+    :param note_id: Идентификатор заметки.
+    :param used: Уже выданные имена (в нижнем регистре); пополняется.
+    :return: str
+    """
+    name = UNSAFE_NAME.sub("_", str(note_id)).strip("._")[:100]
+    while not name or name.lower() in used:
+        name = uuid.uuid4().hex
+    used.add(name.lower())
+    return f"{name}.md"
+
+
+def command_stats(args):
+    """
+    Печатает сводку, читая заметки потоком.
+    """
+    count, size = 0, 0
+    categories = Counter()
+    first = last = None
+    journal = DataSerializer.journal(args.file)
+    with contextlib.redirect_stdout(sys.stderr):  # Сообщения загрузки не смешиваются со сводкой
+        for note in DataSerializer.iter_load(args.file):
+            count += 1
+            categories[note.category] += 1
+            size += len(note.content)
+            created = note.created_at_iso
+            first = created if first is None or created < first else first
+            last = created if last is None or created > last else last
+    stats = {
+        "notes": count,
+        "categories": dict(categories.most_common()),
+        "content_chars": size,
+        "created_from": first,
+        "created_to": last,
+        "journal_records": len(journal),
+        "file_bytes": os.path.getsize(args.file) if os.path.exists(args.file) else 0,
+        "journal_bytes": os.path.getsize(journal.path) if os.path.exists(journal.path) else 0,
+    }
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=4))
+        return 0
+    print(f"Заметок: {count}, символов текста: {size}")
+    print(f"Снимок: {stats['file_bytes']} байт, журнал: {stats['journal_records']} записей, "
+          f"{stats['journal_bytes']} байт")
+    if count:
+        print(f"Созданы: с {first} по {last}")
+    for name, number in categories.most_common():
+        print(f"  {name}: {number}")
+    return 0
+
+
+def build_parser():
+    """
+    Возвращает разборщик ключей командной строки.
+
+    :return: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--file", default=DATA_FILE, help="файл с заметками")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_query(command):
+        command.add_argument("--text", help="слова для поиска по заголовку и тексту")
+        command.add_argument("--category", action="append", help="категория (можно указать несколько)")
+        command.add_argument("--from", dest="created_from", help="создана не раньше (ISO, например 2024-01-01)")
+        command.add_argument("--to", dest="created_to", help="создана не позже (ISO)")
+
+    importer = commands.add_parser("import", help="импорт заметок из файлов и каталогов")
+    importer.add_argument("paths", nargs="+", help="файлы и каталоги JSON, CSV и Markdown")
+    importer.add_argument("--format", choices=sorted(set(FORMATS.values())), help="формат всех файлов")
+    importer.add_argument("--category", help="категория всех импортируемых заметок")
+    importer.add_argument("--workers", type=int, default=1, help="количество процессов для разбора файлов")
+    importer.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="заметок в одной записи журнала")
+    importer.add_argument("--no-compact", action="store_true", help="не сворачивать журнал после импорта")
+    importer.set_defaults(handler=command_import)
+
+    editor = commands.add_parser("edit", help="массовое изменение заметок по запросу")
+    add_query(editor)
+    editor.add_argument("--set-category", help="новая категория")
+    editor.add_argument("--delete", action="store_true", help="удалить заметки")
+    editor.add_argument("--dry-run", action="store_true", help="только посчитать подходящие заметки")
+    editor.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="заметок в одной записи журнала")
+    editor.set_defaults(handler=command_edit)
+
+    exporter = commands.add_parser("export", help="выгрузка заметок")
+    exporter.add_argument("output", help="файл (JSON, CSV) или каталог (Markdown)")
+    exporter.add_argument("--format", choices=sorted(set(FORMATS.values())), help="формат выгрузки")
+    add_query(exporter)
+    exporter.set_defaults(handler=command_export)
+
+    stats = commands.add_parser("stats", help="сводка по файлу заметок")
+    stats.add_argument("--json", action="store_true", help="вывести сводку в JSON")
+    stats.set_defaults(handler=command_stats)
+    return parser
+
+
+def main(argv=None):
+    """
+    Выполняет команду.
+
+    :param argv: Ключи командной строки (по умолчанию sys.argv[1:]).
+    :return: int — код завершения
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
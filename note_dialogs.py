@@ -0,0 +1,144 @@
+from PyQt5.QtWidgets import (
+    QVBoxLayout, QLineEdit, QTextEdit, QLabel, QComboBox, QDialog, QDialogButtonBox, QMessageBox
+)
+from PyQt5.QtGui import QPalette, QColor
+
+# Окна, которые открываются только по действию пользователя: модуль импортируется
+# при первом открытии окна, а не при запуске приложения
+
+class AboutDialog(QDialog):
+    """
+    Класс для отображения окна "О программе".
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("О программе")
+        self.setFixedSize(400, 200)
+
+        layout = QVBoxLayout()
+
+        # Название программы
+        app_name_label = QLabel("NoteApp", self)
+        app_name_label.setStyleSheet("font-size: 16pt; font-weight: bold;")
+        layout.addWidget(app_name_label)
+
+        # Имя автора
+        author_label = QLabel("Автор: Бармотин С.А.", self)
+        author_label.setStyleSheet("font-size: 12pt;")
+        layout.addWidget(author_label)
+
+        # Почта
+        email_label = QLabel('<a href="mailto:Barmotins@gmail.com">Почта: Barmotins@gmail.com</a>', self)
+        email_label.setOpenExternalLinks(True)
+        email_label.setStyleSheet("font-size: 12pt; color: blue;")
+        layout.addWidget(email_label)
+
+        # GitHub
+        github_label = QLabel('<a href="https://github.com/Fufurum/NoteApp">GitHub: https://github.com/Fufurum/NoteApp</a>', self)
+        github_label.setOpenExternalLinks(True)
+        github_label.setStyleSheet("font-size: 12pt; color: blue;")
+        layout.addWidget(github_label)
+
+        # Кнопка закрытия
+        close_button = QDialogButtonBox(QDialogButtonBox.Ok)
+        close_button.accepted.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.setLayout(layout)
+
+
+class NoteEditorDialog(QDialog):
+    """
+    Класс для окна редактирования и создания заметок.
+    """
+    def __init__(self, note=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Редактор заметок" if note else "Создать заметку")
+        self.note = note
+
+        layout = QVBoxLayout()
+
+        # Поле для ввода заголовка
+        self.title_edit = QLineEdit(self)
+        self.title_edit.setPlaceholderText("Введите заголовок")
+        layout.addWidget(QLabel("Заголовок:"))
+        layout.addWidget(self.title_edit)
+
+        # Поле для ввода содержимого
+        self.content_edit = QTextEdit(self)
+        self.content_edit.setPlaceholderText("Введите содержимое (минимум 5 символов)")
+        layout.addWidget(QLabel("Содержимое:"))
+        layout.addWidget(self.content_edit)
+
+        # Выпадающий список для выбора категории
+        self.category_combo = QComboBox(self)
+        self.category_combo.addItems(["Все", "Работа", "Дом", "Здоровье и Спорт", "Люди", "Документы", "Финансы", "Разное"])
+        layout.addWidget(QLabel("Категория:"))
+        layout.addWidget(self.category_combo)
+
+        # Отображение даты создания заметки
+        self.date_label = QLabel(self)
+        layout.addWidget(QLabel("Дата создания:"))
+        layout.addWidget(self.date_label)
+
+        # Кнопки сохранения и отмены
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.setLayout(layout)
+
+        # Если передана заметка, заполняем поля
+        if self.note:
+            self.title_edit.setText(note.title)
+            self.content_edit.setText(note.content)
+            self.category_combo.setCurrentText(note.category)
+            self.date_label.setText(note.created_at.strftime("%Y-%m-%d %H:%M:%S"))
+        else:
+            self.date_label.setText("Создаётся сейчас")
+
+    def validate_input(self):
+        """
+        Проверка полей ввода (заголовок и содержимое) на корректность.
+        """
+        valid = True
+        palette = self.title_edit.palette()
+
+        # Проверка заголовка
+        if not self.title_edit.text().strip():
+            valid = False
+            palette.setColor(QPalette.Base, QColor("red"))
+        else:
+            palette.setColor(QPalette.Base, QColor("green"))
+        self.title_edit.setPalette(palette)
+
+        # Проверка содержимого
+        content_palette = self.content_edit.palette()
+        if len(self.content_edit.toPlainText().strip()) < 5:
+            valid = False
+            content_palette.setColor(QPalette.Base, QColor("red"))
+        else:
+            content_palette.setColor(QPalette.Base, QColor("green"))
+        self.content_edit.setPalette(content_palette)
+
+        return valid
+
+    def accept(self):
+        """
+        Сохраняет изменения, если поля валидны.
+        """
+        if not self.validate_input():
+            QMessageBox.critical(self, "Ошибка", "Пожалуйста, заполните все обязательные поля.")
+            return
+        super().accept()
+
+    def get_note_data(self):
+        """
+        Возвращает данные заметки в виде словаря.
+        """
+        return {
+            "title": self.title_edit.text(),
+            "content": self.content_edit.toPlainText(),
+            "category": self.category_combo.currentText(),
+        }
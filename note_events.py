@@ -0,0 +1,106 @@
+NOTE_FIELDS = ("title", "content", "category")  # Поля заметки, об изменении которых сообщается
+
+
+class NoteEvent:
+    """
+    Событие изменения набора заметок.
+
+    Подписчики хранилища получают список событий: при обычном изменении —
+    из одного события, после пакета изменений — один объединённый список,
+    где на каждую заметку приходится не больше одного события.
+    """
+    ADDED = "added"  # Заметка добавлена
+    REMOVED = "removed"  # Заметка удалена
+    CHANGED = "changed"  # Изменены поля заметки
+    LOADED = "loaded"  # Заметка прочитана из файла (уже сохранена, в журнал не пишется)
+
+    __slots__ = ("kind", "note", "changes", "remote")
+
+    def __init__(self, kind: str, note, changes: dict = None, remote: bool = False):
+        """
+        Инициализация события.
+
+        :param kind: Вид события (ADDED, REMOVED, CHANGED или LOADED).
+        :param note: Заметка (для REMOVED — удалённый объект).
+        :param changes: Для CHANGED — словарь "поле -> (старое значение, новое значение)".
+        :param remote: Изменение пришло из файла, который изменил другой процесс
+                       (уже сохранено, в журнал не пишется).
+        """
+        self.kind = kind
+        self.note = note
+        self.changes = changes or {}
+        self.remote = remote
+
+    @property
+    def note_id(self):
+        """
+        Возвращает идентификатор заметки события.
+
+        :return: str
+        """
+        return self.note.id
+
+    def __repr__(self):
+        return f"NoteEvent({self.kind!r}, {self.note.id!r}, {self.changes!r})"
+
+
+def diff(old, new):
+    """
+    Возвращает изменения полей между двумя версиями заметки.
+
+    :param old: Прежняя версия заметки.
+    :param new: Новая версия заметки.
+    :return: dict "поле -> (старое значение, новое значение)"
+    """
+    changes = {}
+    for field in NOTE_FIELDS:
+        before, after = getattr(old, field), getattr(new, field)
+        if before != after:
+            changes[field] = (before, after)
+    return changes
+
+
+def coalesce(events):
+    """
+    Объединяет события пакета так, чтобы на каждую заметку приходилось одно событие.
+    Добавление и последующие изменения дают добавление, добавление и удаление
+    взаимно уничтожаются, несколько изменений сливаются в одно (старое значение
+    берётся из первого, новое — из последнего), удаление и повторное добавление
+    дают изменение. События загрузки передаются как есть.
+
+    :param events: Список событий в порядке возникновения.
+    :return: list of NoteEvent
+    """
+    result = []
+    positions = {}  # Идентификатор заметки -> позиция её события в result
+    for event in events:
+        if event.kind == NoteEvent.LOADED:
+            positions.pop(event.note_id, None)
+            result.append(event)
+            continue
+        position = positions.get(event.note_id)
+        previous = None if position is None else result[position]
+        if previous is None:
+            positions[event.note_id] = len(result)
+            result.append(event)
+        elif previous.kind == NoteEvent.ADDED:
+            if event.kind == NoteEvent.REMOVED:
+                result[position] = None
+                del positions[event.note_id]
+            else:
+                result[position] = NoteEvent(NoteEvent.ADDED, event.note, remote=event.remote)
+        elif previous.kind == NoteEvent.CHANGED:
+            if event.kind == NoteEvent.CHANGED:
+                changes = dict(previous.changes)
+                for field, (old, new) in event.changes.items():
+                    changes[field] = (changes[field][0] if field in changes else old, new)
+                result[position] = NoteEvent(NoteEvent.CHANGED, event.note, changes, event.remote)
+            else:
+                result[position] = event
+        elif previous.kind == NoteEvent.REMOVED:
+            if event.kind == NoteEvent.ADDED:
+                result[position] = NoteEvent(NoteEvent.CHANGED, event.note, diff(previous.note, event.note),
+                                             event.remote)
+            else:
+                result[position] = event
+    return [event for event in result if event is not None]
@@ -0,0 +1,277 @@
+import json
+import os
+import time
+import uuid
+from atomic_file import DURABILITY_ALWAYS, DURABILITY_BATCHED, DURABILITY_NONE, fsync_directory
+from note import Note
+from note_store import NoteStore
+from profiler import profiler
+
+
+class NoteJournal:
+    """
+    Журнал изменений заметок.
+
+    Каждое изменение (добавление, редактирование, удаление, сортировка)
+    дописывается в конец файла одной JSON-строкой. Полный список заметок
+    восстанавливается как снимок (snapshot) плюс последовательное
+    применение записей журнала.
+    """
+    SUFFIX = ".journal"
+    SYNC_INTERVAL = 1.0  # Наибольшая пауза между fsync журнала в пакетном режиме (секунды)
+    ORIGIN = uuid.uuid4().hex  # Метка процесса в записях: свои записи не применяются повторно (StoreSync)
+
+    def __init__(self, filename: str, durability: str = DURABILITY_ALWAYS):
+        """
+        Инициализация журнала.
+
+        :param filename: Имя файла снимка, рядом с которым хранится журнал.
+        :param durability: Режим надёжности записи (см. atomic_file).
+        """
+        self.path = filename + self.SUFFIX  # Путь к файлу журнала
+        self.durability = durability
+        self._count = None  # Количество записей (вычисляется лениво)
+        self._tail_checked = False  # Проверено ли, что файл заканчивается переводом строки
+        self._unsynced = False  # Есть ли записи, ещё не сброшенные на диск
+        self._last_sync = time.monotonic()  # Время последнего fsync журнала
+
+    @staticmethod
+    def add_record(note):
+        """
+        Возвращает запись о добавлении заметки.
+
+        :param note: Объект типа Note.
+        :return: dict
+        """
+        return {"op": "add", "note": note.to_dict(), "origin": NoteJournal.ORIGIN}
+
+    @staticmethod
+    def update_record(note):
+        """
+        Возвращает запись об изменении заметки.
+
+        :param note: Объект типа Note.
+        :return: dict
+        """
+        return {"op": "update", "note": note.to_dict(), "origin": NoteJournal.ORIGIN}
+
+    @staticmethod
+    def delete_record(note_id: str):
+        """
+        Возвращает запись об удалении заметки.
+
+        :param note_id: Идентификатор заметки.
+        :return: dict
+        """
+        return {"op": "delete", "id": note_id, "origin": NoteJournal.ORIGIN}
+
+    def append(self, record: dict):
+        """
+        Дописывает одну запись в конец журнала.
+
+        :param record: Словарь с описанием изменения.
+        """
+        self.append_many([record])
+
+    def append_many(self, records: list):
+        """
+        Дописывает несколько записей в конец журнала одной операцией записи.
+
+        :param records: Список словарей с описанием изменений.
+        """
+        if not records:
+            return
+        line = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                       for record in records).encode('utf-8')
+        with open(self.path, 'ab+') as file:
+            created = file.seek(0, os.SEEK_END) == 0
+            if not self._tail_checked:
+                # После сбоя последняя строка может быть оборвана: начинаем запись с новой строки
+                if not created:
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b"\n":
+                        line = b"\n" + line
+                self._tail_checked = True
+            file.write(line)
+            profiler.count("bytes_written", len(line))
+            self._unsynced = True
+            if self.durability == DURABILITY_ALWAYS or (
+                    self.durability == DURABILITY_BATCHED
+                    and time.monotonic() - self._last_sync >= self.SYNC_INTERVAL):
+                self._sync_file(file)
+        if created and self.durability == DURABILITY_ALWAYS:
+            fsync_directory(self.path)
+        if self._count is not None:
+            self._count += len(records)
+
+    def _sync_file(self, file):
+        file.flush()
+        os.fsync(file.fileno())
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """
+        Сбрасывает на диск записи, накопленные в пакетном режиме.
+        В режиме без fsync ничего не делает.
+        """
+        if not self._unsynced or self.durability == DURABILITY_NONE:
+            return
+        try:
+            with open(self.path, 'rb+') as file:
+                self._sync_file(file)
+        except FileNotFoundError:
+            self._unsynced = False
+        fsync_directory(self.path)
+
+    def records(self):
+        """
+        Перебирает записи журнала по порядку.
+        Повреждённые строки (например, оборванные при сбое) пропускаются.
+
+        :return: iterator of dict
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    def records_from(self, offset: int):
+        """
+        Читает записи, дописанные после указанной позиции файла журнала.
+        Учитываются только завершённые строки: недописанная строка будет
+        прочитана при следующем вызове.
+
+        :param offset: Позиция в байтах, с которой начинается чтение.
+        :return: tuple (list of dict, int) — записи и позиция после последней прочитанной строки.
+        """
+        try:
+            with open(self.path, 'rb') as file:
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            return [], 0
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+        return records, offset + end
+
+    def size(self):
+        """
+        Возвращает размер файла журнала в байтах (0, если журнала нет).
+
+        :return: int
+        """
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def refresh(self):
+        """
+        Забывает сведения о файле журнала, запомненные этим процессом
+        (количество записей, завершённость последней строки). Вызывается,
+        когда журнал мог изменить другой процесс.
+        """
+        self._count = None
+        self._tail_checked = False
+
+    def replay(self, store: NoteStore):
+        """
+        Применяет записи журнала к хранилищу, загруженному из снимка.
+        Записи адресуют заметки по идентификатору; записи старого формата
+        с позицией заметки ("index") тоже поддерживаются.
+
+        :param store: Хранилище заметок (изменяется на месте).
+        :return: NoteStore
+        """
+        count = 0
+        for record in self.records():
+            count += 1
+            op = record.get("op")
+            if op == "add":
+                store.update(Note.from_dict(record["note"]))
+            elif op == "update":
+                if "index" in record:
+                    store.remove(store.ids()[record["index"]])
+                    store.add(Note.from_dict(record["note"]))
+                else:
+                    store.update(Note.from_dict(record["note"]))
+            elif op == "delete":
+                note_id = record["id"] if "id" in record else store.ids()[record["index"]]
+                if note_id in store:
+                    store.remove(note_id)
+            elif op == "sort":
+                if record["key"] == "title":
+                    store.sort(key=lambda note: note.title)
+                elif record["key"] == "created_at":
+                    store.sort(key=lambda note: note.created_at)
+        self._count = count
+        return store
+
+    def apply_stream(self, notes):
+        """
+        Применяет журнал к потоку заметок из снимка, не загружая их все в память.
+        Изменённые заметки подменяются на месте, удалённые пропускаются,
+        добавленные выдаются в конце. Если в журнале есть сортировка или записи
+        старого формата с позициями, поток сначала собирается в хранилище.
+
+        :param notes: Итерируемый поток заметок снимка.
+        :return: iterator of Note
+        """
+        records = list(self.records())
+        self._count = len(records)
+        if any(record.get("op") == "sort" or "index" in record for record in records):
+            yield from self.replay(NoteStore(notes))
+            return
+        final = {}  # Идентификатор -> итоговый словарь заметки или None, если она удалена
+        for record in records:
+            if record.get("op") in ("add", "update"):
+                final[record["note"]["id"]] = record["note"]
+            elif record.get("op") == "delete":
+                final[record["id"]] = None
+        for note in notes:
+            if note.id in final:
+                data = final.pop(note.id)
+                if data is not None:
+                    yield Note.from_dict(data)
+            else:
+                yield note
+        for data in final.values():
+            if data is not None:
+                yield Note.from_dict(data)
+
+    def clear(self):
+        """
+        Очищает журнал (после записи нового снимка).
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._count = 0
+        self._tail_checked = True
+        self._unsynced = False
+
+    def __len__(self):
+        """
+        Возвращает количество записей в журнале.
+
+        :return: int
+        """
+        if self._count is None:
+            self._count = sum(1 for _ in self.records())
+        return self._count
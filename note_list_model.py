@@ -0,0 +1,405 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from note_events import NoteEvent
+from profiler import profiler
+from render_cache import RenderCache
+
+NoteIdRole = Qt.UserRole  # Роль, по которой модель отдаёт идентификатор заметки
+
+
+class NoteFilter:
+    """
+    Слой фильтрации и сортировки для списка заметок (аналог QSortFilterProxyModel).
+
+    Определяет, какие заметки видны (категория, результаты поиска) и в каком порядке.
+    Сортировка выполняется целиком через sorted() с функцией ключа, а не через
+    попарные сравнения, поэтому остаётся быстрой на больших хранилищах.
+
+    Фильтр может быть задан запросом (NoteQuery, см. set_query): тогда видимые
+    заметки вычисляет планировщик запросов, а фильтр проверяет по тому же
+    запросу отдельные изменённые заметки.
+    """
+    ALL_CATEGORIES = "Все"
+
+    def __init__(self):
+        """
+        Инициализация фильтра: показываются все заметки в порядке хранилища.
+        """
+        self.category = self.ALL_CATEGORIES  # Выбранная категория
+        self.search_ids = None  # Идентификаторы найденных заметок в порядке релевантности (None — без поиска)
+        self.sort_key = None  # None, "title", "created_at", "modified_at" или "rank"
+        self.descending = False  # Сортировка по убыванию
+        self.query = None  # Запрос, задающий видимые заметки (NoteQuery или None)
+        self._rank = {}  # Идентификатор заметки -> позиция в результатах поиска
+
+    def set_query(self, query, note_ids=None):
+        """
+        Задаёт видимые заметки запросом.
+
+        :param query: Запрос (NoteQuery).
+        :param note_ids: Результаты запроса с поиском по тексту в порядке релевантности
+                         (для проверки отдельных заметок; необязательно).
+        """
+        self.query = query
+        self.category = self.ALL_CATEGORIES if query.categories is None or len(query.categories) != 1 \
+            else next(iter(query.categories))
+        self.search_ids = note_ids if query.has_text else None
+        self._rank = {note_id: position for position, note_id in enumerate(self.search_ids or [])}
+        self.sort_key = query.sort or ("rank" if query.has_text else None)
+        self.descending = query.descending
+
+    def set_search(self, note_ids):
+        """
+        Устанавливает результаты поиска. Найденные заметки упорядочиваются по релевантности.
+
+        :param note_ids: Список идентификаторов или None, чтобы сбросить поиск.
+        """
+        self.search_ids = note_ids
+        self._rank = {note_id: position for position, note_id in enumerate(note_ids or [])}
+        if note_ids is not None:
+            self.sort_key = "rank"
+        elif self.sort_key == "rank":
+            self.sort_key = None
+
+    def accepts(self, note):
+        """
+        Проверяет, проходит ли заметка через фильтр.
+
+        :param note: Объект типа Note.
+        :return: bool
+        """
+        query = self.query
+        if query is not None:
+            if query.categories is not None and note.category not in query.categories:
+                return False
+            if query.created_from is not None and note.created_at < query.created_from:
+                return False
+            if query.created_to is not None and note.created_at > query.created_to:
+                return False
+        elif self.category != self.ALL_CATEGORIES and note.category != self.category:
+            return False
+        return self.search_ids is None or note.id in self._rank
+
+    def key(self, note):
+        """
+        Возвращает ключ сортировки заметки или None, если порядок определяется хранилищем.
+        """
+        if self.sort_key == "title":
+            return note.title
+        if self.sort_key == "created_at":
+            return note.created_at_iso  # Строки ISO упорядочены так же, как даты, и не требуют разбора
+        if self.sort_key == "modified_at":
+            return note.modified_at_iso
+        if self.sort_key == "rank":
+            return self._rank.get(note.id, len(self._rank))
+        return None
+
+    def in_order(self, first, second):
+        """
+        Проверяет, что ключ first может стоять перед ключом second с учётом направления сортировки.
+        """
+        return second <= first if self.descending else first <= second
+
+    def apply(self, store, table=None, categories=None, planner=None):
+        """
+        Возвращает идентификаторы видимых заметок в порядке отображения.
+        Если фильтр задан запросом и передан планировщик, запрос выполняет он.
+        Если передан индекс категорий, заметки одной категории без поиска берутся
+        из него уже упорядоченными (без сортировки, по дате создания, если порядок не выбран).
+        Если передана колоночная таблица заметок, фильтрация и сортировка
+        выполняются по её массивам.
+
+        :param store: Хранилище заметок.
+        :param table: Колоночная таблица тех же заметок (NoteTable, необязательно).
+        :param categories: Индекс тех же заметок по категориям (CategoryIndex, необязательно).
+        :param planner: Планировщик запросов (QueryPlanner, необязательно).
+        :return: list of str
+        """
+        if self.query is not None and planner is not None:
+            return planner.execute(self.query).ids
+        if categories is not None and self.category != self.ALL_CATEGORIES and self.search_ids is None:
+            return categories.ids(self.category, self.sort_key)
+        if table is not None:
+            return table.view(
+                category=None if self.category == self.ALL_CATEGORIES else self.category,
+                note_ids=self.search_ids,
+                sort=None if self.sort_key == "rank" else self.sort_key,
+            )
+        if self.search_ids is not None:
+            notes = [store.get(note_id) for note_id in self.search_ids if note_id in store]
+        else:
+            notes = list(store)
+        notes = [note for note in notes if self.accepts(note)]
+        if self.sort_key is not None and self.sort_key != "rank":
+            notes.sort(key=self.key)
+        return [note.id for note in notes]
+
+
+class NoteListModel(QAbstractListModel):
+    """
+    Модель списка заметок для QListView.
+
+    Хранит только идентификаторы видимых заметок; строка для отображения
+    формируется в data(), то есть только для строк, которые видны на экране,
+    и запоминается в кэше labels до изменения заметки.
+    Добавление, изменение и удаление одной заметки сообщаются представлению
+    сигналами на уровне строк, без полного сброса модели.
+
+    До окончания загрузки модель может показывать заранее сохранённый первый
+    экран (show_preview): строки берутся из заголовков кэша, пока заметки
+    загружаются в фоне, и заменяются настоящими при следующем пересчёте.
+    """
+    REFRESH_THRESHOLD = 100  # Пакет из большего числа разнородных событий пересчитывает модель целиком
+
+    def __init__(self, store, note_filter=None, parent=None, table=None, categories=None, planner=None):
+        """
+        Инициализация модели.
+
+        :param store: Хранилище заметок (NoteStore).
+        :param note_filter: Фильтр видимых заметок (по умолчанию показываются все).
+        :param parent: Родительский объект Qt.
+        :param table: Колоночная таблица заметок для быстрой фильтрации и сортировки (необязательно).
+        :param categories: Индекс заметок по категориям для быстрого выбора категории (необязательно).
+        :param planner: Планировщик запросов для фильтра, заданного запросом (необязательно).
+        """
+        super().__init__(parent)
+        self._store = store
+        self.table = table
+        self.categories = categories
+        self.planner = planner
+        self.filter = note_filter or NoteFilter()
+        self._ids = self.filter.apply(store, table, categories, planner)  # Идентификаторы видимых заметок по строкам
+        self._rows = None  # Идентификатор -> номер строки (строится лениво)
+        self._preview = None  # Заголовки первого экрана до окончания загрузки: идентификатор -> заметка
+        self.unordered = False  # Порции загрузки добавлены без сортировки; порядок восстановит refresh()
+        self.labels = RenderCache(self.display_text)  # Готовые строки списка для неизменённых заметок
+
+    @property
+    def previewing(self):
+        """
+        Проверяет, показывает ли модель первый экран из кэша.
+
+        :return: bool
+        """
+        return self._preview is not None
+
+    def show_preview(self, notes):
+        """
+        Показывает заголовки первого экрана до загрузки заметок.
+        Заметки загрузки не добавляются в список, пока не будет пересчитан весь список
+        (refresh или show_result).
+
+        :param notes: Заметки первого экрана в порядке отображения (могут быть без текста).
+        """
+        self.beginResetModel()
+        self._preview = {note.id: note for note in notes}
+        self._ids = [note.id for note in notes]
+        self._rows = None
+        self.endResetModel()
+
+    @staticmethod
+    def display_text(note):
+        """
+        Возвращает строку заметки для списка.
+
+        :param note: Объект типа Note.
+        :return: str
+        """
+        return f"{note.title} ({note.category}) - {note.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._ids):
+            return None
+        note_id = self._ids[index.row()]
+        if role == NoteIdRole:
+            return note_id
+        if role == Qt.DisplayRole:
+            if profiler.enabled:
+                profiler.count("items_rendered")
+            if self._preview is not None:
+                return self.labels.get(self._preview[note_id])
+            return self.labels.get(self._store.get(note_id))
+        return None
+
+    def note_at(self, index):
+        """
+        Возвращает заметку для индекса модели.
+
+        :param index: QModelIndex.
+        :return: Note или None.
+        """
+        if not index.isValid() or index.row() >= len(self._ids):
+            return None
+        return self._store.get(self._ids[index.row()])
+
+    def row_of(self, note_id: str):
+        """
+        Возвращает номер строки заметки или -1, если заметка не видна.
+
+        :param note_id: Идентификатор заметки.
+        :return: int
+        """
+        if self._rows is None:
+            self._rows = {note_id: row for row, note_id in enumerate(self._ids)}
+        return self._rows.get(note_id, -1)
+
+    def refresh(self):
+        """
+        Пересчитывает видимые заметки после изменения фильтра или сортировки.
+        """
+        with profiler.stage("refresh"):
+            self.beginResetModel()
+            with profiler.stage("filter"):
+                self._ids = self.filter.apply(self._store, self.table, self.categories, self.planner)
+            self._rows = None
+            self._preview = None
+            self.unordered = False
+            self.endResetModel()
+
+    def show_result(self, result):
+        """
+        Показывает готовый результат запроса (например, выполненного в фоне) без пересчёта.
+        Заметки, удалённые после того, как результат был вычислен, не показываются.
+
+        :param result: Результат запроса (QueryResult).
+        """
+        ids = [note_id for note_id in result.ids if note_id in self._store]
+        with profiler.stage("refresh", rows=len(ids)):
+            self.beginResetModel()
+            self.filter.set_query(result.query, ids)
+            self._ids = ids
+            self._rows = None
+            self._preview = None
+            self.unordered = False
+            self.endResetModel()
+
+    def _insert_position(self, note):
+        """
+        Находит строку для вставки заметки с учётом текущей сортировки (двоичный поиск).
+        """
+        key = self.filter.key(note)
+        if key is None:
+            return len(self._ids)
+        low, high = 0, len(self._ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self.filter.in_order(self.filter.key(self._store.get(self._ids[middle])), key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def note_added(self, note):
+        """
+        Сообщает модели о добавлении заметки в хранилище.
+
+        :param note: Объект типа Note.
+        """
+        if not self.filter.accepts(note):
+            return
+        if self.filter.query is not None and self.filter.query.limit is not None:
+            self.refresh()  # Страница результатов: новая заметка может вытеснить другую
+            return
+        row = self._insert_position(note)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.insert(row, note.id)
+        self._rows = None
+        self.endInsertRows()
+
+    def notes_added(self, notes, loading=False):
+        """
+        Сообщает модели о добавлении порции заметок (например, при фоновой загрузке).
+        Без сортировки видимые заметки вставляются одним блоком в конец списка.
+        При сортировке или странице результатов список пересчитывается, но порции
+        загрузки не пересчитывают его каждый раз: они тоже добавляются в конец
+        (в страницу — не добавляются), а модель отмечается как unordered,
+        и порядок восстанавливает один refresh() после окончания загрузки.
+
+        :param notes: Список объектов типа Note.
+        :param loading: Заметки прочитаны из файла при загрузке (события LOADED).
+        """
+        paged = self.filter.query is not None and self.filter.query.limit is not None
+        if self.filter.sort_key is not None or paged:
+            if not loading:
+                self.refresh()
+                return
+            self.unordered = True
+            if paged:
+                return
+        ids = [note.id for note in notes if self.filter.accepts(note)]
+        if not ids:
+            return
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(ids) - 1)
+        self._ids.extend(ids)
+        self._rows = None
+        self.endInsertRows()
+
+    def apply_events(self, events):
+        """
+        Обновляет строки по событиям хранилища заметок (подписчик NoteStore).
+        Порция добавленных заметок вставляется одним блоком, крупный пакет
+        разнородных изменений приводит к одному пересчёту модели.
+
+        :param events: Список NoteEvent.
+        """
+        self.labels.apply_events(events)
+        if self._preview is not None:
+            # Первый экран остаётся на месте до конца загрузки; правка пользователя пересчитывает список
+            if any(event.kind != NoteEvent.LOADED for event in events):
+                self.refresh()
+            return
+        if all(event.kind in (NoteEvent.ADDED, NoteEvent.LOADED) for event in events) and len(events) > 1:
+            self.notes_added([event.note for event in events],
+                             loading=all(event.kind == NoteEvent.LOADED for event in events))
+        elif len(events) > self.REFRESH_THRESHOLD:
+            self.refresh()
+        else:
+            for event in events:
+                if event.kind == NoteEvent.REMOVED:
+                    self.note_removed(event.note_id)
+                elif event.kind == NoteEvent.CHANGED:
+                    self.note_changed(event.note)
+                else:
+                    self.note_added(event.note)
+
+    def note_removed(self, note_id: str):
+        """
+        Сообщает модели об удалении заметки из хранилища.
+
+        :param note_id: Идентификатор удалённой заметки.
+        """
+        row = self.row_of(note_id)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        self._rows = None
+        self.endRemoveRows()
+
+    def note_changed(self, note):
+        """
+        Сообщает модели об изменении заметки.
+        Если заметка осталась на своём месте, обновляется только её строка.
+
+        :param note: Объект типа Note.
+        """
+        row = self.row_of(note.id)
+        if row >= 0 and self.filter.accepts(note):
+            key = self.filter.key(note)
+            before = self._ids[row - 1] if row > 0 else None
+            after = self._ids[row + 1] if row + 1 < len(self._ids) else None
+            in_order = key is None or (
+                (before is None or self.filter.in_order(self.filter.key(self._store.get(before)), key)) and
+                (after is None or self.filter.in_order(key, self.filter.key(self._store.get(after))))
+            )
+            if in_order:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DisplayRole])
+                return
+        self.note_removed(note.id)
+        self.note_added(note)
@@ -0,0 +1,307 @@
+import datetime
+import threading
+from collections import OrderedDict
+from note_events import NoteEvent
+from note_table import to_micros
+from profiler import profiler
+from search_index import is_refinement, tokenize
+
+SORT_KEYS = ("rank", "title", "created_at", "modified_at")  # Ключи сортировки результатов запроса
+
+
+class NoteQuery:
+    """
+    Запрос к заметкам: текст, набор категорий, диапазон дат создания,
+    сортировка с направлением и страница результатов (limit/offset).
+
+    Запрос неизменяем и может служить ключом кэша; replace() возвращает
+    новый запрос с изменёнными полями.
+    """
+    __slots__ = ("text", "categories", "created_from", "created_to", "sort", "descending", "limit", "offset")
+
+    def __init__(self, text: str = "", categories=None, created_from: datetime.datetime = None,
+                 created_to: datetime.datetime = None, sort: str = None, descending: bool = False,
+                 limit: int = None, offset: int = 0):
+        """
+        Инициализация запроса.
+
+        :param text: Слова для поиска по заголовку и тексту (пустая строка — без поиска).
+        :param categories: Набор категорий (None — все категории).
+        :param created_from: Начало диапазона дат создания включительно (необязательно).
+        :param created_to: Конец диапазона дат создания включительно (необязательно).
+        :param sort: "rank", "title", "created_at", "modified_at" или None
+                     (по релевантности при поиске, иначе в порядке хранилища).
+        :param descending: Сортировать по убыванию.
+        :param limit: Размер страницы (None — все результаты).
+        :param offset: Смещение страницы.
+        :raises ValueError: Если ключ сортировки неизвестен.
+        """
+        if sort is not None and sort not in SORT_KEYS:
+            raise ValueError(f"Неизвестный ключ сортировки: {sort}")
+        self.text = text
+        self.categories = None if categories is None else frozenset(categories)
+        self.created_from = created_from
+        self.created_to = created_to
+        self.sort = sort
+        self.descending = descending
+        self.limit = limit
+        self.offset = offset
+
+    @property
+    def has_text(self):
+        """
+        Проверяет, есть ли в запросе слова для поиска.
+
+        :return: bool
+        """
+        return bool(tokenize(self.text))
+
+    @property
+    def has_dates(self):
+        """
+        Проверяет, ограничен ли запрос диапазоном дат.
+
+        :return: bool
+        """
+        return self.created_from is not None or self.created_to is not None
+
+    def replace(self, **changes):
+        """
+        Возвращает копию запроса с изменёнными полями.
+
+        :return: NoteQuery
+        """
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return NoteQuery(**fields)
+
+    def _key(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, NoteQuery) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"NoteQuery({fields})"
+
+
+class QueryResult:
+    """
+    Результат запроса: идентификаторы заметок на странице и общее количество найденных.
+    """
+    __slots__ = ("query", "ids", "total", "plan")
+
+    def __init__(self, query: NoteQuery, ids: list, total: int, plan: list):
+        """
+        Инициализация результата.
+
+        :param query: Выполненный запрос.
+        :param ids: Идентификаторы заметок страницы в порядке отображения.
+        :param total: Количество заметок, подходящих под запрос (без учёта страницы).
+        :param plan: Шаги выполнения по порядку (например, ["categories", "search", "sort"]).
+        """
+        self.query = query
+        self.ids = ids
+        self.total = total
+        self.plan = plan
+
+
+class QueryPlanner:
+    """
+    Выполнение запросов к заметкам по индексам.
+
+    Первым применяется самый избирательный индекс: если в выбранных
+    категориях меньше заметок, чем слов запроса в поисковом индексе, поиск
+    идёт только среди заметок этих категорий, иначе категории проверяются
+    у найденных заметок. Диапазон дат и сортировка выполняются по колоночной
+    таблице. Полные результаты кэшируются (страницы одного запроса берутся из
+    кэша), кэш очищается при любом изменении заметок.
+
+    Планировщик получает события хранилища вместо таблицы и индексов и
+    обновляет их под своей блокировкой, поэтому запросы можно выполнять
+    в фоновом потоке.
+    """
+    CACHE_SIZE = 32  # Количество запросов, результаты которых хранятся в кэше
+
+    def __init__(self, table, categories, search_index):
+        """
+        Инициализация планировщика.
+
+        :param table: Колоночная таблица заметок (NoteTable).
+        :param categories: Индекс заметок по категориям (CategoryIndex).
+        :param search_index: Поисковый индекс (SearchIndex).
+        """
+        self.table = table
+        self.categories = categories
+        self.search_index = search_index
+        self._cache = OrderedDict()  # Запрос без страницы -> (все идентификаторы, план)
+        self._last_search = None  # (индекс, версия индекса, текст, результаты) последнего полного поиска
+        self._lock = threading.RLock()
+        self.revision = 0  # Номер версии заметок и индексов, растёт при каждом изменении
+        self.hits = 0  # Количество запросов, выполненных из кэша
+        self.misses = 0  # Количество запросов, выполненных по индексам
+
+    def set_search_index(self, search_index):
+        """
+        Заменяет поисковый индекс (например, после загрузки) и очищает кэш.
+
+        :param search_index: Поисковый индекс (SearchIndex).
+        """
+        with self._lock:
+            self.search_index = search_index
+            self.invalidate()
+
+    def invalidate(self):
+        """
+        Очищает кэш результатов. Запросы, выполняемые в это время, не попадут в кэш.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.revision += 1
+
+    def apply_events(self, events):
+        """
+        Обновляет таблицу, индекс категорий и поисковый индекс по событиям хранилища
+        (подписчик NoteStore) и очищает кэш. Заметки, прочитанные из файла, в поисковый
+        индекс не добавляются: он строится при загрузке отдельно.
+
+        :param events: Список NoteEvent.
+        """
+        with self._lock:
+            self.table.apply_events(events)
+            self.categories.apply_events(events)
+            changes = [event for event in events if event.kind != NoteEvent.LOADED]
+            if changes:
+                self.search_index.apply_events(changes)
+            self.invalidate()
+
+    def execute(self, query: NoteQuery, cancelled=None):
+        """
+        Выполняет запрос. Поиск по тексту идёт без блокировки планировщика,
+        поэтому изменения заметок не ждут его окончания; результат, вычисленный
+        во время изменений, возвращается, но не кэшируется.
+
+        :param query: Запрос (NoteQuery).
+        :param cancelled: Функция, возвращающая True, если запрос больше не нужен (необязательно).
+        :return: QueryResult или None, если выполнение отменено.
+        """
+        key = query.replace(limit=None, offset=0)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            index, revision = self.search_index, self.revision
+        if cached is not None:
+            ids, plan = cached
+        else:
+            plan = []
+            with profiler.stage("query"):
+                ids = self._run(key, plan, index, cancelled)
+            if ids is None:
+                return None
+            with self._lock:
+                if self.revision == revision:
+                    self._cache[key] = (ids, plan)
+                    if len(self._cache) > self.CACHE_SIZE:
+                        self._cache.popitem(last=False)
+        end = None if query.limit is None else query.offset + query.limit
+        return QueryResult(query, ids[query.offset:end], len(ids), plan)
+
+    def _run(self, query: NoteQuery, plan: list, index, cancelled=None):
+        """
+        Вычисляет все идентификаторы, подходящие под запрос, в порядке отображения.
+        Таблица и индекс категорий читаются под блокировкой, поиск по индексу
+        (у него своя блокировка) — без неё.
+        """
+        ids = None
+        if query.has_text:
+            category_ids = None
+            if query.categories is not None:
+                with self._lock:
+                    in_categories = sum(self.categories.count(name) for name in query.categories)
+                    if in_categories < index.estimate(query.text, cap=in_categories):
+                        category_ids = self._category_ids(query.categories)
+                        plan.append("categories")
+            ids = self._search(index, query.text, category_ids, cancelled)
+            if ids is None:
+                return None
+            plan.append("search")
+        with self._lock:
+            return self._arrange(query, ids, plan)
+
+    def _arrange(self, query: NoteQuery, ids, plan: list):
+        """
+        Применяет к результатам поиска (или ко всем заметкам) категории, даты и сортировку.
+        """
+        order = None  # Порядок, в котором уже упорядочены ids: (ключ, по убыванию) или None
+        if query.has_text:
+            if query.categories is not None and "categories" not in plan:
+                category_of = self.categories.category_of
+                ids = [note_id for note_id in ids if category_of(note_id) in query.categories]
+                plan.append("categories")
+            order = ("rank", False)
+        elif query.categories is not None:
+            if len(query.categories) == 1 and query.sort in (None, "title", "created_at"):
+                # Заметки категории уже упорядочены по дате создания и по заголовку
+                (name,) = query.categories
+                ids = self.categories.ids(name, query.sort, query.descending)
+                order = (query.sort or "created_at", query.descending)
+            else:
+                ids = self.table.view(note_ids=self._category_ids(query.categories), sort="created_at")
+                order = ("created_at", False)
+            plan.append("categories")
+        else:
+            ids = None  # Все заметки в порядке хранилища
+        if query.has_dates:
+            ids = self.table.created_between(ids, self._micros(query.created_from), self._micros(query.created_to))
+            plan.append("dates")
+        sort = query.sort or ("rank" if query.has_text else None)
+        if ids is None:
+            plan.append("all")
+            if sort is None or sort == "rank":
+                return self.table.view()
+            plan.append("sort")
+            return self.table.view(sort=sort, descending=query.descending)
+        if sort == "rank" and order is not None and order[0] == "rank":
+            if query.descending:
+                ids = ids[::-1]
+        elif sort is not None and sort != "rank" and order != (sort, query.descending):
+            ids = self.table.view(note_ids=ids, sort=sort, descending=query.descending)
+            plan.append("sort")
+        return ids
+
+    def _category_ids(self, names):
+        ids = []
+        for name in sorted(names):
+            ids.extend(self.categories.ids(name))
+        return ids
+
+    def _search(self, index, text: str, candidates=None, cancelled=None):
+        """
+        Выполняет поиск по индексу. Если запрос уточняет предыдущий, а индекс
+        с тех пор не менялся, поиск идёт только среди прежних результатов.
+        """
+        with profiler.stage("search", text=text):
+            revision = index.revision
+            if candidates is None:
+                last = self._last_search
+                if last is not None and last[:2] == (index, revision) and is_refinement(last[2], text):
+                    candidates = last[3]
+                ids = index.search(text, candidates=candidates, cancelled=cancelled)
+                if ids is not None:
+                    self._last_search = (index, revision, text, ids)
+                return ids
+            return index.search(text, candidates=candidates, cancelled=cancelled)
+
+    @staticmethod
+    def _micros(value):
+        if value is None:
+            return None
+        return to_micros(value.isoformat())
@@ -0,0 +1,202 @@
+import contextlib
+from note import Note
+from note_events import NoteEvent, coalesce, diff
+
+
+class NoteStore:
+    """
+    Центральное хранилище заметок.
+
+    Хранит заметки в словаре "идентификатор -> заметка", поэтому поиск,
+    замена и удаление заметки по идентификатору выполняются за O(1).
+    Порядок перебора совпадает с порядком добавления (или последней сортировки).
+
+    Подписчики (subscribe) получают списки событий NoteEvent о добавлении,
+    удалении и изменении заметок, в том числе об изменении полей заметки
+    через её свойства. Изменения внутри batch() приходят одним объединённым списком.
+    """
+    def __init__(self, notes=None):
+        """
+        Инициализация хранилища.
+
+        :param notes: Начальный набор заметок (необязательно).
+        """
+        self._notes = {}  # Индекс "идентификатор -> заметка"
+        self._subscribers = []  # Функции, получающие списки событий
+        self._pending = None  # События текущего пакета изменений (None — пакета нет)
+        self._depth = 0  # Глубина вложенности batch()
+        self._remote = False  # Изменения вносятся внутри remote()
+        for note in notes or []:
+            self.add(note)
+
+    def add(self, note: Note):
+        """
+        Добавляет заметку в хранилище.
+
+        :param note: Объект типа Note.
+        :raises ValueError: Если переданный объект не является экземпляром Note
+                            или заметка с таким идентификатором уже есть.
+        """
+        if not isinstance(note, Note):
+            raise ValueError("Можно добавлять только объекты типа Note.")
+        if note.id in self._notes:
+            raise ValueError(f"Заметка с идентификатором {note.id} уже существует.")
+        self._notes[note.id] = note
+        note._store = self
+        self._emit(NoteEvent.ADDED, note)
+
+    def load(self, notes):
+        """
+        Добавляет заметки, прочитанные из файла. Заметки с уже известными
+        идентификаторами пропускаются. Подписчики получают события LOADED одним списком.
+
+        :param notes: Итерируемый набор заметок.
+        :return: list of Note — добавленные заметки.
+        """
+        added = []
+        with self.batch():
+            for note in notes:
+                if note.id in self._notes:
+                    continue
+                self._notes[note.id] = note
+                note._store = self
+                added.append(note)
+                self._emit(NoteEvent.LOADED, note)
+        return added
+
+    def get(self, note_id: str):
+        """
+        Возвращает заметку по идентификатору.
+
+        :param note_id: Идентификатор заметки.
+        :return: Note или None, если заметки нет.
+        """
+        return self._notes.get(note_id)
+
+    def update(self, note: Note):
+        """
+        Заменяет заметку с тем же идентификатором (или добавляет новую),
+        сохраняя её позицию в порядке перебора.
+
+        :param note: Объект типа Note.
+        """
+        old = self._notes.get(note.id)
+        self._notes[note.id] = note
+        note._store = self
+        if old is None:
+            self._emit(NoteEvent.ADDED, note)
+        elif old is not note:
+            if old._store is self:
+                old._store = None
+            self._emit(NoteEvent.CHANGED, note, diff(old, note))
+
+    def remove(self, note_id: str):
+        """
+        Удаляет заметку по идентификатору.
+
+        :param note_id: Идентификатор заметки.
+        :return: Удалённая заметка.
+        :raises KeyError: Если заметки с таким идентификатором нет.
+        """
+        note = self._notes.pop(note_id)
+        if note._store is self:
+            note._store = None
+        self._emit(NoteEvent.REMOVED, note)
+        return note
+
+    def note_changed(self, note: Note, field: str, old, new):
+        """
+        Принимает от заметки сообщение об изменении поля (вызывается из свойств Note).
+
+        :param note: Изменённая заметка.
+        :param field: Название поля.
+        :param old: Прежнее значение.
+        :param new: Новое значение.
+        """
+        if self._notes.get(note.id) is note:
+            self._emit(NoteEvent.CHANGED, note, {field: (old, new)})
+
+    def subscribe(self, callback):
+        """
+        Подписывает на изменения хранилища.
+
+        :param callback: Функция callback(events), получающая список NoteEvent.
+                         Подписчики вызываются в порядке подписки.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Отменяет подписку на изменения хранилища.
+
+        :param callback: Ранее подписанная функция.
+        """
+        self._subscribers.remove(callback)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Пакет изменений: события внутри блока with копятся и после его завершения
+        приходят подписчикам одним объединённым списком (см. note_events.coalesce).
+        Пакеты могут быть вложенными, события отправляются по завершении внешнего.
+        """
+        if self._depth == 0:
+            self._pending = []
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                events, self._pending = coalesce(self._pending), None
+                if events:
+                    self._notify(events)
+
+    @contextlib.contextmanager
+    def remote(self):
+        """
+        Изменения, прочитанные из файла, который изменил другой процесс:
+        события внутри блока with помечаются флагом remote и не попадают в журнал.
+        """
+        previous, self._remote = self._remote, True
+        try:
+            yield self
+        finally:
+            self._remote = previous
+
+    def _emit(self, kind: str, note: Note, changes: dict = None):
+        if self._pending is not None:
+            self._pending.append(NoteEvent(kind, note, changes, self._remote))
+        elif self._subscribers:
+            self._notify([NoteEvent(kind, note, changes, self._remote)])
+
+    def _notify(self, events: list):
+        for callback in list(self._subscribers):
+            callback(events)
+
+    def sort(self, key, reverse: bool = False):
+        """
+        Упорядочивает заметки хранилища.
+
+        :param key: Функция, возвращающая ключ сортировки для заметки.
+        :param reverse: Сортировать по убыванию.
+        """
+        ordered = sorted(self._notes.values(), key=key, reverse=reverse)
+        self._notes = {note.id: note for note in ordered}
+
+    def ids(self):
+        """
+        Возвращает идентификаторы заметок в порядке перебора.
+
+        :return: list of str
+        """
+        return list(self._notes)
+
+    def __contains__(self, note_id):
+        return note_id in self._notes
+
+    def __len__(self):
+        return len(self._notes)
+
+    def __iter__(self):
+        return iter(self._notes.values())
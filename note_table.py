@@ -0,0 +1,278 @@
+import datetime
+from array import array
+from note_category import CATEGORIES
+from note_events import NoteEvent
+from profiler import profiler
+
+_numpy = []  # Модуль NumPy (или None без него) после первого обращения
+
+
+def numpy():
+    """
+    Возвращает модуль NumPy или None, если он не установлен.
+    Импорт откладывается до первой фильтрации или сортировки: он заметно удлиняет запуск.
+
+    :return: module или None
+    """
+    if not _numpy:
+        try:
+            import numpy as np
+        except ImportError:  # NumPy необязателен: без него используются array и sorted()
+            np = None
+        _numpy.append(np)
+    return _numpy[0]
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_DELETED = -1  # Код категории удалённой строки
+
+
+def to_micros(value):
+    """
+    Переводит дату в микросекунды от 1970-01-01 по местному времени
+    (как даты заметок). Дата с часовым поясом сначала переводится в местное время.
+
+    :param value: Дата в формате ISO или datetime.
+    :return: int
+    """
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+class NoteTable:
+    """
+    Колоночное представление заметок для массовой фильтрации и сортировки.
+
+    Заголовки, коды категорий и даты (микросекунды от 1970-01-01, int64)
+    хранятся в параллельных массивах. Фильтрация и сортировка возвращают
+    перестановки номеров строк и не переупорядочивают сами заметки.
+    При наличии NumPy операции векторизованы, иначе используются array и sorted().
+    Удалённые строки помечаются и вычищаются, когда их становится слишком много.
+    """
+    def __init__(self, notes=None):
+        """
+        Инициализация таблицы.
+
+        :param notes: Начальный набор заметок (необязательно).
+        """
+        self.categories = list(CATEGORIES)  # Код категории -> название
+        self._codes = {name: code for code, name in enumerate(self.categories)}
+        self.ids = []  # Идентификаторы заметок по строкам
+        self.titles = []  # Заголовки по строкам
+        self.category_codes = array('h')  # Коды категорий по строкам (-1 — строка удалена)
+        self.created = array('q')  # Дата создания, микросекунды
+        self.modified = array('q')  # Дата изменения, микросекунды
+        self._rows = {}  # Идентификатор -> номер строки
+        self._deleted = 0  # Количество удалённых строк
+        self._title_rank = None  # Позиция строки в порядке заголовков (строится лениво)
+        for note in notes or []:
+            self.add(note)
+
+    def _code(self, category: str):
+        code = self._codes.get(category)
+        if code is None:
+            code = self._codes[category] = len(self.categories)
+            self.categories.append(category)
+        return code
+
+    def add(self, note):
+        """
+        Добавляет заметку в конец таблицы (или обновляет уже добавленную).
+
+        :param note: Объект типа Note.
+        """
+        if note.id in self._rows:
+            self.update(note)
+            return
+        self._rows[note.id] = len(self.ids)
+        self.ids.append(note.id)
+        self.titles.append(note.title)
+        self.category_codes.append(self._code(note.category))
+        self.created.append(to_micros(note.created_at_iso))
+        self.modified.append(to_micros(note.modified_at_iso))
+        self._title_rank = None
+
+    def update(self, note):
+        """
+        Обновляет строку изменённой заметки.
+
+        :param note: Объект типа Note.
+        """
+        row = self._rows.get(note.id)
+        if row is None:
+            self.add(note)
+            return
+        if self.titles[row] != note.title:
+            self.titles[row] = note.title
+            self._title_rank = None
+        self.category_codes[row] = self._code(note.category)
+        self.modified[row] = to_micros(note.modified_at_iso)
+
+    def remove(self, note_id: str):
+        """
+        Удаляет строку заметки.
+
+        :param note_id: Идентификатор заметки.
+        """
+        row = self._rows.pop(note_id, None)
+        if row is None:
+            return
+        self.category_codes[row] = _DELETED
+        self._deleted += 1
+        if self._deleted > len(self.ids) // 2:
+            self._compact()
+
+    def apply_events(self, events):
+        """
+        Обновляет таблицу по событиям хранилища заметок (подписчик NoteStore).
+
+        :param events: Список NoteEvent.
+        """
+        for event in events:
+            if event.kind == NoteEvent.REMOVED:
+                self.remove(event.note_id)
+            elif event.kind == NoteEvent.CHANGED:
+                self.update(event.note)
+            else:
+                self.add(event.note)
+
+    def _compact(self):
+        """
+        Вычищает удалённые строки.
+        """
+        alive = [row for row, code in enumerate(self.category_codes) if code != _DELETED]
+        self.ids = [self.ids[row] for row in alive]
+        self.titles = [self.titles[row] for row in alive]
+        self.category_codes = array('h', (self.category_codes[row] for row in alive))
+        self.created = array('q', (self.created[row] for row in alive))
+        self.modified = array('q', (self.modified[row] for row in alive))
+        self._rows = {note_id: row for row, note_id in enumerate(self.ids)}
+        self._deleted = 0
+        self._title_rank = None
+
+    def _ranks(self):
+        """
+        Возвращает позицию каждой строки в порядке заголовков, чтобы сортировать
+        по заголовку целыми числами. Пересчитывается только после изменения заголовков.
+        """
+        if self._title_rank is None:
+            order = sorted(range(len(self.titles)), key=self.titles.__getitem__)
+            ranks = array('q', bytes(8 * len(order)))
+            for position, row in enumerate(order):
+                ranks[row] = position
+            self._title_rank = ranks
+        return self._title_rank
+
+    def _column(self, key: str):
+        if key == "title":
+            return self._ranks()
+        if key == "created_at":
+            return self.created
+        if key == "modified_at":
+            return self.modified
+        raise ValueError(f"Неизвестный ключ сортировки: {key}")
+
+    def rows(self, category: str = None, note_ids=None):
+        """
+        Возвращает номера строк, прошедших фильтр.
+
+        :param category: Категория (None — все категории).
+        :param note_ids: Идентификаторы, которыми ограничен результат, в нужном порядке (необязательно).
+        :return: list of int (или массив NumPy)
+        """
+        code = None if category is None else self._codes.get(category, _DELETED - 1)
+        if note_ids is not None:
+            rows = [self._rows[note_id] for note_id in note_ids if note_id in self._rows]
+            if code is None:
+                return rows
+            codes = self.category_codes
+            return [row for row in rows if codes[row] == code]
+        np = numpy()
+        if np is not None:
+            codes = np.frombuffer(self.category_codes, dtype=np.int16)
+            return np.flatnonzero(codes != _DELETED if code is None else codes == code)
+        if code is None:
+            return [row for row, value in enumerate(self.category_codes) if value != _DELETED]
+        return [row for row, value in enumerate(self.category_codes) if value == code]
+
+    def sort(self, rows, key: str, descending: bool = False):
+        """
+        Упорядочивает номера строк по столбцу (устойчивая сортировка).
+
+        :param rows: Номера строк.
+        :param key: "title", "created_at" или "modified_at".
+        :param descending: Сортировать по убыванию.
+        :return: list of int (или массив NumPy)
+        """
+        with profiler.stage("sort", key=key, rows=len(rows)):
+            column = self._column(key)
+            np = numpy()
+            if np is not None:
+                rows = np.asarray(rows, dtype=np.int64)
+                values = np.frombuffer(column, dtype=np.int64)[rows]
+                order = np.argsort(-values if descending else values, kind="stable")
+                return rows[order]
+            return sorted(rows, key=column.__getitem__, reverse=descending)
+
+    def view(self, category: str = None, note_ids=None, sort: str = None, descending: bool = False):
+        """
+        Возвращает идентификаторы заметок для сочетания фильтра по категории,
+        ограничения набором идентификаторов (например, результатами поиска) и сортировки.
+
+        :param category: Категория (None — все категории).
+        :param note_ids: Идентификаторы, которыми ограничен результат (необязательно).
+        :param sort: Ключ сортировки или None (порядок таблицы либо порядок note_ids).
+        :param descending: Сортировать по убыванию.
+        :return: list of str
+        """
+        rows = self.rows(category, note_ids)
+        if sort is not None:
+            rows = self.sort(rows, sort, descending)
+        ids = self.ids
+        return [ids[row] for row in rows]
+
+    def created_between(self, note_ids=None, start: int = None, end: int = None):
+        """
+        Оставляет заметки, созданные в диапазоне дат, сохраняя их порядок.
+
+        :param note_ids: Идентификаторы заметок в нужном порядке (None — все заметки в порядке таблицы).
+        :param start: Начало диапазона, микросекунды от 1970-01-01 включительно (необязательно).
+        :param end: Конец диапазона, микросекунды от 1970-01-01 включительно (необязательно).
+        :return: list of str
+        """
+        rows = self.rows(note_ids=note_ids)
+        np = numpy()
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            values = np.frombuffer(self.created, dtype=np.int64)[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if start is not None:
+                mask &= values >= start
+            if end is not None:
+                mask &= values <= end
+            rows = rows[mask]
+        else:
+            created = self.created
+            rows = [row for row in rows if (start is None or created[row] >= start) and
+                    (end is None or created[row] <= end)]
+        ids = self.ids
+        return [ids[row] for row in rows]
+
+    def count(self, category: str = None):
+        """
+        Возвращает количество заметок (всего или в категории).
+
+        :return: int
+        """
+        if category is None:
+            return len(self._rows)
+        return len(self.rows(category))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, note_id):
+        return note_id in self._rows
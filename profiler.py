@@ -0,0 +1,235 @@
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_PROFILE = "NOTEAPP_PROFILE"  # Переменная окружения, включающая замеры (любое непустое значение, кроме "0")
+ENV_TRACE = "NOTEAPP_TRACE"  # Переменная окружения с именем файла трассировки
+
+
+class _NullStage:
+    """
+    Этап, который ничего не замеряет (замеры выключены).
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """
+    Замер одного выполнения этапа.
+    """
+    __slots__ = ("profiler", "name", "args", "started")
+
+    def __init__(self, profiler, name: str, args: dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.started, time.perf_counter(), **self.args)
+        return False
+
+
+class Profiler:
+    """
+    Замеры времени этапов и счётчики для поиска узких мест.
+
+    Замеры включаются явно (enable, переменная окружения NOTEAPP_PROFILE или
+    ключ --profile в main.py). Пока они выключены, stage() возвращает общий
+    пустой объект, а count() сразу возвращается, поэтому расход на замеры
+    сводится к одной проверке флага. В горячих циклах счётчики увеличиваются
+    на размер порции, а не на каждый элемент.
+
+    Для каждого этапа копятся количество выполнений, суммарное и наибольшее
+    время; сводка печатается в stderr не чаще раза в interval секунд и при
+    завершении. Отдельные выполнения этапов и значения счётчиков сохраняются
+    в формате Chrome Trace (chrome://tracing, Perfetto).
+    """
+    SUMMARY_INTERVAL = 10.0  # Пауза между сводками в секундах
+    MAX_EVENTS = 100000  # Наибольшее количество событий трассировки в памяти
+
+    def __init__(self):
+        """
+        Инициализация (замеры выключены).
+        """
+        self.enabled = False  # Включены ли замеры
+        self.trace_file = None  # Файл для трассировки при завершении (необязательно)
+        self.interval = self.SUMMARY_INTERVAL
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()  # Начало отсчёта времени трассировки
+        self._last_summary = self._origin
+        self._stages = {}  # Этап -> [количество, суммарное время, наибольшее время]
+        self._counters = {}  # Счётчик -> значение
+        self._events = []  # События трассировки
+
+    def enable(self, trace_file: str = None, interval: float = None):
+        """
+        Включает замеры.
+
+        :param trace_file: Файл, в который при завершении сохраняется трассировка (необязательно).
+        :param interval: Пауза между сводками в секундах (0 — только при завершении).
+        """
+        self.trace_file = trace_file
+        if interval is not None:
+            self.interval = interval
+        self.enabled = True
+
+    def disable(self):
+        """
+        Выключает замеры. Накопленные данные сохраняются.
+        """
+        self.enabled = False
+
+    def configure_from_env(self, environ=None):
+        """
+        Включает замеры, если это задано переменными окружения NOTEAPP_PROFILE и NOTEAPP_TRACE.
+
+        :param environ: Переменные окружения (по умолчанию os.environ).
+        """
+        environ = os.environ if environ is None else environ
+        trace_file = environ.get(ENV_TRACE) or None
+        if environ.get(ENV_PROFILE, "") not in ("", "0") or trace_file:
+            self.enable(trace_file)
+
+    def reset(self):
+        """
+        Удаляет накопленные замеры.
+        """
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._events.clear()
+            self._origin = self._last_summary = time.perf_counter()
+
+    def stage(self, name: str, **args):
+        """
+        Возвращает контекстный менеджер, замеряющий время этапа.
+
+        :param name: Название этапа (например, "load" или "refresh").
+        :param args: Подробности выполнения для трассировки (например, количество заметок).
+        :return: Контекстный менеджер.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, args)
+
+    def count(self, name: str, value: int = 1):
+        """
+        Увеличивает счётчик.
+
+        :param name: Название счётчика (например, "notes_loaded").
+        :param value: Приращение.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self._counters[name] = self._counters.get(name, 0) + value
+            if len(self._events) < self.MAX_EVENTS:
+                self._events.append({
+                    "name": name, "ph": "C", "ts": self._micros(time.perf_counter()),
+                    "pid": os.getpid(), "args": {"value": total},
+                })
+
+    def record(self, name: str, started: float, finished: float = None, **args):
+        """
+        Записывает выполнение этапа с известным началом (например, от запуска процесса).
+
+        :param name: Название этапа.
+        :param started: Начало, значение time.perf_counter().
+        :param finished: Конец (по умолчанию — сейчас).
+        :param args: Подробности выполнения для трассировки.
+        """
+        if not self.enabled:
+            return
+        if finished is None:
+            finished = time.perf_counter()
+        elapsed = finished - started
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                self._stages[name] = [1, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+            if len(self._events) < self.MAX_EVENTS:
+                self._events.append({
+                    "name": name, "ph": "X", "ts": self._micros(started), "dur": round(elapsed * 1e6, 1),
+                    "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+                })
+            due = self.interval and finished - self._last_summary >= self.interval
+            if due:
+                self._last_summary = finished
+        if due:
+            print(self.summary(), file=sys.stderr)
+
+    def _micros(self, moment: float):
+        return round((moment - self._origin) * 1e6, 1)
+
+    def stats(self):
+        """
+        Возвращает накопленные замеры.
+
+        :return: dict {"stages": {этап: {"count", "total", "max"}}, "counters": {счётчик: значение}}
+        """
+        with self._lock:
+            return {
+                "stages": {name: {"count": count, "total": total, "max": longest}
+                           for name, (count, total, longest) in self._stages.items()},
+                "counters": dict(self._counters),
+            }
+
+    def summary(self):
+        """
+        Возвращает сводку замеров в виде текста.
+
+        :return: str
+        """
+        stats = self.stats()
+        lines = ["Замеры:"]
+        for name, stage in sorted(stats["stages"].items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"  {name:<16}{stage['count']:>8} раз {stage['total'] * 1000:>10.1f} мс "
+                         f"(в среднем {stage['total'] / stage['count'] * 1000:.2f}, "
+                         f"наибольшее {stage['max'] * 1000:.2f})")
+        for name, value in sorted(stats["counters"].items()):
+            lines.append(f"  {name:<16}{value:>8}")
+        return "\n".join(lines)
+
+    def export_trace(self, filename: str):
+        """
+        Сохраняет трассировку в формате Chrome Trace (JSON).
+
+        :param filename: Имя файла.
+        """
+        with self._lock:
+            events = list(self._events)
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file, ensure_ascii=False)
+
+    def finish(self):
+        """
+        Печатает итоговую сводку и сохраняет трассировку, если задан файл (при завершении приложения).
+        """
+        if not self.enabled:
+            return
+        print(self.summary(), file=sys.stderr)
+        if self.trace_file:
+            self.export_trace(self.trace_file)
+
+
+profiler = Profiler()  # Общий экземпляр для всего приложения
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from note_events import NoteEvent
+
+
+class RenderCache:
+    """
+    Кэш строк для отображения заметок (подпись в списке, текст панели просмотра).
+
+    Строка хранится по идентификатору заметки вместе с датой изменения, для
+    которой она построена: если дата не совпадает, строка строится заново.
+    Кроме того, изменение и удаление заметки сразу убирают её строку из кэша
+    (apply_events — подписчик NoteStore). Кэш ограничен SIZE заметками и
+    вытесняет давно не показанные (LRU), поэтому повторный пересчёт списка и
+    прокрутка по неизменённым заметкам не форматируют строки заново.
+    """
+    SIZE = 1024  # Наибольшее количество заметок в кэше
+
+    def __init__(self, render, size: int = None):
+        """
+        Инициализация кэша.
+
+        :param render: Функция, строящая значение для заметки (note -> значение).
+        :param size: Наибольшее количество заметок в кэше (по умолчанию SIZE).
+        """
+        self.render = render
+        self.size = self.SIZE if size is None else size
+        self._entries = OrderedDict()  # Идентификатор -> (дата изменения, значение)
+        self.hits = 0  # Количество значений, взятых из кэша
+        self.misses = 0  # Количество значений, построенных заново
+
+    def get(self, note):
+        """
+        Возвращает значение для заметки: из кэша или построенное заново.
+
+        :param note: Объект типа Note.
+        :return: Значение функции render.
+        """
+        stamp = note.modified_at
+        entry = self._entries.get(note.id)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(note.id)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = self.render(note)
+        if self.size:
+            self._entries[note.id] = (stamp, value)
+            self._entries.move_to_end(note.id)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, note_id: str = None):
+        """
+        Удаляет значение заметки из кэша (без аргумента — очищает весь кэш).
+
+        :param note_id: Идентификатор заметки.
+        """
+        if note_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(note_id, None)
+
+    def apply_events(self, events):
+        """
+        Удаляет значения изменённых и удалённых заметок (подписчик NoteStore).
+
+        :param events: Список NoteEvent.
+        """
+        for event in events:
+            if event.kind in (NoteEvent.CHANGED, NoteEvent.REMOVED):
+                self._entries.pop(event.note_id, None)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,386 @@
+import bisect
+import heapq
+import json
+import math
+import re
+import threading
+from atomic_file import AtomicFile, DURABILITY_NONE
+from note_events import NoteEvent
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str):
+    """
+    Разбивает текст на слова для поиска.
+    Слова приводятся к нижнему регистру, буква "ё" заменяется на "е".
+
+    :param text: Исходный текст.
+    :return: list of str
+    """
+    return _TOKEN_RE.findall(text.lower().replace("ё", "е"))
+
+
+def is_refinement(previous: str, query: str):
+    """
+    Проверяет, уточняет ли запрос предыдущий: все слова предыдущего запроса,
+    кроме последнего, совпадают, а последнее продолжено или за ним добавлены слова.
+    Результаты такого запроса — подмножество результатов предыдущего.
+
+    :param previous: Предыдущий запрос.
+    :param query: Новый запрос.
+    :return: bool
+    """
+    before, after = tokenize(previous), tokenize(query)
+    if not before or len(after) < len(before):
+        return False
+    last = len(before) - 1
+    return before[:last] == after[:last] and after[last].startswith(before[last])
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс для полнотекстового поиска по заголовку и тексту заметок.
+
+    Для каждого слова хранится словарь "идентификатор заметки -> вес".
+    Слова заголовка весят больше слов текста. Отсортированный словарь слов
+    позволяет искать по префиксу через двоичный поиск.
+
+    Поиск может выполняться в фоновом потоке. Изменения индекса выполняются
+    под блокировкой, а поиск её не держит, поэтому изменения не ждут его окончания:
+    он перебирает копии части словаря и списков заметок по словам (каждая копия
+    снимается одной операцией) и пропускает слова, удалённые за это время.
+    Счётчик revision меняется при каждом изменении: если он изменился во время
+    поиска, результат мог не учесть часть изменений (см. QueryPlanner).
+    """
+    SUFFIX = ".index"
+    VERSION = 2
+    TITLE_WEIGHT = 3  # Вес слова из заголовка
+    CONTENT_WEIGHT = 1  # Вес слова из текста
+
+    def __init__(self):
+        """
+        Инициализация пустого индекса.
+        """
+        self._postings = {}  # Слово -> {идентификатор заметки: вес}
+        self._documents = {}  # Идентификатор заметки -> слова заметки (кортеж или строка через пробел)
+        self._stamps = {}  # Идентификатор заметки -> дата изменения на момент индексации
+        self._vocabulary = []  # Отсортированный список слов для поиска по префиксу
+        self.dirty = False  # Изменён ли индекс после последнего сохранения или загрузки
+        self.revision = 0  # Номер версии индекса, растёт при каждом изменении
+        self._lock = threading.RLock()  # Блокировка изменений индекса
+
+    def _weights(self, note):
+        """
+        Вычисляет веса слов заметки.
+
+        :param note: Объект типа Note.
+        :return: dict
+        """
+        weights = {}
+        for token in tokenize(note.title):
+            weights[token] = weights.get(token, 0) + self.TITLE_WEIGHT
+        for token in tokenize(note.content):
+            weights[token] = weights.get(token, 0) + self.CONTENT_WEIGHT
+        return weights
+
+    def _insert(self, note_id: str, weights: dict, stamp: str):
+        """
+        Добавляет готовые веса слов заметки в индекс.
+        """
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                bisect.insort(self._vocabulary, token)
+            posting[note_id] = weight
+        self._documents[note_id] = tuple(weights)
+        self._stamps[note_id] = stamp
+        self.dirty = True
+        self.revision += 1
+
+    def add(self, note):
+        """
+        Добавляет заметку в индекс (или переиндексирует уже добавленную).
+
+        :param note: Объект типа Note.
+        """
+        weights = self._weights(note)
+        with self._lock:
+            if note.id in self._documents:
+                self.remove(note.id)
+            self._insert(note.id, weights, note.modified_at_iso)
+
+    def update(self, note):
+        """
+        Переиндексирует изменённую заметку.
+
+        :param note: Объект типа Note.
+        """
+        self.add(note)
+
+    def remove(self, note_id: str):
+        """
+        Удаляет заметку из индекса.
+
+        :param note_id: Идентификатор заметки.
+        """
+        with self._lock:
+            tokens = self._documents.pop(note_id, None)
+            self._stamps.pop(note_id, None)
+            if tokens is None:
+                return
+            self.dirty = True
+            self.revision += 1
+            if isinstance(tokens, str):
+                tokens = tokens.split()  # Слова заметки, загруженной из файла индекса
+            for token in tokens:
+                posting = self._postings[token]
+                del posting[note_id]
+                if not posting:
+                    del self._postings[token]
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def apply_events(self, events):
+        """
+        Обновляет индекс по событиям хранилища заметок.
+        Смена одной только категории не требует переиндексации.
+
+        :param events: Список NoteEvent.
+        """
+        for event in events:
+            if event.kind == NoteEvent.REMOVED:
+                self.remove(event.note_id)
+            elif event.kind != NoteEvent.CHANGED or set(event.changes) != {"category"}:
+                self.add(event.note)
+
+    def _prefix_matches(self, prefix: str, cancelled=None):
+        """
+        Возвращает объединённые веса заметок по всем словам, начинающимся с префикса.
+
+        :param prefix: Префикс слова.
+        :param cancelled: Функция, возвращающая True, если поиск больше не нужен (необязательно).
+        :return: dict или None, если поиск отменён.
+        """
+        matches = {}
+        total = len(self._documents)
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + "\U0010ffff")
+        for token in vocabulary[start:end]:
+            if cancelled is not None and cancelled():
+                return None
+            posting = self._postings.get(token)
+            posting = None if posting is None else posting.copy()
+            if not posting or not token.startswith(prefix):
+                continue  # Слово удалено из индекса во время поиска
+            idf = math.log(1 + total / len(posting))
+            for note_id, weight in posting.items():
+                matches[note_id] = matches.get(note_id, 0) + weight * idf
+        return matches
+
+    def estimate(self, query: str, cap: int = None):
+        """
+        Оценивает сверху количество заметок, подходящих под запрос, не выполняя поиск:
+        для каждого слова складываются размеры списков заметок по словам с этим префиксом,
+        и берётся наименьшая сумма.
+
+        :param query: Строка запроса.
+        :param cap: Подсчёт для слова прекращается, как только сумма превышает это значение.
+        :return: int
+        """
+        best = 0
+        with self._lock:
+            for number, prefix in enumerate(set(tokenize(query))):
+                total = 0
+                position = bisect.bisect_left(self._vocabulary, prefix)
+                while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+                    total += len(self._postings[self._vocabulary[position]])
+                    if cap is not None and total > cap:
+                        break
+                    position += 1
+                best = total if number == 0 else min(best, total)
+        return best
+
+    def _score_candidates(self, prefixes, candidates, cancelled=None):
+        """
+        Вычисляет релевантность только для заданных заметок (уточнение прежних результатов):
+        перебираются слова этих заметок, а не весь словарь индекса.
+
+        :param prefixes: Слова запроса.
+        :param candidates: Идентификаторы заметок, среди которых идёт поиск.
+        :param cancelled: Функция, возвращающая True, если поиск больше не нужен (необязательно).
+        :return: dict или None, если поиск отменён.
+        """
+        scores = {}
+        total = len(self._documents)
+        for position, note_id in enumerate(candidates):
+            if cancelled is not None and position % 256 == 0 and cancelled():
+                return None
+            tokens = self._documents.get(note_id)
+            if tokens is None:
+                continue  # Заметка удалена
+            if isinstance(tokens, str):
+                tokens = tokens.split()
+            score = 0
+            for prefix in prefixes:
+                matched = 0
+                for token in tokens:
+                    if token.startswith(prefix):
+                        posting = self._postings.get(token)
+                        weight = 0 if posting is None else posting.get(note_id, 0)
+                        if weight:  # Иначе заметку переиндексировали во время поиска
+                            matched += weight * math.log(1 + total / len(posting))
+                if not matched:
+                    break
+                score += matched
+            else:
+                scores[note_id] = score
+        return scores
+
+    def search(self, query: str, limit: int = None, candidates=None, cancelled=None):
+        """
+        Ищет заметки, содержащие все слова запроса (каждое слово — как префикс).
+        Результаты упорядочены по убыванию релевантности.
+
+        :param query: Строка запроса.
+        :param limit: Максимальное количество результатов (необязательно).
+        :param candidates: Идентификаторы заметок, которыми ограничен поиск (например,
+                           результаты запроса, который уточняет новый запрос; необязательно).
+        :param cancelled: Функция, возвращающая True, если поиск больше не нужен (необязательно).
+        :return: list of str — идентификаторы заметок, или None, если поиск отменён.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        prefixes = sorted(set(tokens), key=len, reverse=True)
+        # Без блокировки: изменения индекса не ждут окончания поиска
+        if candidates is not None:
+            scores = self._score_candidates(prefixes, candidates, cancelled)
+        else:
+            scores = None
+            for token in prefixes:
+                matches = self._prefix_matches(token, cancelled)
+                if matches is None:
+                    return None
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {note_id: score + matches[note_id]
+                              for note_id, score in scores.items() if note_id in matches}
+                if not scores:
+                    return []
+        if scores is None:
+            return None
+        if limit is not None:
+            return [note_id for note_id, _ in heapq.nlargest(limit, scores.items(), key=lambda pair: pair[1])]
+        return sorted(scores, key=scores.get, reverse=True)
+
+    def sync(self, notes):
+        """
+        Приводит индекс в соответствие с набором заметок:
+        индексирует новые и изменённые заметки и удаляет отсутствующие.
+
+        :param notes: Итерируемый набор заметок.
+        """
+        seen = set()
+        for note in notes:
+            seen.add(note.id)
+            if self._stamps.get(note.id) != note.modified_at_iso:
+                self.add(note)
+        with self._lock:
+            for note_id in [note_id for note_id in self._documents if note_id not in seen]:
+                self.remove(note_id)
+
+    def save(self, path: str):
+        """
+        Сохраняет индекс в файл.
+
+        :param path: Путь к файлу индекса.
+        """
+        data = {
+            "version": self.VERSION,
+            "stamps": self._stamps,
+            "tokens": {note_id: tokens if isinstance(tokens, str) else " ".join(tokens)
+                       for note_id, tokens in self._documents.items()},
+            "postings": {token: [list(posting), list(posting.values())]
+                         for token, posting in self._postings.items()},
+        }
+        # Индекс восстанавливается по заметкам, поэтому fsync не нужен: достаточно атомарной замены
+        with AtomicFile(path, DURABILITY_NONE) as temp:
+            with open(temp, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+        self.dirty = False
+
+    @staticmethod
+    def load(path: str):
+        """
+        Загружает индекс из файла. Если файла нет или он повреждён, возвращается пустой индекс.
+
+        :param path: Путь к файлу индекса.
+        :return: SearchIndex
+        """
+        index = SearchIndex()
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return index
+        if data.get("version") != SearchIndex.VERSION:
+            return index
+        index._postings = {token: dict(zip(ids, weights)) for token, (ids, weights) in data["postings"].items()}
+        index._documents = data["tokens"]
+        index._stamps = data["stamps"]
+        index._vocabulary = sorted(index._postings)
+        return index
+
+    @staticmethod
+    def for_notes(notes, filename: str):
+        """
+        Загружает индекс, сохранённый рядом с файлом данных, и синхронизирует его с заметками.
+
+        :param notes: Итерируемый набор заметок.
+        :param filename: Имя файла данных.
+        :return: SearchIndex
+        """
+        index = SearchIndex.load(filename + SearchIndex.SUFFIX)
+        index.sync(notes)
+        return index
+
+    @staticmethod
+    def merge(indexes):
+        """
+        Объединяет индексы непересекающихся наборов заметок (например, частей хранилища).
+
+        :param indexes: Итерируемый набор индексов.
+        :return: SearchIndex
+        """
+        merged = SearchIndex()
+        for index in indexes:
+            for token, posting in index._postings.items():
+                target = merged._postings.get(token)
+                if target is None:
+                    merged._postings[token] = posting
+                else:
+                    target.update(posting)
+            merged._documents.update(index._documents)
+            merged._stamps.update(index._stamps)
+        merged._vocabulary = sorted(merged._postings)
+        merged.dirty = bool(merged._documents)  # Объединённый индекс ещё не сохранён
+        return merged
+
+    def __getstate__(self):
+        """
+        Состояние для передачи индекса в другой процесс (без блокировки).
+        """
+        with self._lock:
+            state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._documents)
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from note_query import NoteQuery
+
+
+class SearchWorker(QObject):
+    """
+    Выполнение запросов к заметкам по мере ввода вне потока интерфейса.
+
+    Запрос выполняется после паузы SEARCH_DELAY_MS с последнего изменения
+    текста. Каждый новый запрос делает устаревшими все предыдущие: выполняемый
+    поиск прерывается, а его результаты не доставляются. Запросы без текста
+    (только категории, даты и сортировка) выполняются сразу по индексам.
+    Уточнение запроса (например, к слову добавлена буква) ищется только среди
+    прежних результатов — это делает планировщик запросов.
+    """
+    results_ready = pyqtSignal(object)  # Результат запроса (QueryResult)
+    _finished = pyqtSignal(int, object)  # Номер запроса и результат (из рабочего потока)
+
+    SEARCH_DELAY_MS = 200  # Пауза после последнего изменения запроса перед поиском
+
+    def __init__(self, planner, parent=None):
+        """
+        Инициализация поиска.
+
+        :param planner: Планировщик запросов (QueryPlanner).
+        :param parent: Родительский объект Qt.
+        """
+        super().__init__(parent)
+        self.planner = planner
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._query = NoteQuery()  # Последний запрошенный запрос
+        self._generation = 0  # Номер последнего запроса; более ранние устарели
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SEARCH_DELAY_MS)
+        self._timer.timeout.connect(self._start)
+        self._finished.connect(self._deliver)  # Доставляется в поток интерфейса через очередь событий
+
+    def search(self, query: NoteQuery):
+        """
+        Запрашивает выполнение запроса после паузы ввода. Выполняемый поиск по прежнему запросу отменяется.
+
+        :param query: Запрос (NoteQuery).
+        """
+        self._query = query
+        self._generation += 1
+        self._timer.start()  # Перезапуск таймера откладывает поиск до паузы в наборе
+
+    def search_now(self, query: NoteQuery):
+        """
+        Выполняет запрос без паузы (например, после выбора категории или изменения заметок).
+
+        :param query: Запрос (NoteQuery).
+        """
+        self._query = query
+        self._generation += 1
+        self._timer.stop()
+        self._start()
+
+    def _start(self):
+        generation, query = self._generation, self._query
+        if not query.has_text:
+            self.results_ready.emit(self.planner.execute(query))  # По индексам категорий и таблице, без поиска
+            return
+        self._executor.submit(self._run, generation, query)
+
+    def _run(self, generation, query):
+        def cancelled():
+            return generation != self._generation
+
+        if cancelled():
+            return
+        result = self.planner.execute(query, cancelled=cancelled)
+        if result is not None:
+            self._finished.emit(generation, result)
+
+    def _deliver(self, generation, result):
+        if generation == self._generation:
+            self.results_ready.emit(result)
+
+    def shutdown(self):
+        """
+        Отменяет выполняемый поиск и дожидается завершения рабочего потока.
+        """
+        self._timer.stop()
+        self._generation += 1
+        self._executor.shutdown(wait=True)
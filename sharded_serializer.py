@@ -0,0 +1,299 @@
+import json
+import multiprocessing
+import os
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from atomic_file import AtomicFile
+from data_serializer import DataSerializer
+from note import Note
+from note_journal import NoteJournal
+from note_store import NoteStore
+from search_index import SearchIndex
+
+SHARD_BY_HASH = "hash"  # Заметка попадает в часть по хэшу идентификатора
+SHARD_BY_CATEGORY = "category"  # Заметки одной категории лежат в одной части
+
+_SLUG_RE = re.compile(r"\W+")
+
+
+def _load_shard(path: str):
+    """
+    Загружает заметки одной части (выполняется в отдельном процессе).
+
+    :return: list of dict — тексты прочитаны, поэтому словари можно передать между процессами
+    """
+    return [note.to_dict() for note in DataSerializer.iter_load(path)]
+
+
+def _index_shard(path: str):
+    """
+    Строит поисковый индекс одной части (выполняется в отдельном процессе).
+
+    :return: SearchIndex
+    """
+    index = SearchIndex()
+    for note in DataSerializer.iter_load(path):
+        index.add(note)
+    return index
+
+
+def _export_shard(path: str):
+    """
+    Выгружает заметки одной части в JSON (выполняется в отдельном процессе).
+
+    :return: str — элементы массива в том же виде, что и в DataSerializer.export_json, без скобок
+    """
+    items = [note.to_dict() for note in DataSerializer.iter_load(path)]
+    return json.dumps(items, ensure_ascii=False, indent=4)[2:-2] if items else ""
+
+
+class ShardedSerializer:
+    """
+    Хранение заметок, разделённых на части (каталог с файлами DataSerializer).
+
+    Повторяет интерфейс DataSerializer: filename — каталог, в котором каждая
+    часть хранится отдельным снимком со своим журналом и загружается или
+    сохраняется через DataSerializer. Заметка попадает в часть по хэшу
+    идентификатора (SHARDS частей) или по категории. Разбиение записывается
+    в файл описания при сохранении и меняется только полным сохранением.
+
+    Загрузка, построение поискового индекса и выгрузка выполняются по частям
+    в нескольких процессах (ProcessPoolExecutor), а результаты объединяются,
+    поэтому работа распределяется по ядрам, а не упирается в один GIL.
+    """
+    SHARD_BY = SHARD_BY_HASH  # Способ разбиения для новых и пересохраняемых каталогов
+    SHARDS = 8  # Количество частей при разбиении по хэшу
+    WORKERS = None  # Количество процессов (None — по числу ядер, 1 — всё в текущем процессе)
+    MANIFEST = "shards.meta"  # Файл описания разбиения в каталоге
+    VERSION = 1
+    _layouts = {}  # Разбиение, прочитанное для каждого каталога
+    _locations = {}  # Часть каждой загруженной заметки (при разбиении по категории)
+
+    @staticmethod
+    def layout(filename="notes_data.shards"):
+        """Возвращает разбиение каталога: из файла описания или, если его нет, по настройкам класса"""
+        layout = ShardedSerializer._layouts.get(filename)
+        if layout is None:
+            try:
+                with open(os.path.join(filename, ShardedSerializer.MANIFEST), 'r', encoding='utf-8') as file:
+                    layout = json.load(file)
+            except FileNotFoundError:
+                layout = ShardedSerializer._new_layout()
+            ShardedSerializer._layouts[filename] = layout
+        return layout
+
+    @staticmethod
+    def _new_layout():
+        return {"version": ShardedSerializer.VERSION, "by": ShardedSerializer.SHARD_BY,
+                "count": ShardedSerializer.SHARDS, "shards": []}
+
+    @staticmethod
+    def _write_layout(filename: str, layout: dict):
+        os.makedirs(filename, exist_ok=True)
+        with AtomicFile(os.path.join(filename, ShardedSerializer.MANIFEST), DataSerializer.DURABILITY) as temp:
+            with open(temp, 'w', encoding='utf-8') as file:
+                json.dump(layout, file, ensure_ascii=False, indent=4)
+        ShardedSerializer._layouts[filename] = layout
+
+    @staticmethod
+    def shard_name(layout: dict, note_id: str, category: str):
+        """Возвращает имя части для заметки"""
+        if layout["by"] == SHARD_BY_CATEGORY:
+            # Имена файлов без учёта регистра: на нечувствительных к регистру дисках части не сливаются
+            return _SLUG_RE.sub("_", category).strip("_").lower() or "_"
+        return f"{zlib.crc32(note_id.encode('utf-8')) % layout['count']:02d}"
+
+    @staticmethod
+    def shard_path(filename: str, name: str):
+        """Возвращает путь к файлу части"""
+        return os.path.join(filename, name + ".json")
+
+    @staticmethod
+    def shard_paths(filename="notes_data.shards"):
+        """Возвращает пути к файлам всех частей"""
+        return [ShardedSerializer.shard_path(filename, name) for name in ShardedSerializer.layout(filename)["shards"]]
+
+    @staticmethod
+    def _map(function, paths):
+        """
+        Выполняет функцию для каждой части в пуле процессов, сохраняя порядок частей.
+        Процессы запускаются заново (spawn): копирование через fork процесса
+        с потоками Qt и рабочими потоками небезопасно.
+        """
+        workers = ShardedSerializer.workers(paths)
+        if workers <= 1:
+            yield from map(function, paths)
+            return
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            yield from executor.map(function, paths)
+
+    @staticmethod
+    def workers(paths):
+        """Возвращает количество процессов для обработки частей (1 — в текущем процессе)"""
+        return max(1, min(ShardedSerializer.WORKERS or os.cpu_count() or 1, len(paths)))
+
+    @staticmethod
+    def save(data, filename="notes_data.shards"):
+        """
+        Сохраняет все заметки: каждая часть записывается новым снимком через DataSerializer.
+        Разбиение берётся из настроек класса, части прежнего разбиения удаляются.
+        """
+        layout = ShardedSerializer._new_layout()
+        shards, locations = {}, {}
+        for note in data:
+            name = ShardedSerializer.shard_name(layout, note.id, note.category)
+            shards.setdefault(name, []).append(note)
+            locations[note.id] = name
+        old = set(ShardedSerializer.layout(filename)["shards"])
+        os.makedirs(filename, exist_ok=True)
+        for name, notes in shards.items():
+            DataSerializer.save_to_file(notes, ShardedSerializer.shard_path(filename, name))
+        layout["shards"] = sorted(shards)
+        ShardedSerializer._write_layout(filename, layout)
+        for name in old - set(shards):
+            # Новый снимок пустой части очищает и её журнал, после чего файл удаляется
+            path = ShardedSerializer.shard_path(filename, name)
+            DataSerializer.save_to_file([], path)
+            os.remove(path)
+            os.remove(DataSerializer.lock(path).path)
+        if layout["by"] == SHARD_BY_CATEGORY:
+            ShardedSerializer._locations[filename] = locations
+
+    @staticmethod
+    def iter_load(filename="notes_data.shards", chunk_size: int = None):
+        """Загружает заметки по частям (генератор); при нескольких процессах части читаются параллельно"""
+        paths = ShardedSerializer.shard_paths(filename)
+        by_category = ShardedSerializer.layout(filename)["by"] == SHARD_BY_CATEGORY
+        locations = ShardedSerializer._locations.setdefault(filename, {}) if by_category else None
+        if ShardedSerializer.workers(paths) == 1:
+            # В одном процессе заметки не передаются между процессами и тексты остаются в файле
+            shards = (DataSerializer.iter_load(path, chunk_size) for path in paths)
+        else:
+            shards = (map(Note.from_dict, items) for items in ShardedSerializer._map(_load_shard, paths))
+        for path, notes in zip(paths, shards):
+            name = os.path.basename(path)[:-len(".json")]
+            for note in notes:
+                if locations is not None:
+                    locations[note.id] = name
+                yield note
+
+    @staticmethod
+    def load(filename="notes_data.shards"):
+        """Загружает все заметки из всех частей"""
+        return list(ShardedSerializer.iter_load(filename))
+
+    @staticmethod
+    def load_store(filename="notes_data.shards"):
+        """Загружает заметки из всех частей в хранилище заметок"""
+        return NoteStore(ShardedSerializer.iter_load(filename))
+
+    @staticmethod
+    def search_index(notes, filename="notes_data.shards"):
+        """
+        Возвращает поисковый индекс для заметок.
+        Сохранённый индекс синхронизируется с заметками; если его нет, индексы
+        частей строятся параллельно и объединяются (в одном процессе индекс
+        строится прямо по заметкам, без повторного чтения частей).
+        """
+        index = SearchIndex.load(filename + SearchIndex.SUFFIX)
+        paths = ShardedSerializer.shard_paths(filename)
+        if not len(index) and ShardedSerializer.workers(paths) > 1:
+            index = SearchIndex.merge(ShardedSerializer._map(_index_shard, paths))
+        index.sync(notes)
+        return index
+
+    @staticmethod
+    def export_json(filename="notes_data.shards", output="notes_export.json"):
+        """
+        Выгружает все заметки в один JSON-файл (тот же формат, что у DataSerializer.export_json).
+        Части переводятся в JSON параллельно, а тексты склеиваются по порядку частей.
+        """
+        parts = [part for part in ShardedSerializer._map(_export_shard, ShardedSerializer.shard_paths(filename)) if part]
+        with AtomicFile(output, DataSerializer.DURABILITY) as temp:
+            with open(temp, 'w', encoding='utf-8') as file:
+                file.write("[\n" + ",\n".join(parts) + "\n]" if parts else "[]")
+
+    @staticmethod
+    def record_add(note, filename="notes_data.shards"):
+        """Записывает в журнал своей части добавление заметки"""
+        ShardedSerializer.record_many([NoteJournal.add_record(note)], filename)
+
+    @staticmethod
+    def record_update(note, filename="notes_data.shards"):
+        """Записывает в журнал своей части изменение заметки"""
+        ShardedSerializer.record_many([NoteJournal.update_record(note)], filename)
+
+    @staticmethod
+    def record_delete(note_id, filename="notes_data.shards"):
+        """Записывает в журнал удаление заметки с указанным идентификатором"""
+        ShardedSerializer.record_many([NoteJournal.delete_record(note_id)], filename)
+
+    @staticmethod
+    def record_many(records, filename="notes_data.shards"):
+        """
+        Раскладывает записи журнального формата по частям и дописывает их одной операцией на часть.
+        При разбиении по категории смена категории переносит заметку: в прежнюю часть
+        пишется удаление. Если часть заметки неизвестна (заметки не загружались
+        в этом процессе), удаление пишется во все остальные части — для отсутствующей
+        заметки оно ничего не меняет.
+        """
+        layout = ShardedSerializer.layout(filename)
+        by_category = layout["by"] == SHARD_BY_CATEGORY
+        locations = ShardedSerializer._locations.setdefault(filename, {})
+        shards = {name: [] for name in layout["shards"]}
+        for record in records:
+            if record["op"] in ("add", "update"):
+                note = record["note"]
+                name = ShardedSerializer.shard_name(layout, note["id"], note["category"])
+                shards.setdefault(name, []).append(record)
+                if by_category:
+                    previous = locations.get(note["id"])
+                    for other in shards if previous is None else [previous]:
+                        if other != name:
+                            shards[other].append(NoteJournal.delete_record(note["id"]))
+                    locations[note["id"]] = name
+            elif record["op"] == "delete":
+                if not by_category:
+                    name = ShardedSerializer.shard_name(layout, record["id"], "")
+                    if name in shards:  # Части ещё нет — нет и заметки в ней, удалять нечего
+                        shards[name].append(record)
+                    continue
+                previous = locations.pop(record["id"], None)
+                for name in shards if previous is None else [previous]:
+                    shards[name].append(record)
+            # Сортировка частей не нужна: порядок заметок задаёт список в окне
+        added = set(shards) - set(layout["shards"])
+        if added:
+            for name in added:
+                # Новая часть сразу получает пустой снимок: при загрузке файл части не будет считаться пропавшим
+                DataSerializer.save_to_file([], ShardedSerializer.shard_path(filename, name))
+            ShardedSerializer._write_layout(filename, dict(layout, shards=sorted(shards)))
+        for name, shard_records in shards.items():
+            if shard_records:
+                DataSerializer.record_many(shard_records, ShardedSerializer.shard_path(filename, name))
+
+    @staticmethod
+    def sync(filename="notes_data.shards"):
+        """Сбрасывает на диск журналы всех частей"""
+        for path in ShardedSerializer.shard_paths(filename):
+            DataSerializer.sync(path)
+
+    @staticmethod
+    def needs_compaction(filename="notes_data.shards"):
+        """Проверяет, пора ли свернуть журналы в новые снимки (достаточно одной длинной части)"""
+        return any(DataSerializer.needs_compaction(path) for path in ShardedSerializer.shard_paths(filename))
+
+    @staticmethod
+    def migrate_from_json(json_filename="notes_data.json", filename="notes_data.shards"):
+        """
+        Однократно раскладывает заметки из JSON-файла (со снимком и журналом) по частям.
+        Если в каталоге уже есть части, миграция не выполняется.
+
+        :return: Количество перенесённых заметок.
+        """
+        if ShardedSerializer.shard_paths(filename):
+            return 0
+        notes = DataSerializer.load(json_filename)
+        ShardedSerializer.save(notes, filename)
+        return len(notes)
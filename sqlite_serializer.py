@@ -0,0 +1,244 @@
+import sqlite3
+from note import Note
+from note_store import NoteStore
+from data_serializer import DataSerializer
+from search_index import SearchIndex, tokenize
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    category TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    modified_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_category ON notes (category);
+CREATE INDEX IF NOT EXISTS notes_created_at ON notes (created_at);
+CREATE INDEX IF NOT EXISTS notes_modified_at ON notes (modified_at);
+CREATE INDEX IF NOT EXISTS notes_title ON notes (title);
+"""
+
+_FTS_SCHEMA = """
+-- В индекс попадает текст, приведённый функцией fold() (нижний регистр, "ё" -> "е")
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title, content, content='notes', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.rowid, fold(new.title), fold(new.content));
+END;
+CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content)
+    VALUES ('delete', old.rowid, fold(old.title), fold(old.content));
+END;
+CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content)
+    VALUES ('delete', old.rowid, fold(old.title), fold(old.content));
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.rowid, fold(new.title), fold(new.content));
+END;
+"""
+
+_UPSERT = """
+INSERT INTO notes (id, title, content, category, created_at, modified_at)
+VALUES (:id, :title, :content, :category, :created_at, :modified_at)
+ON CONFLICT (id) DO UPDATE SET
+    title = excluded.title, content = excluded.content, category = excluded.category,
+    created_at = excluded.created_at, modified_at = excluded.modified_at
+"""
+
+_COLUMNS = "notes.id, notes.title, notes.content, notes.category, notes.created_at, notes.modified_at"
+
+_SORT_COLUMNS = {
+    "title": "notes.title",
+    "created_at": "notes.created_at",
+    "modified_at": "notes.modified_at",
+}
+
+
+class SqliteSerializer:
+    """
+    Хранение заметок в базе SQLite (модуль sqlite3 стандартной библиотеки).
+
+    Повторяет интерфейс DataSerializer (save/load, потоковая загрузка, запись
+    изменений), но каждое изменение — это обновление одной строки таблицы.
+    Таблица проиндексирована по категории, датам и заголовку, а полнотекстовый
+    поиск выполняет таблица FTS5 (если сборка SQLite её поддерживает).
+    """
+    BATCH_SIZE = 1000  # Количество заметок в одной вставке при миграции
+    _connections = {}  # Открытые соединения для каждого файла базы
+
+    @staticmethod
+    def connect(filename="notes_data.db"):
+        """Возвращает соединение с базой, при первом обращении создаёт схему"""
+        connection = SqliteSerializer._connections.get(filename)
+        if connection is None:
+            # Доступ к соединению упорядочивает вызывающий код (один рабочий поток)
+            connection = sqlite3.connect(filename, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            # Встроенная lower() в SQLite не понимает кириллицу
+            connection.create_function("fold", 1, lambda text: text.lower().replace("ё", "е"), deterministic=True)
+            # Слова текста через пробел (с пробелом в начале) для поиска по началу слова без FTS5
+            connection.create_function("words", 1, lambda text: " " + " ".join(tokenize(text)), deterministic=True)
+            connection.executescript(_SCHEMA)
+            try:
+                connection.executescript(_FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                pass  # SQLite собран без FTS5: поиск выполняется через LIKE
+            SqliteSerializer._connections[filename] = connection
+        return connection
+
+    @staticmethod
+    def close(filename="notes_data.db"):
+        """Закрывает соединение с базой"""
+        connection = SqliteSerializer._connections.pop(filename, None)
+        if connection is not None:
+            connection.close()
+
+    @staticmethod
+    def has_fts(filename="notes_data.db"):
+        """Проверяет, доступна ли таблица полнотекстового поиска"""
+        row = SqliteSerializer.connect(filename).execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'notes_fts'").fetchone()
+        return row is not None
+
+    @staticmethod
+    def save(data, filename="notes_data.db"):
+        """Сохраняет все заметки, заменяя содержимое базы"""
+        connection = SqliteSerializer.connect(filename)
+        with connection:
+            connection.execute("DELETE FROM notes")
+            connection.executemany(_UPSERT, (note.to_dict() for note in data))
+
+    @staticmethod
+    def iter_load(filename="notes_data.db", chunk_size: int = None):
+        """Потоково загружает заметки из базы (генератор) в порядке добавления"""
+        cursor = SqliteSerializer.connect(filename).execute(f"SELECT {_COLUMNS} FROM notes ORDER BY rowid")
+        for row in cursor:
+            yield Note.from_dict(dict(row))
+
+    @staticmethod
+    def load(filename="notes_data.db"):
+        """Загружает все заметки из базы"""
+        return list(SqliteSerializer.iter_load(filename))
+
+    @staticmethod
+    def load_store(filename="notes_data.db"):
+        """Загружает заметки из базы в хранилище заметок"""
+        return NoteStore(SqliteSerializer.iter_load(filename))
+
+    @staticmethod
+    def search_index(notes, filename="notes_data.db"):
+        """Возвращает поисковый индекс, сохранённый рядом с базой, синхронизированный с заметками"""
+        return SearchIndex.for_notes(notes, filename)
+
+    @staticmethod
+    def record_add(note, filename="notes_data.db"):
+        """Добавляет заметку (одна строка таблицы)"""
+        with SqliteSerializer.connect(filename) as connection:
+            connection.execute(_UPSERT, note.to_dict())
+
+    @staticmethod
+    def record_update(note, filename="notes_data.db"):
+        """Обновляет заметку (одна строка таблицы)"""
+        SqliteSerializer.record_add(note, filename)
+
+    @staticmethod
+    def record_delete(note_id, filename="notes_data.db"):
+        """Удаляет заметку по идентификатору"""
+        with SqliteSerializer.connect(filename) as connection:
+            connection.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+
+    @staticmethod
+    def record_many(records, filename="notes_data.db"):
+        """Применяет несколько записей журнального формата в одной транзакции"""
+        with SqliteSerializer.connect(filename) as connection:
+            for record in records:
+                if record["op"] in ("add", "update"):
+                    connection.execute(_UPSERT, record["note"])
+                elif record["op"] == "delete":
+                    connection.execute("DELETE FROM notes WHERE id = ?", (record["id"],))
+
+    @staticmethod
+    def sync(filename="notes_data.db"):
+        """Изменения фиксируются транзакциями SQLite, отдельный сброс на диск не нужен"""
+
+    @staticmethod
+    def needs_compaction(filename="notes_data.db"):
+        """База обновляется построчно, поэтому сворачивать журнал не нужно"""
+        return False
+
+    @staticmethod
+    def query(filename="notes_data.db", text: str = None, categories=None, sort: str = None,
+              descending: bool = False, limit: int = None, offset: int = 0):
+        """
+        Ищет заметки средствами SQL.
+
+        :param filename: Имя файла базы.
+        :param text: Слова для поиска по заголовку и тексту (каждое — как префикс).
+        :param categories: Набор категорий (None — все категории).
+        :param sort: "title", "created_at", "modified_at" или None
+                     (по релевантности при поиске, иначе в порядке добавления).
+        :param descending: Сортировать по убыванию.
+        :param limit: Максимальное количество результатов.
+        :param offset: Смещение для постраничного вывода.
+        :return: list of Note
+        """
+        connection = SqliteSerializer.connect(filename)
+        tables, conditions, params = "notes", [], []
+        order = "notes.rowid"
+        tokens = tokenize(text or "")
+        if tokens and SqliteSerializer.has_fts(filename):
+            tables = "notes JOIN notes_fts ON notes_fts.rowid = notes.rowid"
+            conditions.append("notes_fts MATCH ?")
+            params.append(" ".join('"' + token.replace('"', '""') + '"*' for token in tokens))
+            order = "bm25(notes_fts, 3.0, 1.0)"
+        elif tokens:
+            # Как и запрос FTS "слово"*, каждое слово ищется как начало слова заголовка или текста
+            for token in tokens:
+                conditions.append("(words(notes.title) LIKE ? ESCAPE '\\' OR words(notes.content) LIKE ? ESCAPE '\\')")
+                pattern = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params.extend([f"% {pattern}%"] * 2)
+        if categories is not None:
+            categories = list(categories)
+            conditions.append(f"notes.category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        if sort is not None:
+            order = _SORT_COLUMNS[sort]
+        sql = f"SELECT {_COLUMNS} FROM {tables}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order} {'DESC' if descending else 'ASC'}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+        return [Note.from_dict(dict(row)) for row in connection.execute(sql, params)]
+
+    @staticmethod
+    def count(filename="notes_data.db", category: str = None):
+        """Возвращает количество заметок (всего или в категории)"""
+        connection = SqliteSerializer.connect(filename)
+        if category is None:
+            return connection.execute("SELECT count(*) FROM notes").fetchone()[0]
+        return connection.execute("SELECT count(*) FROM notes WHERE category = ?", (category,)).fetchone()[0]
+
+    @staticmethod
+    def migrate_from_json(json_filename="notes_data.json", filename="notes_data.db"):
+        """
+        Однократно переносит заметки из JSON-файла (со снимком и журналом) в пустую базу.
+        Если в базе уже есть заметки, миграция не выполняется.
+
+        :return: Количество перенесённых заметок.
+        """
+        if SqliteSerializer.count(filename):
+            return 0
+        connection = SqliteSerializer.connect(filename)
+        migrated, batch = 0, []
+        with connection:
+            for note in DataSerializer.iter_load(json_filename):
+                batch.append(note.to_dict())
+                if len(batch) >= SqliteSerializer.BATCH_SIZE:
+                    connection.executemany(_UPSERT, batch)
+                    migrated, batch = migrated + len(batch), []
+            connection.executemany(_UPSERT, batch)
+        return migrated + len(batch)
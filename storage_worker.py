@@ -0,0 +1,220 @@
+import contextlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from data_serializer import DataSerializer
+from note_events import NoteEvent
+from note_journal import NoteJournal
+from profiler import profiler
+
+
+class StorageWorker(QObject):
+    """
+    Фоновая загрузка и сохранение заметок вне потока интерфейса.
+
+    Все операции с файлами выполняются по очереди в одном рабочем потоке,
+    поэтому записи журнала и снимки попадают на диск в порядке изменений.
+    Изменения копятся и записываются одной операцией после паузы
+    SAVE_DELAY_MS, поэтому серия правок приводит к одной записи на диск.
+
+    Если загрузка не удалась, в памяти только часть заметок: снимок из них
+    затёр бы остальные, поэтому после ошибки загрузки снимки не записываются,
+    а изменения только дописываются в журнал.
+    """
+    notes_loaded = pyqtSignal(object)  # Очередная порция загруженных заметок (list of Note)
+    load_finished = pyqtSignal(object)  # Загрузка завершена, передаётся поисковый индекс
+    saved = pyqtSignal()  # Накопленные изменения записаны на диск
+    failed = pyqtSignal(str)  # Ошибка при работе с файлами
+    changes_fetched = pyqtSignal(object)  # Изменения файла другими процессами (для StoreSync.apply)
+
+    SAVE_DELAY_MS = 500  # Пауза после последнего изменения перед записью
+    CHUNK_SIZE = 1000  # Количество заметок в одной порции загрузки
+
+    def __init__(self, filename: str, parent=None, serializer=DataSerializer, sync=None):
+        """
+        Инициализация фонового хранилища.
+
+        :param filename: Имя файла данных.
+        :param parent: Родительский объект Qt.
+        :param serializer: Способ хранения (DataSerializer, SqliteSerializer или ShardedSerializer).
+        :param sync: Синхронизация с другими процессами (StoreSync, только для DataSerializer):
+                     загрузка идёт под блокировкой файла, а снимок не затирает чужие изменения.
+        """
+        super().__init__(parent)
+        self.filename = filename
+        self.serializer = serializer
+        self.sync = sync
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = []  # Записи журнала, ожидающие записи
+        self._snapshot = None  # Заметки для нового снимка, если он запрошен
+        self._covered = []  # Записи журнала, которые содержит запрошенный снимок
+        self._applied = None  # StoreSync.applied в момент запроса снимка
+        self.load_error = None  # Текст ошибки загрузки (пока он задан, снимок не записывается)
+        self._polling = False  # Поставлена ли в очередь проверка изменений других процессов
+        self._unwritten = []  # Записи журнала, которые не удалось записать (повторяются при следующей записи)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SAVE_DELAY_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def load(self):
+        """
+        Запускает загрузку заметок в фоне.
+        Файл читается потоково, и заметки приходят порциями через сигнал notes_loaded
+        по мере чтения; после этого приходит load_finished, а при ошибке — failed
+        (load_error задан, снимки больше не записываются).
+        """
+        self._executor.submit(self._load)
+
+    def _load(self):
+        try:
+            with self.sync.lock() if self.sync else contextlib.nullcontext(), \
+                    profiler.stage("load", file=self.filename):
+                notes, stream = [], iter(self.serializer.iter_load(self.filename))
+                while True:
+                    with profiler.stage("parse"):  # Чтение файла и создание заметок очередной порции
+                        chunk = list(itertools.islice(stream, self.CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    profiler.count("notes_loaded", len(chunk))
+                    notes.extend(chunk)
+                    self.notes_loaded.emit(chunk)
+                if self.sync:
+                    self.sync.loaded()
+                with profiler.stage("search_index"):
+                    search_index = self.serializer.search_index(notes, self.filename)
+            self.load_finished.emit(search_index)
+        except Exception as e:
+            self.load_error = str(e)
+            self.failed.emit(self.load_error)
+
+    def poll(self):
+        """
+        Проверяет в фоне, не изменили ли файл другие процессы (см. StoreSync.fetch).
+        Прочитанные изменения приходят через сигнал changes_fetched и применяются
+        в потоке интерфейса. Пока проверка не выполнена, новая в очередь не ставится.
+        """
+        if self.sync is None or self._polling or self.load_error is not None:
+            return
+        self._polling = True
+        self._executor.submit(self._poll)
+
+    def _poll(self):
+        try:
+            if self.sync.changed():
+                with profiler.stage("sync"):
+                    changes = self.sync.fetch()
+                if changes is not None and (changes[1] or changes[2]):
+                    self.changes_fetched.emit(changes)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self._polling = False
+
+    def record_add(self, note):
+        """
+        Ставит в очередь запись о добавлении заметки.
+        """
+        self._schedule(NoteJournal.add_record(note))
+
+    def record_update(self, note):
+        """
+        Ставит в очередь запись об изменении заметки.
+        """
+        self._schedule(NoteJournal.update_record(note))
+
+    def record_delete(self, note_id: str):
+        """
+        Ставит в очередь запись об удалении заметки.
+        """
+        self._schedule(NoteJournal.delete_record(note_id))
+
+    def apply_events(self, events):
+        """
+        Ставит в очередь записи журнала по событиям хранилища заметок (подписчик NoteStore).
+        Заметки, прочитанные из файла, и изменения других процессов уже сохранены и в журнал не попадают.
+
+        :param events: Список NoteEvent.
+        """
+        for event in events:
+            if event.remote:
+                continue
+            if event.kind == NoteEvent.ADDED:
+                self.record_add(event.note)
+            elif event.kind == NoteEvent.CHANGED:
+                self.record_update(event.note)
+            elif event.kind == NoteEvent.REMOVED:
+                self.record_delete(event.note_id)
+
+    def save_snapshot(self, notes):
+        """
+        Ставит в очередь запись полного снимка.
+        Накопленные записи журнала больше не нужны: снимок уже содержит эти изменения
+        (они записываются, только если снимок отменён, см. StoreSync.save — в том числе
+        если до записи к хранилищу применены изменения другого процесса).
+
+        :param notes: Итерируемый набор заметок.
+        """
+        if self.load_error is not None:
+            return  # Заметки загружены не полностью: записи остаются в очереди журнала
+        self._snapshot = list(notes)
+        self._applied = None if self.sync is None else self.sync.applied
+        self._covered, self._pending = self._covered + self._pending, []
+        self._timer.start()
+
+    def _schedule(self, record: dict):
+        self._pending.append(record)
+        self._timer.start()  # Перезапуск таймера откладывает запись до конца серии правок
+
+    def flush(self):
+        """
+        Немедленно отправляет накопленные изменения в рабочий поток.
+
+        :return: concurrent.futures.Future или None, если записывать нечего.
+        """
+        self._timer.stop()
+        snapshot, covered, records = self._snapshot, self._covered, self._pending
+        self._snapshot, self._covered, self._pending = None, [], []
+        if snapshot is None and not records:
+            return None
+        return self._executor.submit(self._write, snapshot, covered, records, self._applied)
+
+    def _write(self, snapshot, covered, records, applied=None):
+        # Записи, которые не удалось записать раньше, старше запрошенного снимка: он их уже содержит
+        covered, self._unwritten = self._unwritten + covered, []
+        if snapshot is None:
+            covered, records = [], covered + records
+        try:
+            with profiler.stage("save", notes=0 if snapshot is None else len(snapshot), records=len(records)):
+                if snapshot is not None and self.load_error is not None:
+                    records = covered + records  # Снимок запрошен до того, как загрузка завершилась ошибкой
+                elif snapshot is not None:
+                    try:
+                        if self.sync is None:
+                            self.serializer.save(snapshot, self.filename)
+                        elif not self.sync.save(snapshot, applied):
+                            # Другой процесс изменил файл: вместо снимка дописываются свои записи журнала
+                            records = covered + records
+                    except Exception as e:
+                        self.failed.emit(str(e))
+                        records = covered + records  # Снимок не записан: изменения сохраняются журналом
+                self.serializer.record_many(records, self.filename)
+            self.saved.emit()
+        except Exception as e:
+            self._unwritten = records  # Записываются со следующей записью (только в рабочем потоке)
+            self.failed.emit(str(e))
+
+    def shutdown(self):
+        """
+        Записывает накопленные изменения, сбрасывает их на диск
+        и дожидается завершения рабочего потока.
+        """
+        self.flush()
+        self._executor.submit(self._sync)
+        self._executor.shutdown(wait=True)
+
+    def _sync(self):
+        try:
+            self.serializer.sync(self.filename)
+        except Exception as e:
+            self.failed.emit(str(e))
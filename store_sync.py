@@ -0,0 +1,349 @@
+from data_serializer import DataSerializer
+from note import Note
+from note_events import NOTE_FIELDS, NoteEvent
+from note_journal import NoteJournal
+
+
+class SyncConflict:
+    """
+    Конфликт правок одной заметки в этом и другом процессе.
+    """
+    EDITED = "edited"  # Одни и те же поля изменены по-разному: чужая версия сохранена копией
+    DELETED = "deleted"  # Заметку, изменённую здесь, удалили в другом процессе: она сохранена
+    RESTORED = "restored"  # Заметку, удалённую здесь, изменили в другом процессе: она восстановлена
+
+    __slots__ = ("kind", "note_id", "title", "fields", "copy")
+
+    def __init__(self, kind: str, note_id: str, title: str, fields=(), copy=None):
+        """
+        Инициализация описания конфликта.
+
+        :param kind: Вид конфликта (EDITED, DELETED или RESTORED).
+        :param note_id: Идентификатор заметки.
+        :param title: Заголовок заметки.
+        :param fields: Для EDITED — поля, изменённые по-разному.
+        :param copy: Для EDITED — копия с версией другого процесса (Note).
+        """
+        self.kind = kind
+        self.note_id = note_id
+        self.title = title
+        self.fields = tuple(fields)
+        self.copy = copy
+
+    def describe(self):
+        """
+        Возвращает описание конфликта для пользователя.
+
+        :return: str
+        """
+        if self.kind == self.EDITED:
+            return f"«{self.title}»: изменена и здесь, и в другом окне; другая версия сохранена как «{self.copy.title}»."
+        if self.kind == self.DELETED:
+            return f"«{self.title}»: удалена в другом окне, но изменена здесь — заметка сохранена."
+        return f"«{self.title}»: удалена здесь, но изменена в другом окне — заметка восстановлена."
+
+    def __repr__(self):
+        return f"SyncConflict({self.kind!r}, {self.note_id!r}, {self.fields!r})"
+
+
+class StoreSync:
+    """
+    Совместная работа нескольких процессов с одним файлом заметок (DataSerializer).
+
+    Запоминает поколение данных и позицию в журнале, до которых изменения уже
+    применены к хранилищу. poll() читает только записи, дописанные другими
+    процессами после этой позиции (свои записи узнаются по NoteJournal.ORIGIN),
+    и применяет их как изменения remote, которые не пишутся в журнал повторно.
+    Полная перезагрузка нужна, только если другой процесс записал новый снимок
+    (сменилось поколение).
+
+    Для заметок, изменённых здесь после последней синхронизации, хранится их
+    прежняя версия, и чужие правки сливаются по полям (трёхстороннее слияние):
+    поля, изменённые только одной стороной, берутся у неё. Если одно поле
+    изменено по-разному, остаётся своя версия, а чужая сохраняется копией
+    заметки; такие случаи возвращаются как SyncConflict. Итог слияния
+    записывается в журнал, поэтому все процессы приходят к одной версии.
+
+    Чтение файла (fetch) и применение прочитанного к хранилищу (apply) разделены:
+    fetch() выполняет файловые операции и сравнение в рабочем потоке хранилища,
+    хранилище при этом только читается; apply() вносит готовые отличия в потоке
+    интерфейса. poll() делает и то и другое сразу.
+
+    save() сворачивает журнал в снимок, только если после последней
+    синхронизации в файл писал лишь этот процесс — иначе снимок затёр бы чужие правки —
+    и если все прочитанные fetch() чужие изменения были применены к хранилищу до того,
+    как заметки для снимка взяты из него (счётчики fetched и applied): иначе их нет
+    в снимке, а журнал с ними был бы очищен.
+    """
+    COPY_SUFFIX = " (версия из другого окна)"  # Добавляется к заголовку копии при конфликте правок
+
+    def __init__(self, store, filename="notes_data.json"):
+        """
+        Инициализация синхронизации.
+
+        :param store: Хранилище заметок (NoteStore); синхронизация подписывается на его события.
+        :param filename: Имя файла данных.
+        """
+        self.store = store
+        self.filename = filename
+        self.generation = None  # Поколение данных при последней синхронизации
+        self.offset = 0  # Позиция в журнале, до которой записи применены
+        self._bases = {}  # Идентификатор -> словарь заметки до своих правок (None — заметка добавлена здесь)
+        self._unseen = []  # Свои записи, свёрнутые в снимок до того, как их прочитал poll()
+        self.fetched = 0  # Количество прочитанных из файла пакетов чужих изменений
+        self.applied = 0  # Количество пакетов чужих изменений, применённых к хранилищу
+        store.subscribe(self.apply_events)
+
+    def lock(self):
+        """
+        Возвращает межпроцессную блокировку файла данных.
+
+        :return: FileLock
+        """
+        return DataSerializer.lock(self.filename)
+
+    def loaded(self):
+        """
+        Запоминает состояние файла, из которого только что загружены заметки.
+        Вызывается под блокировкой файла, захваченной на время загрузки.
+        """
+        self.generation, self.offset = DataSerializer.version(self.filename)
+
+    def apply_events(self, events):
+        """
+        Запоминает прежние версии заметок, изменённых в этом процессе (подписчик NoteStore).
+
+        :param events: Список NoteEvent.
+        """
+        for event in events:
+            if event.remote or event.kind == NoteEvent.LOADED or event.note_id in self._bases:
+                continue
+            if event.kind == NoteEvent.ADDED:
+                self._bases[event.note_id] = None
+                continue
+            base = self._fields(event.note)
+            for field, (old, new) in event.changes.items():
+                base[field] = old
+            self._bases[event.note_id] = base
+
+    def changed(self):
+        """
+        Дешёвая проверка (без блокировки и чтения журнала): изменился ли файл
+        с последней синхронизации. Свои записи тоже дают True до следующего poll().
+
+        :return: bool
+        """
+        return DataSerializer.version(self.filename) != (self.generation, self.offset)
+
+    def poll(self, timeout: float = 0):
+        """
+        Применяет к хранилищу изменения, записанные другими процессами с последней синхронизации
+        (fetch() и apply() в одном потоке).
+
+        :param timeout: Наибольшее время ожидания блокировки файла (секунды).
+        :return: list of SyncConflict или None, если файл занят (попытку стоит повторить позже).
+        """
+        changes = self.fetch(timeout)
+        return None if changes is None else self.apply(changes)
+
+    def fetch(self, timeout: float = 0):
+        """
+        Читает изменения, записанные другими процессами с последней синхронизации,
+        и сравнивает их с хранилищем, не изменяя его (выполняется в рабочем потоке хранилища).
+
+        :param timeout: Наибольшее время ожидания блокировки файла (секунды).
+        :return: Изменения для apply() или None, если файл занят (попытку стоит повторить позже).
+        """
+        lock = self.lock()
+        if not lock.acquire(timeout):
+            return None
+        try:
+            journal = DataSerializer.journal(self.filename)
+            generation = lock.generation()
+            records, self._unseen = self._unseen, []
+            if generation != self.generation:
+                # Другой процесс записал новый снимок: файл сравнивается с хранилищем целиком
+                journal.refresh()
+                remote, settled = self._reload()
+                self.offset = journal.size()
+            else:
+                tail, self.offset = journal.records_from(self.offset)
+                remote, settled = self._collect(records + tail)
+                if remote:
+                    journal.refresh()
+            self.generation = generation
+        finally:
+            lock.release()
+        if remote:
+            self.fetched += 1
+        return self.fetched, remote, settled
+
+    def apply(self, changes):
+        """
+        Применяет к хранилищу изменения, прочитанные fetch(), сливая их со своими правками
+        (выполняется в потоке интерфейса, в порядке чтения).
+
+        :param changes: Результат fetch().
+        :return: list of SyncConflict
+        """
+        fetched, remote, settled = changes
+        for note_id, data in settled.items():
+            self._settle(note_id, data)
+        self.applied = fetched
+        return self._apply(remote)
+
+    def save(self, notes, applied: int = None):
+        """
+        Записывает снимок, если после последней синхронизации в файл писал только этот процесс.
+
+        :param notes: Итерируемый набор заметок.
+        :param applied: Значение applied в момент, когда заметки для снимка взяты из хранилища
+                        (None — заметки взяты только что).
+        :return: bool — записан ли снимок.
+        """
+        with self.lock():
+            if applied is not None and applied != self.fetched:
+                return False  # Прочитанных из журнала чужих изменений нет в снимке
+            if self.generation != DataSerializer.generation(self.filename):
+                return False
+            records, _ = DataSerializer.journal(self.filename).records_from(self.offset)
+            if any(record.get("origin") != NoteJournal.ORIGIN for record in records):
+                return False
+            DataSerializer.save(notes, self.filename)
+            self._unseen.extend(records)
+            self.generation, self.offset = DataSerializer.version(self.filename)
+        return True
+
+    @staticmethod
+    def _fields(note):
+        return {field: getattr(note, field) for field in NOTE_FIELDS}
+
+    @staticmethod
+    def _collect(records):
+        """
+        Разбирает записи журнала по заметкам: последние чужие версии и свои
+        версии, которые становятся прежними (своя запись перед чужой — прежняя
+        версия для слияния, своя запись без чужих — уже сохранённая правка).
+        """
+        remote, own, before = {}, {}, {}  # Идентификатор -> словарь заметки или None, если она удалена
+        for record in records:
+            op = record.get("op")
+            if op in ("add", "update"):
+                note_id, data = record["note"]["id"], record["note"]
+            elif op == "delete" and "id" in record:
+                note_id, data = record["id"], None
+            else:
+                continue
+            if record.get("origin") == NoteJournal.ORIGIN:
+                own[note_id] = data
+            else:
+                remote[note_id] = data
+                if note_id in own:
+                    before[note_id] = own.pop(note_id)
+        for note_id in remote:
+            if note_id not in before:
+                own.pop(note_id, None)  # Своя запись после чужой сделана без неё: нужно слияние
+        own.update(before)
+        return remote, own
+
+    def _reload(self):
+        """
+        Возвращает отличия файла от хранилища после записи чужого снимка и свои
+        правки, которые уже есть в файле. Хранилище только читается: правки,
+        сделанные за время сравнения, сливаются в apply().
+        """
+        remote, settled, seen = {}, {}, set()
+        for note in DataSerializer.iter_load(self.filename):
+            seen.add(note.id)
+            local = self.store.get(note.id)
+            if local is None or self._fields(local) != self._fields(note):
+                remote[note.id] = note.to_dict()
+            elif note.id in self._bases:
+                settled[note.id] = note.to_dict()  # Версия в файле совпадает со своей: правка уже сохранена
+        for note_id in self.store.ids():
+            if note_id not in seen:
+                remote[note_id] = None
+        return remote, settled
+
+    def _settle(self, note_id, data):
+        """
+        Своя правка заметки прочитана из журнала: прежняя версия больше не нужна,
+        если после неё заметку не меняли.
+        """
+        if note_id not in self._bases:
+            return
+        local = self.store.get(note_id)
+        if (local is None) == (data is None) and (local is None or self._fields(local) == {
+                field: data.get(field) for field in NOTE_FIELDS}):
+            del self._bases[note_id]
+        elif data is not None:
+            self._bases[note_id] = {field: data.get(field) for field in NOTE_FIELDS}
+
+    def _apply(self, remote):
+        """
+        Применяет чужие версии заметок: без своих правок — как есть, со своими — слиянием.
+        """
+        conflicts, merges = [], []
+        with self.store.remote(), self.store.batch():
+            for note_id, data in remote.items():
+                if note_id in self._bases:
+                    merges.append((note_id, data))
+                elif data is not None:
+                    self.store.update(Note.from_dict(data))
+                elif note_id in self.store:
+                    self.store.remove(note_id)
+        with self.store.batch():
+            for note_id, data in merges:
+                conflict = self._merge(note_id, self._bases.pop(note_id), data)
+                if conflict is not None:
+                    conflicts.append(conflict)
+        return conflicts
+
+    def _merge(self, note_id, base, data):
+        """
+        Сливает свою и чужую версии заметки. Итог вносится как своя правка
+        (и попадает в журнал), а прежней версией становится чужая.
+        """
+        local = self.store.get(note_id)
+        if data is None:
+            if local is None:
+                return None  # Удалена в обоих процессах
+            self._touch(local)  # Своя версия должна оказаться в журнале после чужого удаления
+            self._bases[note_id] = None
+            if base is None:
+                return None  # Заметка добавлена здесь и ещё не попала в чужой снимок
+            return SyncConflict(SyncConflict.DELETED, note_id, local.title)
+        theirs = {field: data.get(field) for field in NOTE_FIELDS}
+        if local is None:
+            if theirs == base:
+                self._bases[note_id] = base  # Другой процесс заметку не менял: удаление остаётся в силе
+                return None
+            self.store.add(Note.from_dict(data))
+            self._bases[note_id] = theirs
+            return SyncConflict(SyncConflict.RESTORED, note_id, theirs["title"])
+        mine, merged, fields = self._fields(local), {}, []
+        for field in NOTE_FIELDS:
+            original = None if base is None else base[field]
+            if theirs[field] == original or theirs[field] == mine[field]:
+                merged[field] = mine[field]
+            elif mine[field] == original:
+                merged[field] = theirs[field]
+            else:
+                merged[field] = mine[field]
+                fields.append(field)
+        self._touch(local, merged)
+        self._bases[note_id] = theirs
+        if not fields:
+            return None
+        copy = Note(theirs["title"] + self.COPY_SUFFIX, theirs["content"], theirs["category"])
+        self.store.add(copy)
+        return SyncConflict(SyncConflict.EDITED, note_id, local.title, fields, copy)
+
+    @staticmethod
+    def _touch(note, values=None):
+        """
+        Записывает поля заметки заново (своя правка), чтобы её версия попала в журнал последней.
+        """
+        values = values or StoreSync._fields(note)
+        for field in NOTE_FIELDS:
+            setattr(note, field, values[field])
@@ -0,0 +1,81 @@
+import os
+import pytest
+from note import Note
+from note_journal import NoteJournal
+from data_serializer import DataSerializer
+from atomic_file import AtomicFile, DURABILITY_ALWAYS, DURABILITY_BATCHED, DURABILITY_NONE, backup_path
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    """Тест: ошибка во время записи не затрагивает прежний файл и не оставляет временных файлов."""
+    path = str(tmp_path / "data.json")
+    with open(path, 'w') as file:
+        file.write("old")
+    with pytest.raises(RuntimeError):
+        with AtomicFile(path) as temp:
+            with open(temp, 'w') as file:
+                file.write("new, но оборванный")
+            raise RuntimeError("сбой")
+    with open(path) as file:
+        assert file.read() == "old"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_backups_are_rotated(tmp_path):
+    """Тест ротации резервных копий: хранится не больше заданного количества прежних версий."""
+    path = str(tmp_path / "data.json")
+    for version in range(4):
+        with AtomicFile(path, DURABILITY_NONE, backups=2) as temp:
+            with open(temp, 'w') as file:
+                file.write(str(version))
+    contents = []
+    for name in (path, backup_path(path, 1), backup_path(path, 2)):
+        with open(name) as file:
+            contents.append(file.read())
+    assert contents == ["3", "2", "1"]
+    assert not os.path.exists(backup_path(path, 3))
+
+
+def test_damaged_file_prefix_is_salvaged(tmp_path):
+    """Тест восстановления уцелевшей начальной части оборванного файла."""
+    path = str(tmp_path / "notes.json")
+    notes = [Note(f"Заметка {i}", "Текст") for i in range(5)]
+    DataSerializer.save_to_file(notes, path)
+    with open(path, 'rb+') as file:
+        file.truncate(os.path.getsize(path) * 2 // 3)
+
+    titles = [note.title for note in DataSerializer.load(path)]
+    assert 0 < len(titles) < 5
+    assert titles == [note.title for note in notes[:len(titles)]]
+    assert [note.title for note in DataSerializer.iter_load(path)] == titles
+    assert os.path.exists(path + DataSerializer.DAMAGED_SUFFIX)
+
+
+def test_backup_used_when_nothing_salvaged(tmp_path, monkeypatch):
+    """Тест загрузки из резервной копии, если повреждённый файл не содержит ни одной целой заметки."""
+    monkeypatch.setattr(DataSerializer, "BACKUP_COUNT", 1)
+    path = str(tmp_path / "notes.json")
+    DataSerializer.save_to_file([Note("Старая", "Текст")], path)
+    DataSerializer.save_to_file([Note("Новая", "Текст")], path)
+    with open(path, 'w') as file:
+        file.write("[{\"title\": ")
+
+    assert [note.title for note in DataSerializer.load(path)] == ["Старая"]
+
+
+@pytest.mark.parametrize("durability, expected", [
+    (DURABILITY_ALWAYS, 3),
+    (DURABILITY_BATCHED, 0),
+    (DURABILITY_NONE, 0),
+])
+def test_journal_durability_modes(tmp_path, monkeypatch, durability, expected):
+    """Тест количества вызовов fsync журнала в разных режимах надёжности."""
+    calls = []
+    monkeypatch.setattr(os, "fsync", calls.append)
+    journal = NoteJournal(str(tmp_path / "notes.json"), durability)
+    journal._last_sync = float("inf")  # Интервал пакетного сброса ещё не истёк
+    for _ in range(3):
+        journal.append(NoteJournal.delete_record("id"))
+    assert len(calls) >= expected if expected else not calls
+    journal.sync()
+    assert bool(calls) == (durability != DURABILITY_NONE)
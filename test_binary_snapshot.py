@@ -0,0 +1,119 @@
+import os
+import struct
+import pytest
+from note import Note
+from data_serializer import DataSerializer
+from binary_snapshot import BinarySnapshot, MAGIC
+from note_body import BodyFile
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """Путь к временному файлу снимка."""
+    return str(tmp_path / "notes.bin")
+
+
+def test_binary_roundtrip(data_file):
+    """Тест сохранения и загрузки двоичного снимка."""
+    notes = [Note("Заголовок", "Текст с ё и emoji 🙂", category="Дом"), Note("B", "", category="Своя")]
+    BinarySnapshot.save(notes, data_file)
+
+    assert BinarySnapshot.is_binary(data_file)
+    items = list(BinarySnapshot.iter_items(data_file))
+    restored = [Note.from_dict(item) for item in items]
+    assert [note.to_dict() for note in restored] == [note.to_dict() for note in notes]
+
+
+def test_dates_with_time_zone(data_file):
+    """Тест: даты с часовым поясом (например, из старого импорта) записываются в местном времени."""
+    note = Note.from_dict({"id": "n1", "title": "A", "content": "", "category": "Дом",
+                           "created_at": "2024-01-01T10:00:00+03:00", "modified_at": "2024-01-01T10:00:00+00:00"})
+    BinarySnapshot.save([note], data_file)
+
+    item = next(BinarySnapshot.iter_items(data_file))
+    assert item["created_at"] == note.created_at.astimezone().replace(tzinfo=None)
+    assert item["modified_at"] == note.modified_at.astimezone().replace(tzinfo=None)
+
+
+def test_load_detects_format(data_file, tmp_path):
+    """Тест автоматического определения формата при загрузке и применения журнала."""
+    notes = [Note("A", "Content"), Note("B", "Content")]
+    DataSerializer.save_to_file(notes, data_file, binary=True)
+    DataSerializer.record_delete(notes[0].id, data_file)
+    assert [note.title for note in DataSerializer.load(data_file)] == ["B"]
+    assert [note.title for note in DataSerializer.iter_load(data_file)] == ["B"]
+
+    json_file = str(tmp_path / "export.json")
+    DataSerializer.export_json(notes, json_file)
+    assert not BinarySnapshot.is_binary(json_file)
+    assert [note.title for note in DataSerializer.load(json_file)] == ["A", "B"]
+
+
+def test_unsupported_version_is_rejected(data_file):
+    """Тест отказа читать снимок более новой версии."""
+    with open(data_file, "wb") as file:
+        file.write(struct.pack("<8sHHII", MAGIC, 999, 0, 0, 0))
+    with pytest.raises(ValueError):
+        list(BinarySnapshot.iter_items(data_file))
+
+
+def test_lazy_content_is_read_on_demand(data_file):
+    """Тест ленивой загрузки: в памяти только заголовки, тексты читаются из файла через кэш."""
+    notes = [Note(f"Заметка {i}", f"Текст {i} ё" * 10) for i in range(5)]
+    BinarySnapshot.save(notes, data_file)
+    restored = [Note.from_dict(item) for item in BinarySnapshot.iter_items(data_file, lazy=True, cache_size=2)]
+    body_file = restored[0]._content.source
+
+    assert not any(note.content_loaded for note in restored)
+    assert [note.to_dict() for note in restored] == [note.to_dict() for note in notes]
+    restored[4].content
+    assert (body_file.hits, body_file.misses) == (1, 5)
+    restored[0].content
+    assert body_file.misses == 6  # Вытеснена из кэша размером 2
+
+    restored[1].content = "Новый текст"
+    assert restored[1].content_loaded and restored[1].content == "Новый текст"
+
+
+def test_lazy_content_survives_snapshot_replace(data_file):
+    """Тест: тексты читаются из прежнего снимка после его атомарной замены новым."""
+    DataSerializer.save_to_file([Note("A", "Первый текст")], data_file, binary=True)
+    (note,) = DataSerializer.load(data_file)
+    assert not note.content_loaded
+
+    DataSerializer.save_to_file([Note("B", "Другой снимок")], data_file, binary=True)
+    assert note.content == "Первый текст"
+
+
+def test_snapshot_is_not_mapped_while_replaced(data_file, monkeypatch):
+    """Тест: при замене снимка его отображение закрыто (как нужно на Windows), тексты переходят в новый снимок."""
+    DataSerializer.save_to_file([Note("A", "Первый"), Note("B", "Второй ё")], data_file, binary=True)
+    kept, dropped = DataSerializer.load(data_file)
+    old_source = kept.body.source
+    replace = os.replace
+
+    def checked_replace(source, target):
+        assert target != data_file or old_source.view is None
+        replace(source, target)
+
+    monkeypatch.setattr(os, "replace", checked_replace)
+    DataSerializer.save_to_file([Note("C", "Новый"), kept], data_file, binary=True)
+
+    assert not kept.content_loaded and kept.body.source.filename == data_file
+    assert kept.content == "Первый"
+    assert dropped.body.source.filename is None and dropped.content == "Второй ё"
+    assert [note.content for note in DataSerializer.load(data_file)] == ["Новый", "Первый"]
+
+
+def test_lazy_content_after_failed_replace(data_file, monkeypatch):
+    """Тест: если заменить снимок не удалось, тексты читаются из прежнего файла."""
+    DataSerializer.save_to_file([Note("A", "Первый")], data_file, binary=True)
+    (note,) = DataSerializer.load(data_file)
+
+    def failed_replace(source, target):
+        raise PermissionError(target)
+
+    monkeypatch.setattr(os, "replace", failed_replace)
+    with pytest.raises(PermissionError):
+        DataSerializer.save_to_file([note, Note("B", "Другой")], data_file, binary=True)
+    assert note.content == "Первый"
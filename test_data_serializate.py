@@ -1,7 +1,11 @@
 import pytest
 import json
+import os
 import datetime
+import types
 from note import Note
+from data_serializer import DataSerializer
+from compressed_file import COMPRESSION_MODES, detect
 
 
 def test_note_serialization():
@@ -89,3 +93,129 @@ def test_note_category_change():
 
     # Проверки
     assert note.category == "Здоровье и Спорт"
+
+
+def test_streaming_load_yields_notes_lazily(tmp_path):
+    """
+    Тест потоковой загрузки: заметки читаются по одной маленькими порциями.
+    """
+    filename = str(tmp_path / "notes.json")
+    notes = [Note(f"Title {i}", "Содержимое " * i, category="Работа") for i in range(50)]
+    DataSerializer.save(notes, filename)
+
+    loaded = DataSerializer.iter_load(filename, chunk_size=64)
+    assert isinstance(loaded, types.GeneratorType)
+    assert next(loaded).title == "Title 0"
+    assert [note.id for note in loaded] == [note.id for note in notes[1:]]
+
+
+def test_streaming_load_applies_journal(tmp_path):
+    """
+    Тест потоковой загрузки с применением журнала изменений.
+    """
+    filename = str(tmp_path / "notes.json")
+    notes = [Note("A", "Content"), Note("B", "Content"), Note("C", "Content")]
+    DataSerializer.save(notes, filename)
+    added = Note("D", "Content")
+    DataSerializer.record_add(added, filename)
+    notes[1].title = "B2"
+    DataSerializer.record_update(notes[1], filename)
+    DataSerializer.record_delete(notes[0].id, filename)
+
+    streamed = [note.title for note in DataSerializer.iter_load(filename, chunk_size=16)]
+    assert streamed == ["B2", "C", "D"]
+    assert streamed == [note.title for note in DataSerializer.load(filename)]
+
+
+def test_streaming_load_of_damaged_file_keeps_prefix(tmp_path):
+    """
+    Тест потоковой загрузки оборванного файла: прочитанные заметки сохраняются.
+    """
+    filename = str(tmp_path / "notes.json")
+    DataSerializer.save([Note("A", "Content"), Note("B", "Content")], filename)
+    with open(filename, encoding="utf-8") as file:
+        text = file.read()
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(text[:text.rindex('"title"')])
+
+    assert [note.title for note in DataSerializer.iter_load(filename)] == ["A"]
+    assert list(DataSerializer.iter_load(str(tmp_path / "missing.json"))) == []
+
+
+def test_incremental_save_encodes_only_changed_notes(tmp_path):
+    """
+    Тест снимка с кэшем фрагментов: кодируются только изменённые заметки, файл совпадает с json.dump.
+    """
+    filename = str(tmp_path / "notes.json")
+    notes = [Note(f"Заметка {number}", "Текст\n\"в кавычках\"") for number in range(5)]
+    DataSerializer.save(notes, filename)
+    fragments = DataSerializer.fragments(filename)
+    assert (fragments.hits, fragments.misses) == (0, 5)
+
+    notes[2].title = "Изменена"
+    del notes[4]
+    DataSerializer.save(notes, filename)
+    assert (fragments.hits, fragments.misses) == (3, 1)
+    assert len(fragments) == 4
+    with open(filename, encoding="utf-8") as file:
+        assert file.read() == json.dumps([note.to_dict() for note in notes], ensure_ascii=False, indent=4)
+
+
+def test_mark_changed_reencodes_notes(tmp_path):
+    """
+    Тест отметки изменений: заметка с той же датой изменения кодируется заново после mark_changed или записи журнала.
+    """
+    filename = str(tmp_path / "notes.json")
+    note = Note("A", "Content")
+    DataSerializer.save([note], filename)
+    replaced = Note.from_dict(dict(note.to_dict(), title="B"))  # Та же дата изменения
+
+    DataSerializer.mark_changed([note.id], filename)
+    DataSerializer.save([replaced], filename)
+    assert [item.title for item in DataSerializer.load(filename)] == ["B"]
+
+    again = Note.from_dict(dict(note.to_dict(), title="C"))
+    DataSerializer.record_many([{"op": "update", "note": again.to_dict()}], filename)
+    DataSerializer.save([again], filename)
+    assert [item.title for item in DataSerializer.load(filename)] == ["C"]
+    assert DataSerializer.fragments(filename).misses == 1
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSION_MODES))
+def test_compressed_snapshot_roundtrip(tmp_path, monkeypatch, compression):
+    """
+    Тест сжатого снимка: формат распознаётся при загрузке по первым байтам, журнал применяется как обычно.
+    """
+    filename = str(tmp_path / "notes.json")
+    notes = [Note(f"Заметка {number}", "Повторяющийся текст заметки. " * 20, category="Работа") for number in range(50)]
+    DataSerializer.save(notes, filename)
+    plain_size = os.path.getsize(filename)
+
+    monkeypatch.setattr(DataSerializer, "COMPRESSION", compression)
+    DataSerializer.save(notes, filename)
+    assert detect(filename) == compression
+    assert os.path.getsize(filename) < plain_size // 10
+    DataSerializer.record_delete(notes[0].id, filename)
+
+    monkeypatch.setattr(DataSerializer, "COMPRESSION", None)  # Формат задаётся файлом, а не настройкой
+    loaded = list(DataSerializer.iter_load(filename, chunk_size=100))
+    assert [note.to_dict() for note in loaded] == [note.to_dict() for note in notes[1:]]
+
+
+def test_truncated_compressed_snapshot_keeps_prefix(tmp_path, monkeypatch):
+    """
+    Тест оборванного сжатого снимка: загружаются уцелевшие заметки, копия файла сохраняется.
+    """
+    filename = str(tmp_path / "notes.json")
+    monkeypatch.setattr(DataSerializer, "COMPRESSION", "zlib")
+    notes = [Note(f"Заметка {number}", f"Текст {number} " * 200) for number in range(200)]
+    DataSerializer.save(notes, filename)
+    with open(filename, "rb") as file:
+        data = file.read()
+    with open(filename, "wb") as file:
+        file.write(data[:len(data) // 2])
+
+    loaded = DataSerializer.load(filename)
+    assert 0 < len(loaded) < len(notes)
+    assert [note.id for note in loaded] == [note.id for note in notes[:len(loaded)]]
+    assert os.path.exists(filename + DataSerializer.DAMAGED_SUFFIX)
@@ -0,0 +1,46 @@
+from note import Note
+from note_store import NoteStore
+from note_list_model import NoteListModel
+from data_serializer import DataSerializer
+from first_screen import FirstScreen
+
+
+def test_roundtrip_and_stale_source(tmp_path):
+    """Тест сохранения первого экрана и отказа от заголовков после изменения файла данных."""
+    path = str(tmp_path / "notes.json")
+    notes = [Note("Бета", "Текст", category="Работа"), Note("Альфа", "Текст", category="Работа")]
+    DataSerializer.save_to_file(notes, path)
+    FirstScreen.save(path, {"category": "Работа", "sort": "title"}, notes[::-1])
+
+    view, cached = FirstScreen.load(path)
+    assert view == {"category": "Работа", "sort": "title"}
+    assert [(note.id, note.title, note.created_at) for note in cached] == \
+        [(note.id, note.title, note.created_at) for note in notes[::-1]]
+
+    DataSerializer.record_delete(notes[0].id, path)  # Журнал изменился: заголовки устарели
+    assert FirstScreen.load(path) == (view, [])
+
+
+def test_missing_or_damaged_cache(tmp_path):
+    """Тест: отсутствующий или повреждённый кэш не мешает запуску."""
+    path = str(tmp_path / "notes.json")
+    assert FirstScreen.load(path) is None
+    with open(path + FirstScreen.SUFFIX, "w", encoding="utf-8") as file:
+        file.write("{оборван")
+    assert FirstScreen.load(path) is None
+
+
+def test_model_preview_until_refresh():
+    """Тест: модель показывает первый экран, не добавляет строки загрузки и заменяет его при пересчёте."""
+    store = NoteStore()
+    model = NoteListModel(store)
+    store.subscribe(model.apply_events)
+    preview = [Note("Из кэша", "")]
+    model.show_preview(preview)
+    assert model.previewing
+    assert model.data(model.index(0)).startswith("Из кэша")
+
+    store.load([Note("Загружена", "Текст"), Note("Ещё", "Текст")])
+    assert model.rowCount() == 1
+    model.refresh()
+    assert not model.previewing and model.rowCount() == 2
@@ -63,6 +63,7 @@ def test_note_to_dict():
     note = Note("Title", "Content", category="Люди")
     note_dict = note.to_dict()
 
+    assert note_dict["id"] == note.id
     assert note_dict["title"] == "Title"
     assert note_dict["content"] == "Content"
     assert note_dict["category"] == "Люди"
@@ -86,3 +87,38 @@ def test_note_from_dict():
     assert note.category == "Финансы"
     assert note.created_at.isoformat() == note_data["created_at"]
     assert note.modified_at.isoformat() == note_data["modified_at"]
+
+
+def test_note_id_is_unique_and_persistent():
+    """Тест уникальности и сохранения идентификатора заметки."""
+    first = Note("Title", "Content")
+    second = Note("Title", "Content")
+    assert first.id != second.id
+
+    restored = Note.from_dict(first.to_dict())
+    assert restored.id == first.id
+
+    # Заметка из словаря без идентификатора получает новый
+    data = first.to_dict()
+    del data["id"]
+    assert Note.from_dict(data).id
+
+
+def test_note_is_compact():
+    """Тест компактного представления: без __dict__, с общими строками категорий."""
+    note = Note("Title", "Content", category="".join(["Раб", "ота"]))
+    assert not hasattr(note, "__dict__")
+    assert note.category is Note("Other", "Content", category="Работа").category
+
+
+def test_note_from_dict_parses_dates_lazily():
+    """Тест ленивого разбора дат при десериализации."""
+    created = "2024-12-14T17:23:00.790568"
+    note = Note.from_dict({"id": "abc", "title": "Title", "content": "Content",
+                           "created_at": created, "modified_at": created})
+
+    # Сериализация обратно не требует разбора дат
+    assert note.to_dict()["created_at"] == created
+    assert note.created_at_iso == created
+    assert note.created_at == datetime.datetime.fromisoformat(created)
+    assert note.modified_at_iso == created
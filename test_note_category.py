@@ -0,0 +1,87 @@
+from note import Note
+from note_store import NoteStore
+from note_category import CategoryIndex
+from note_events import NoteEvent
+from note_list_model import NoteFilter
+
+
+def make_notes():
+    notes = [Note("Бета", "Текст", category="Работа"), Note("Альфа", "Текст", category="Дом"),
+             Note("Гамма", "Текст", category="Работа"), Note("Альфа", "Текст", category="Работа")]
+    for day, note in enumerate(notes, start=1):
+        note._created_at = f"2024-01-0{day}T00:00:00"
+    return notes
+
+
+def test_counts_and_sorted_buckets():
+    """Тест количества заметок и порядка заметок внутри категории."""
+    notes = make_notes()
+    index = CategoryIndex(notes)
+
+    assert index.count() == 4
+    assert index.count("Работа") == 3
+    assert index.count("Финансы") == 0
+    assert index.counts()["Дом"] == 1
+    assert index.ids("Работа") == [notes[0].id, notes[2].id, notes[3].id]
+    assert index.ids("Работа", "created_at", descending=True) == [notes[3].id, notes[2].id, notes[0].id]
+    assert [note.title for note in index.category("Работа").sorted_notes("title")] == ["Альфа", "Бета", "Гамма"]
+
+
+def test_setters_update_index():
+    """Тест: смена категории и заголовка через свойства заметки сразу обновляет индекс, подписанный на хранилище."""
+    notes = make_notes()
+    store = NoteStore(notes)
+    index = CategoryIndex(store)
+    store.subscribe(index.apply_events)
+
+    notes[0].category = "Дом"
+    assert index.count("Работа") == 2
+    assert index.ids("Дом") == [notes[0].id, notes[1].id]
+
+    notes[2].title = "Аист"
+    assert index.ids("Работа", "title") == [notes[2].id, notes[3].id]
+
+    store.remove(notes[3].id)
+    notes[3].category = "Финансы"  # Заметка больше не в хранилище
+    assert index.count("Финансы") == 0
+    assert index.count() == 3
+
+
+def test_remove_after_date_is_parsed():
+    """Тест удаления заметки, строка даты которой изменилась после разбора (не каноническая дата ISO)."""
+    note = Note.from_dict({"id": "n1", "title": "Альфа", "content": "", "category": "Дом",
+                           "created_at": "2024-01-01", "modified_at": "2024-01-01"})
+    index = CategoryIndex([note])
+    note.created_at  # Разбор даты: created_at_iso становится "2024-01-01T00:00:00"
+
+    index.remove(note.id)
+    assert index.ids("Дом") == [] and index.count("Дом") == 0
+
+
+def test_filter_uses_category_index():
+    """Тест выбора категории через индекс категорий в фильтре списка."""
+    notes = make_notes()
+    index = CategoryIndex(notes)
+    note_filter = NoteFilter()
+    note_filter.category = "Работа"
+    note_filter.sort_key = "title"
+
+    assert note_filter.apply(None, categories=index) == [notes[3].id, notes[0].id, notes[2].id]
+
+
+def test_loaded_notes_are_added_in_bulk():
+    """Тест: загрузка пачкой даёт тот же порядок, что и добавление по одной, и заменяет уже добавленные заметки."""
+    notes = make_notes()
+    index = CategoryIndex([notes[0]])
+    notes[0].category = "Дом"  # Перезагрузка той же заметки в другой категории
+    index.apply_events([NoteEvent(NoteEvent.LOADED, note) for note in notes + [notes[2]]])
+
+    expected = CategoryIndex()
+    for note in notes:
+        expected.add(note)
+    assert index.counts() == expected.counts() and index.count() == 4
+    for name in ("Работа", "Дом"):
+        for key in ("created_at", "title"):
+            assert index.ids(name, key) == expected.ids(name, key)
+    index.remove(notes[0].id)
+    assert index.ids("Дом", "title") == [notes[1].id]
@@ -0,0 +1,131 @@
+import datetime
+import csv
+import json
+from data_serializer import DataSerializer
+from note_cli import _check_item, main
+
+
+def make_inputs(directory):
+    directory.mkdir()
+    (directory / "notes.json").write_text(json.dumps([
+        {"title": "Ремонт кухни", "content": "Купить плитку", "category": "Дом",
+         "created_at": "2024-03-01T10:00:00"},
+        {"title": "", "content": "Без заголовка"},
+    ], ensure_ascii=False), encoding="utf-8")
+    with open(directory / "notes.csv", "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, ["title", "content", "category", "created_at"])
+        writer.writeheader()
+        writer.writerow({"title": "Отчёт", "content": "Квартальный", "category": "Работа",
+                         "created_at": "2024-05-10T09:00:00"})
+    (directory / "Финансы").mkdir()
+    (directory / "Финансы" / "налоги.md").write_text("# Налоги\n\nПодать декларацию\n", encoding="utf-8")
+
+
+def test_import_from_directory(tmp_path, capsys):
+    """Тест импорта каталога JSON, CSV и Markdown с пропуском заметок без заголовка."""
+    make_inputs(tmp_path / "in")
+    path = str(tmp_path / "notes.json")
+    assert main(["--file", path, "import", str(tmp_path / "in"), "--batch-size", "2"]) == 0
+    assert "пропущено: 1" in capsys.readouterr().out
+
+    notes = {note.title: note for note in DataSerializer.load(path)}
+    assert set(notes) == {"Ремонт кухни", "Отчёт", "Налоги"}
+    assert notes["Налоги"].category == "Финансы"
+    assert notes["Налоги"].content == "Подать декларацию"
+    assert notes["Отчёт"].created_at_iso == "2024-05-10T09:00:00"
+
+
+def test_import_skips_unreadable_files(tmp_path, capsys):
+    """Тест: испорченный файл пропускается с сообщением, остальные файлы импортируются."""
+    make_inputs(tmp_path / "in")
+    (tmp_path / "in" / "broken.json").write_text('[{"title": "Обрыв"', encoding="utf-8")
+    (tmp_path / "in" / "wrapped.json").write_text(json.dumps({"notes": [{"title": "Обёртка"}]}), encoding="utf-8")
+    path = str(tmp_path / "notes.json")
+    for workers in ("1", "2"):
+        assert main(["--file", path, "import", str(tmp_path / "in"), "--workers", workers]) == 1
+        output = capsys.readouterr()
+        assert "broken.json: файл не прочитан" in output.err
+        assert "не прочитано файлов: 1" in output.out
+    titles = [note.title for note in DataSerializer.load(path)]
+    assert sorted(set(titles)) == ["Налоги", "Обёртка", "Отчёт", "Ремонт кухни"]
+
+
+def test_import_normalizes_dates_and_ids():
+    """Тест: даты импорта приводятся к виду ISO приложения, идентификатор — к строке."""
+    item = _check_item({"id": 5, "title": "Отчёт", "created_at": "2024-01-01", "modified_at": "2024-01-02 10:30"})
+    assert item["id"] == "5"
+    assert (item["created_at"], item["modified_at"]) == ("2024-01-01T00:00:00", "2024-01-02T10:30:00")
+    assert _check_item({"title": "Отчёт", "created_at": "01.01.2024"}) is None
+    aware = _check_item({"title": "Отчёт", "created_at": "2024-01-01T10:00:00+03:00"})["created_at"]
+    assert datetime.datetime.fromisoformat(aware) == \
+        datetime.datetime(2024, 1, 1, 7, tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def test_import_with_workers(tmp_path):
+    """Тест: разбор в нескольких процессах даёт тот же результат и порядок."""
+    make_inputs(tmp_path / "in")
+    path = str(tmp_path / "notes.json")
+    assert main(["--file", path, "import", str(tmp_path / "in"), "--workers", "2", "--category", "Разное"]) == 0
+    notes = DataSerializer.load(path)
+    assert [note.title for note in notes] == ["Отчёт", "Ремонт кухни", "Налоги"]
+    assert {note.category for note in notes} == {"Разное"}
+
+
+def test_edit_by_query(tmp_path, capsys):
+    """Тест массового изменения и удаления заметок по запросу."""
+    make_inputs(tmp_path / "in")
+    path = str(tmp_path / "notes.json")
+    main(["--file", path, "import", str(tmp_path / "in")])
+
+    assert main(["--file", path, "edit", "--text", "плитку", "--set-category", "Финансы", "--dry-run"]) == 0
+    assert "Подходит заметок: 1" in capsys.readouterr().out
+    assert main(["--file", path, "edit", "--text", "плитку", "--set-category", "Финансы"]) == 0
+    assert {note.title: note.category for note in DataSerializer.load(path)}["Ремонт кухни"] == "Финансы"
+
+    assert main(["--file", path, "edit", "--category", "Финансы", "--to", "2024-03-01", "--delete"]) == 0
+    assert sorted(note.title for note in DataSerializer.load(path)) == ["Налоги", "Отчёт"]
+    assert main(["--file", path, "edit", "--delete"]) == 2
+
+
+def test_export_markdown_stays_in_directory(tmp_path):
+    """Тест: идентификаторы с разделителями пути не выводят файлы Markdown за пределы каталога."""
+    source = tmp_path / "in.json"
+    source.write_text(json.dumps([{"id": "../escaped", "title": "Побег"}, {"id": "..", "title": "Точки"},
+                                  {"id": "_escaped", "title": "Двойник"}], ensure_ascii=False), encoding="utf-8")
+    path = str(tmp_path / "notes.json")
+    main(["--file", path, "import", str(source)])
+    assert main(["--file", path, "export", str(tmp_path / "md"), "--format", "md"]) == 0
+    assert not (tmp_path / "escaped.md").exists()
+    names = sorted(file.name for file in (tmp_path / "md").iterdir())
+    assert len(names) == 3 and "escaped.md" in names
+    assert not [file for file in tmp_path.iterdir() if file.suffix == ".md"]
+
+
+def test_export_and_stats(tmp_path, capsys):
+    """Тест выгрузки в JSON, CSV и Markdown и сводки по файлу."""
+    make_inputs(tmp_path / "in")
+    path = str(tmp_path / "notes.json")
+    main(["--file", path, "import", str(tmp_path / "in")])
+
+    main(["--file", path, "export", str(tmp_path / "all.json")])
+    exported = json.loads((tmp_path / "all.json").read_text(encoding="utf-8"))
+    assert [item["title"] for item in exported] == [note.title for note in DataSerializer.load(path)]
+
+    main(["--file", path, "export", str(tmp_path / "work.csv"), "--category", "Работа"])
+    with open(tmp_path / "work.csv", encoding="utf-8", newline="") as file:
+        assert [row["title"] for row in csv.DictReader(file)] == ["Отчёт"]
+
+    main(["--file", path, "export", str(tmp_path / "md"), "--format", "md"])
+    capsys.readouterr()
+    reimported = str(tmp_path / "again.json")
+    main(["--file", reimported, "import", str(tmp_path / "md")])
+    assert sorted((note.title, note.category, note.content) for note in DataSerializer.load(reimported)) == \
+        sorted((note.title, note.category, note.content) for note in DataSerializer.load(path))
+
+    capsys.readouterr()
+    assert main(["--file", path, "stats", "--json"]) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["notes"] == 3
+    assert stats["categories"] == {"Дом": 1, "Работа": 1, "Финансы": 1}
+    assert stats["created_from"] == "2024-03-01T10:00:00"
+    assert stats["journal_records"] == 3 and stats["journal_bytes"] > 0
@@ -0,0 +1,68 @@
+from note import Note
+from note_store import NoteStore
+from note_events import NoteEvent
+
+
+def test_note_observer_receives_old_and_new_values():
+    """Тест подписки на изменения полей заметки."""
+    note = Note("Title", "Content")
+    changes = []
+    callback = lambda changed, field, old, new: changes.append((changed, field, old, new))
+    note.subscribe(callback)
+    note.title = "New"
+    note.unsubscribe(callback)
+    note.content = "Ignored"
+
+    assert changes == [(note, "title", "Title", "New")]
+
+
+def test_store_events():
+    """Тест событий хранилища о добавлении, изменении и удалении заметок."""
+    store = NoteStore()
+    received = []
+    store.subscribe(received.append)
+    note = Note("Title", "Content")
+    store.add(note)
+    note.category = "Дом"
+    store.remove(note.id)
+    note.title = "После удаления"  # Заметка уже не в хранилище
+
+    assert [[(event.kind, event.note_id) for event in events] for events in received] == [
+        [(NoteEvent.ADDED, note.id)], [(NoteEvent.CHANGED, note.id)], [(NoteEvent.REMOVED, note.id)]]
+    assert received[1][0].changes == {"category": ("Разное", "Дом")}
+
+
+def test_batch_emits_one_coalesced_event():
+    """Тест пакета изменений: подписчики получают один объединённый список событий."""
+    edited, removed = Note("Title", "Content"), Note("Gone", "Content")
+    store = NoteStore([edited, removed])
+    received = []
+    store.subscribe(received.append)
+    with store.batch():
+        edited.title = "Middle"
+        edited.title = "Final"
+        edited.content = "New content"
+        temporary = Note("Temporary", "Content")
+        store.add(temporary)
+        store.remove(temporary.id)
+        store.remove(removed.id)
+        assert received == []
+
+    assert len(received) == 1
+    events = received[0]
+    assert [(event.kind, event.note_id) for event in events] == [
+        (NoteEvent.CHANGED, edited.id), (NoteEvent.REMOVED, removed.id)]
+    assert events[0].changes == {"title": ("Title", "Final"), "content": ("Content", "New content")}
+
+
+def test_load_emits_loaded_events_once():
+    """Тест загрузки порции заметок: одно событие-список, известные заметки пропускаются."""
+    known = Note("Known", "Content")
+    store = NoteStore([known])
+    received = []
+    store.subscribe(received.append)
+    fresh = Note("Fresh", "Content")
+
+    assert store.load([known, fresh]) == [fresh]
+    assert [[(event.kind, event.note_id) for event in events] for events in received] == [
+        [(NoteEvent.LOADED, fresh.id)]]
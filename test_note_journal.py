@@ -0,0 +1,89 @@
+import pytest
+import json
+from note import Note
+from data_serializer import DataSerializer
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """Путь к временному файлу данных."""
+    return str(tmp_path / "notes.json")
+
+
+def test_journal_replay_after_snapshot(data_file):
+    """Тест восстановления заметок из снимка и журнала."""
+    notes = [Note("A", "Content A"), Note("B", "Content B")]
+    DataSerializer.save(notes, data_file)
+
+    added = Note("C", "Content C", category="Дом")
+    DataSerializer.record_add(added, data_file)
+    notes[0].title = "A2"
+    DataSerializer.record_update(notes[0], data_file)
+    DataSerializer.record_delete(notes[1].id, data_file)
+
+    loaded = DataSerializer.load(data_file)
+    assert [note.title for note in loaded] == ["A2", "C"]
+    assert loaded[1].category == "Дом"
+
+
+def test_journal_appends_without_rewriting_snapshot(data_file):
+    """Тест того, что изменения не перезаписывают файл снимка."""
+    DataSerializer.save([Note("A", "Content A")], data_file)
+    with open(data_file, encoding="utf-8") as file:
+        snapshot = file.read()
+
+    DataSerializer.record_add(Note("B", "Content B"), data_file)
+
+    with open(data_file, encoding="utf-8") as file:
+        assert file.read() == snapshot
+    assert len(DataSerializer.journal(data_file)) == 1
+
+
+def test_journal_sort_replay(data_file):
+    """Тест воспроизведения сортировки из журнала, записанного прежней версией."""
+    DataSerializer.save([Note("B", "Content"), Note("A", "Content"), Note("C", "Content")], data_file)
+    DataSerializer.journal(data_file).append({"op": "sort", "key": "title"})
+
+    assert [note.title for note in DataSerializer.load(data_file)] == ["A", "B", "C"]
+
+
+def test_compaction_clears_journal(data_file):
+    """Тест сворачивания журнала в новый снимок."""
+    notes = []
+    DataSerializer.save(notes, data_file)
+    for i in range(3):
+        note = Note(f"Note {i}", "Content")
+        notes.append(note)
+        DataSerializer.record_add(note, data_file)
+    assert len(DataSerializer.journal(data_file)) == 3
+
+    DataSerializer.save(notes, data_file)
+    assert len(DataSerializer.journal(data_file)) == 0
+    assert len(DataSerializer.load(data_file)) == 3
+
+
+def test_truncated_journal_line_is_ignored(data_file):
+    """Тест пропуска оборванной последней записи журнала."""
+    DataSerializer.save([], data_file)
+    DataSerializer.record_add(Note("A", "Content"), data_file)
+    with open(DataSerializer.journal(data_file).path, "a", encoding="utf-8") as file:
+        file.write('{"op": "add", "note": {"ti')
+
+    assert [note.title for note in DataSerializer.load(data_file)] == ["A"]
+
+    # Следующая запись не должна склеиться с оборванной строкой
+    DataSerializer._journals.clear()
+    DataSerializer.record_add(Note("B", "Content"), data_file)
+    assert [note.title for note in DataSerializer.load(data_file)] == ["A", "B"]
+
+
+def test_legacy_snapshot_gets_persistent_ids(data_file):
+    """Тест присвоения постоянных идентификаторов заметкам из файла старого формата."""
+    legacy = Note("A", "Content").to_dict()
+    del legacy["id"]
+    with open(data_file, "w", encoding="utf-8") as file:
+        json.dump([legacy], file)
+
+    first = DataSerializer.load(data_file)
+    second = DataSerializer.load(data_file)
+    assert first[0].id == second[0].id
@@ -0,0 +1,118 @@
+from note import Note
+from note_store import NoteStore
+from note_list_model import NoteFilter, NoteListModel, NoteIdRole
+from note_query import NoteQuery, QueryResult
+
+
+def make_store():
+    """Создаёт хранилище с тремя заметками."""
+    return NoteStore([
+        Note("Бета", "Текст", category="Работа"),
+        Note("Альфа", "Текст", category="Дом"),
+        Note("Гамма", "Текст", category="Работа"),
+    ])
+
+
+def titles(model):
+    """Возвращает заголовки заметок в порядке строк модели."""
+    return [model.note_at(model.index(row)).title for row in range(model.rowCount())]
+
+
+def test_filter_category_search_and_sort():
+    """Тест совместной фильтрации по категории, поиску и сортировки."""
+    store = make_store()
+    note_filter = NoteFilter()
+    note_filter.category = "Работа"
+    note_filter.sort_key = "title"
+    assert [store.get(note_id).title for note_id in note_filter.apply(store)] == ["Бета", "Гамма"]
+
+    gamma = [note for note in store if note.title == "Гамма"][0]
+    note_filter.set_search([gamma.id])
+    assert note_filter.apply(store) == [gamma.id]
+
+
+def test_model_display_and_id_roles():
+    """Тест данных модели для отображения и идентификатора."""
+    store = make_store()
+    model = NoteListModel(store)
+    index = model.index(0)
+    note = model.note_at(index)
+    assert model.data(index) == NoteListModel.display_text(note)
+    assert model.data(index, NoteIdRole) == note.id
+
+
+def test_model_row_level_signals():
+    """Тест вставки и удаления одной строки без сброса модели."""
+    store = make_store()
+    model = NoteListModel(store)
+    model.filter.sort_key = "title"
+    model.refresh()
+    events = []
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("inserted", first)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(("removed", first)))
+    model.modelReset.connect(lambda: events.append(("reset",)))
+
+    note = Note("Багет", "Текст")
+    store.add(note)
+    model.note_added(note)
+    assert titles(model) == ["Альфа", "Багет", "Бета", "Гамма"]
+
+    store.remove(note.id)
+    model.note_removed(note.id)
+    assert titles(model) == ["Альфа", "Бета", "Гамма"]
+    assert events == [("inserted", 1), ("removed", 1)]
+
+
+def test_model_change_moves_row_when_order_breaks():
+    """Тест перемещения строки, если изменение нарушает порядок сортировки."""
+    store = make_store()
+    model = NoteListModel(store)
+    model.filter.sort_key = "title"
+    model.refresh()
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append(first.row()))
+
+    alpha = model.note_at(model.index(0))
+    alpha.content = "Новый текст"
+    model.note_changed(alpha)
+    assert changed == [0]
+
+    alpha.title = "Дельта"
+    model.note_changed(alpha)
+    assert titles(model) == ["Бета", "Гамма", "Дельта"]
+
+
+def test_model_defers_sort_while_loading():
+    """Тест: порции загрузки при сортировке добавляются без пересчёта, порядок восстанавливает refresh()."""
+    store = NoteStore()
+    model = NoteListModel(store)
+    model.filter.sort_key = "title"
+    model.refresh()
+    store.subscribe(model.apply_events)
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    store.load([Note("Гамма", "Текст"), Note("Альфа", "Текст")])
+    store.load([Note("Бета", "Текст"), Note("Дельта", "Текст")])
+    assert not resets and model.unordered
+    assert titles(model) == ["Гамма", "Альфа", "Бета", "Дельта"]
+
+    model.refresh()
+    assert titles(model) == ["Альфа", "Бета", "Гамма", "Дельта"] and not model.unordered
+
+    with store.batch():
+        store.add(Note("Ашан", "Текст"))
+        store.add(Note("Вяз", "Текст"))
+    assert titles(model) == ["Альфа", "Ашан", "Бета", "Вяз", "Гамма", "Дельта"]
+
+
+def test_show_result_skips_removed_notes():
+    """Тест: результат запроса, вычисленный до удаления заметки, не возвращает её в список."""
+    store = make_store()
+    model = NoteListModel(store)
+    ids = [note.id for note in store]
+    store.remove(ids[1])
+
+    model.show_result(QueryResult(NoteQuery(text="текст"), ids, len(ids), ["search"]))
+    assert [model.data(model.index(row), NoteIdRole) for row in range(model.rowCount())] == [ids[0], ids[2]]
+    assert model.filter.search_ids == [ids[0], ids[2]]
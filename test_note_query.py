@@ -0,0 +1,111 @@
+import datetime
+import threading
+import pytest
+from note import Note
+from note_store import NoteStore
+from note_category import CategoryIndex
+from note_table import NoteTable
+from note_query import NoteQuery, QueryPlanner
+from search_index import SearchIndex
+
+
+def make_planner():
+    notes = [Note("Отчёт Бета", "квартал", category="Работа"), Note("Отчёт дом", "ремонт", category="Дом"),
+             Note("Альфа", "отчёт отчёт", category="Работа"), Note("Список", "покупки", category="Финансы")]
+    for day, note in enumerate(notes, start=1):
+        note._created_at = f"2024-01-0{day}T00:00:00"
+    store = NoteStore()
+    index = SearchIndex()
+    for note in notes:
+        index.add(note)
+    planner = QueryPlanner(NoteTable(), CategoryIndex(), index)
+    store.subscribe(planner.apply_events)
+    store.load(notes)
+    return planner, store, notes
+
+
+def test_text_category_and_sort():
+    """Тест сочетания поиска, фильтра по категории и сортировки."""
+    planner, _, notes = make_planner()
+
+    by_rank = planner.execute(NoteQuery("отчёт", categories={"Работа"}))
+    assert by_rank.ids == [notes[0].id, notes[2].id]  # Совпадение в заголовке весит больше
+    assert planner.execute(by_rank.query.replace(descending=True)).ids == [notes[2].id, notes[0].id]
+    by_title = planner.execute(NoteQuery("отчёт", categories={"Работа"}, sort="title"))
+    assert by_title.ids == [notes[2].id, notes[0].id]
+    by_date = planner.execute(NoteQuery("отчёт", categories={"Работа", "Дом"}, sort="created_at", descending=True))
+    assert by_date.ids == [notes[2].id, notes[1].id, notes[0].id]
+    assert planner.execute(NoteQuery(categories={"Работа"}, sort="title")).ids == [notes[2].id, notes[0].id]
+
+
+def test_selective_index_goes_first(monkeypatch):
+    """Тест выбора плана: маленькая категория ограничивает поиск, иначе категории проверяются после поиска."""
+    planner, _, notes = make_planner()
+    monkeypatch.setattr(planner.search_index, "estimate", lambda query, cap=None: 100)
+    result = planner.execute(NoteQuery("отчёт", categories={"Дом"}))
+    assert result.plan[:2] == ["categories", "search"]
+    assert result.ids == [notes[1].id]
+
+    monkeypatch.setattr(planner.search_index, "estimate", lambda query, cap=None: 0)
+    result = planner.execute(NoteQuery("отчёт", categories={"Работа"}))
+    assert result.plan[:2] == ["search", "categories"]
+    assert result.ids == [notes[0].id, notes[2].id]
+
+
+def test_date_range():
+    """Тест отбора по диапазону дат создания."""
+    planner, _, notes = make_planner()
+    query = NoteQuery(created_from=datetime.datetime(2024, 1, 2), created_to=datetime.datetime(2024, 1, 3))
+    assert planner.execute(query).ids == [notes[1].id, notes[2].id]
+    assert planner.execute(query.replace(categories={"Работа"})).ids == [notes[2].id]
+
+
+def test_pagination_and_cache():
+    """Тест страниц результатов, кэша и его очистки при изменении заметок."""
+    planner, store, notes = make_planner()
+    query = NoteQuery(sort="title", limit=2)
+
+    first = planner.execute(query)
+    second = planner.execute(query.replace(offset=2))
+    assert first.total == second.total == 4
+    assert first.ids + second.ids == [notes[2].id, notes[0].id, notes[1].id, notes[3].id]
+    assert (planner.misses, planner.hits) == (1, 1)
+
+    store.add(Note("Бюджет", "", category="Финансы"))
+    assert planner.execute(query).total == 5
+    assert planner.misses == 2
+
+
+def test_changes_do_not_wait_for_search():
+    """Тест: удаление заметки не ждёт поиска, который идёт в другом потоке, а его результат не кэшируется."""
+    planner, store, notes = make_planner()
+    scanning, deleted = threading.Event(), threading.Event()
+
+    def cancelled():
+        # Вызывается поисковым индексом посреди перебора слов: поиск продолжится после удаления
+        scanning.set()
+        deleted.wait(5)
+        return False
+    results = []
+    thread = threading.Thread(target=lambda: results.append(planner.execute(NoteQuery("отчёт"), cancelled)))
+    thread.start()
+    assert scanning.wait(5)
+
+    remover = threading.Thread(target=store.remove, args=(notes[1].id,))
+    remover.start()
+    remover.join(2)
+    waited = remover.is_alive()
+    deleted.set()
+    thread.join(5)
+    remover.join(5)
+
+    assert not waited  # Удаление не ждало окончания поиска
+    assert results[0] is not None and planner.misses == 1
+    assert notes[1].id not in planner.execute(NoteQuery("отчёт")).ids
+    assert planner.misses == 2  # Результат, вычисленный во время изменения, не кэширован
+
+
+def test_unknown_sort():
+    """Тест: неизвестный ключ сортировки отклоняется."""
+    with pytest.raises(ValueError):
+        NoteQuery(sort="size")
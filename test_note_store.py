@@ -0,0 +1,59 @@
+import pytest
+from note import Note
+from note_store import NoteStore
+from note_category import NoteCategory
+
+
+def test_store_add_get_remove():
+    """Тест добавления, поиска и удаления заметки по идентификатору."""
+    store = NoteStore()
+    note = Note("Title", "Content")
+    store.add(note)
+
+    assert len(store) == 1
+    assert note.id in store
+    assert store.get(note.id) is note
+
+    assert store.remove(note.id) is note
+    assert store.get(note.id) is None
+    with pytest.raises(KeyError):
+        store.remove(note.id)
+
+
+def test_store_rejects_duplicates_and_non_notes():
+    """Тест ошибок при добавлении дубликата и объекта не типа Note."""
+    note = Note("Title", "Content")
+    store = NoteStore([note])
+    with pytest.raises(ValueError):
+        store.add(note)
+    with pytest.raises(ValueError):
+        store.add("not a note")
+
+
+def test_store_update_keeps_position():
+    """Тест замены заметки с сохранением её позиции."""
+    first, second = Note("A", "Content"), Note("B", "Content")
+    store = NoteStore([first, second])
+    replacement = Note.from_dict(dict(first.to_dict(), title="A2"))
+    store.update(replacement)
+
+    assert [note.title for note in store] == ["A2", "B"]
+
+
+def test_store_sort():
+    """Тест сортировки заметок хранилища."""
+    store = NoteStore([Note("B", "Content"), Note("A", "Content")])
+    store.sort(key=lambda note: note.title)
+    assert [note.title for note in store] == ["A", "B"]
+
+
+def test_category_addresses_notes_by_id():
+    """Тест работы категории с заметками по идентификатору."""
+    category = NoteCategory("Работа")
+    first, second = Note("Same", "Content"), Note("Same", "Content")
+    category.add_note(first)
+    category.add_note(second)
+
+    category.remove_note(first.id)
+    assert category.get_note(first.id) is None
+    assert category.get_notes() == [second]
@@ -0,0 +1,63 @@
+import datetime
+from note import Note
+from note_table import NoteTable, to_micros
+
+
+def make_note(title, category, created):
+    """Создаёт заметку с заданной датой создания."""
+    return Note.from_dict({"id": title, "title": title, "content": "Текст", "category": category,
+                           "created_at": created, "modified_at": created})
+
+
+def make_table():
+    """Создаёт таблицу с четырьмя заметками."""
+    return NoteTable([
+        make_note("Бета", "Работа", "2024-12-14T10:00:00"),
+        make_note("Альфа", "Дом", "2024-12-14T09:00:00"),
+        make_note("Гамма", "Работа", "2024-12-14T08:00:00"),
+        make_note("Дельта", "Своя категория", "2024-12-14T11:00:00"),
+    ])
+
+
+def test_filter_and_sort_return_permutations():
+    """Тест фильтрации и сортировки без изменения порядка строк."""
+    table = make_table()
+    assert table.view() == ["Бета", "Альфа", "Гамма", "Дельта"]
+    assert table.view(category="Работа", sort="title") == ["Бета", "Гамма"]
+    assert table.view(sort="created_at") == ["Гамма", "Альфа", "Бета", "Дельта"]
+    assert table.view(sort="created_at", descending=True) == ["Дельта", "Бета", "Альфа", "Гамма"]
+    assert table.view(category="Своя категория") == ["Дельта"]
+    assert table.view(category="Финансы") == []
+    assert table.ids == ["Бета", "Альфа", "Гамма", "Дельта"]
+
+
+def test_view_restricted_to_ids_keeps_their_order():
+    """Тест ограничения набором идентификаторов (результатами поиска)."""
+    table = make_table()
+    assert table.view(note_ids=["Гамма", "Альфа", "Бета"], category="Работа") == ["Гамма", "Бета"]
+    assert table.view(note_ids=["Гамма", "Альфа"], sort="title") == ["Альфа", "Гамма"]
+
+
+def test_update_and_remove():
+    """Тест обновления и удаления строк."""
+    table = make_table()
+    note = make_note("Альфа", "Дом", "2024-12-14T09:00:00")
+    note.title = "Яблоко"
+    note.category = "Работа"
+    table.update(note)
+    assert table.view(category="Работа", sort="title") == ["Бета", "Гамма", "Альфа"]
+
+    table.remove("Бета")
+    table.remove("Гамма")
+    table.remove("Гамма")
+    assert table.view(sort="title") == ["Дельта", "Альфа"]
+    assert len(table) == 2
+    assert table.count("Работа") == 1
+
+
+def test_to_micros_with_time_zone():
+    """Тест: дата с часовым поясом переводится в местное время, как даты заметок."""
+    assert to_micros("1970-01-01T00:00:01") == 1_000_000
+    aware = "2024-01-01T10:00:00+03:00"
+    local = datetime.datetime.fromisoformat(aware).astimezone().replace(tzinfo=None)
+    assert to_micros(aware) == to_micros(local) == to_micros(local.isoformat())
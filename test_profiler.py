@@ -0,0 +1,56 @@
+import json
+from note import Note
+from data_serializer import DataSerializer
+from profiler import Profiler, profiler
+
+
+def test_disabled_profiler_records_nothing():
+    """Тест: выключенные замеры ничего не копят и не создают объектов на каждый этап."""
+    local = Profiler()
+    with local.stage("load"):
+        local.count("notes_loaded", 10)
+    assert local.stage("a") is local.stage("b")
+    assert local.stats() == {"stages": {}, "counters": {}}
+
+
+def test_stages_counters_and_trace(tmp_path):
+    """Тест сводки по этапам, счётчиков и выгрузки трассировки Chrome Trace."""
+    local = Profiler()
+    local.enable(interval=0)
+    for _ in range(3):
+        with local.stage("parse", chunk=1):
+            local.count("notes_loaded", 5)
+    stats = local.stats()
+    assert stats["stages"]["parse"]["count"] == 3
+    assert stats["counters"] == {"notes_loaded": 15}
+    assert "parse" in local.summary()
+
+    trace_file = str(tmp_path / "trace.json")
+    local.export_trace(trace_file)
+    with open(trace_file, encoding="utf-8") as file:
+        events = json.load(file)["traceEvents"]
+    assert [event["ph"] for event in events if event["name"] == "parse"] == ["X"] * 3
+    assert events[-1]["args"] == {"chunk": 1}
+
+
+def test_configure_from_env():
+    """Тест включения замеров переменными окружения."""
+    local = Profiler()
+    local.configure_from_env({"NOTEAPP_PROFILE": "0"})
+    assert not local.enabled
+    local.configure_from_env({"NOTEAPP_TRACE": "trace.json"})
+    assert local.enabled and local.trace_file == "trace.json"
+
+
+def test_save_counts_bytes_written(tmp_path):
+    """Тест: сохранение снимка и запись журнала увеличивают счётчик записанных байт."""
+    path = str(tmp_path / "notes.json")
+    profiler.reset()
+    profiler.enable(interval=0)
+    try:
+        DataSerializer.save_to_file([Note("A", "Текст")], path)
+        DataSerializer.record_delete("x", path)
+        assert profiler.stats()["counters"]["bytes_written"] > 0
+    finally:
+        profiler.disable()
+        profiler.reset()
@@ -0,0 +1,54 @@
+from note import Note
+from note_store import NoteStore
+from note_list_model import NoteListModel, NoteIdRole
+from render_cache import RenderCache
+
+
+def test_hits_misses_and_lru_bound():
+    """Тест попаданий и промахов кэша и вытеснения давно не показанных заметок."""
+    calls = []
+    cache = RenderCache(lambda note: calls.append(note.id) or note.title.upper(), size=2)
+    first, second, third = Note("a", ""), Note("b", ""), Note("c", "")
+
+    assert cache.get(first) == "A"
+    assert cache.get(first) == "A"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get(second)
+    cache.get(first)  # Первая заметка становится недавней, вытесняется вторая
+    cache.get(third)
+    assert len(cache) == 2
+    cache.get(first)
+    cache.get(second)
+    assert calls == [first.id, second.id, third.id, second.id]
+
+
+def test_mutation_invalidates():
+    """Тест: изменение заметки (дата изменения и событие хранилища) строит строку заново."""
+    note = Note("Заголовок", "Текст")
+    store = NoteStore([note])
+    cache = RenderCache(lambda item: f"{item.title} ({item.category})")
+    store.subscribe(cache.apply_events)
+    assert cache.get(note) == "Заголовок (Разное)"
+
+    note.category = "Дом"
+    assert len(cache) == 0
+    assert cache.get(note) == "Заголовок (Дом)"
+
+    store.remove(note.id)
+    assert len(cache) == 0
+
+
+def test_model_refresh_reuses_labels():
+    """Тест: повторный пересчёт списка не форматирует строки неизменённых заметок."""
+    store = NoteStore([Note(f"Заметка {number}", "") for number in range(5)])
+    model = NoteListModel(store)
+    store.subscribe(model.apply_events)
+    labels = [model.data(model.index(row)) for row in range(model.rowCount())]
+    model.refresh()
+    assert [model.data(model.index(row)) for row in range(model.rowCount())] == labels
+    assert (model.labels.hits, model.labels.misses) == (5, 5)
+
+    store.get(model.data(model.index(0), NoteIdRole)).title = "Другая"
+    assert model.data(model.index(0)).startswith("Другая")
+    assert model.labels.misses == 6
@@ -0,0 +1,84 @@
+from note import Note
+from search_index import SearchIndex, tokenize
+
+
+def test_tokenize_russian():
+    """Тест разбиения на слова с учётом русского языка."""
+    assert tokenize("Ёлка, ЗАДАЧИ и встречи!") == ["елка", "задачи", "и", "встречи"]
+
+
+def test_search_by_title_and_content_prefix():
+    """Тест поиска по префиксу в заголовке и содержимом."""
+    work = Note("Проект", "Задачи и встречи", category="Работа")
+    sport = Note("Тренировки", "Расписание и цели")
+    index = SearchIndex()
+    index.add(work)
+    index.add(sport)
+
+    assert index.search("встр") == [work.id]
+    assert index.search("трен") == [sport.id]
+    assert index.search("проект задач") == [work.id]
+    assert index.search("проект цели") == []
+    assert index.search("  ") == []
+
+
+def test_search_ranks_title_matches_first():
+    """Тест ранжирования: совпадение в заголовке важнее совпадения в тексте."""
+    in_content = Note("Заметка", "Отчёт готов")
+    in_title = Note("Отчёт", "Текст")
+    index = SearchIndex()
+    index.add(in_content)
+    index.add(in_title)
+
+    assert index.search("отчет") == [in_title.id, in_content.id]
+    assert index.search("отчет", limit=1) == [in_title.id]
+
+
+def test_incremental_update_and_remove():
+    """Тест обновления индекса при изменении и удалении заметки."""
+    note = Note("Старый", "Текст")
+    index = SearchIndex()
+    index.add(note)
+
+    note.title = "Новый"
+    index.update(note)
+    assert index.search("старый") == []
+    assert index.search("новый") == [note.id]
+
+    index.remove(note.id)
+    assert index.search("новый") == []
+    assert len(index) == 0
+
+
+def test_save_load_and_sync(tmp_path):
+    """Тест сохранения индекса и синхронизации с изменившимися заметками."""
+    kept, edited, deleted = Note("Один", "Текст"), Note("Два", "Текст"), Note("Три", "Текст")
+    index = SearchIndex()
+    for note in (kept, edited, deleted):
+        index.add(note)
+    path = str(tmp_path / "notes.json.index")
+    index.save(path)
+
+    edited.title = "Четыре"
+    added = Note("Пять", "Текст")
+    loaded = SearchIndex.load(path)
+    loaded.sync([kept, edited, added])
+
+    assert loaded.search("один") == [kept.id]
+    assert loaded.search("четыре") == [edited.id]
+    assert loaded.search("пять") == [added.id]
+    assert loaded.search("три") == []
+    assert loaded.search("два") == []
+
+
+def test_search_within_candidates_and_cancel():
+    """Тест поиска среди заданных заметок и отмены поиска."""
+    notes = [Note("Отчёт", "Работа"), Note("Отчёт по работе", "Текст"), Note("Дом", "Работа")]
+    index = SearchIndex()
+    for note in notes:
+        index.add(note)
+
+    full = index.search("раб")
+    assert index.search("работ", candidates=full) == index.search("работ")
+    assert index.search("раб отч", candidates=full) == index.search("раб отч")
+    assert index.search("раб", cancelled=lambda: True) is None
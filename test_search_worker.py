@@ -0,0 +1,93 @@
+import time
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from note import Note
+from note_category import CategoryIndex
+from note_query import NoteQuery, QueryPlanner
+from note_table import NoteTable
+from search_index import SearchIndex, is_refinement
+from search_worker import SearchWorker
+
+
+@pytest.fixture
+def app():
+    """Приложение Qt для доставки сигналов."""
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def make_index():
+    notes = [Note("Работа", "Отчёт за квартал"), Note("Рабочий план", "Задачи"), Note("Дом", "Ремонт")]
+    index = SearchIndex()
+    for note in notes:
+        index.add(note)
+    return index, notes
+
+
+def make_worker(index, notes):
+    return SearchWorker(QueryPlanner(NoteTable(notes), CategoryIndex(notes), index))
+
+
+def wait_for(app, condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_is_refinement():
+    """Тест распознавания запроса, уточняющего предыдущий."""
+    assert is_refinement("раб", "рабоч")
+    assert is_refinement("раб", "раб отч")
+    assert not is_refinement("рабоч", "раб")
+    assert not is_refinement("раб отч", "раб дом")
+    assert not is_refinement("", "раб")
+
+
+def test_typing_delivers_only_latest_results(app):
+    """Тест: серия изменений запроса даёт один поиск, доставляются только последние результаты."""
+    index, notes = make_index()
+    worker = make_worker(index, notes)
+    received = []
+    worker.results_ready.connect(received.append)
+    for query in ("р", "ра", "раб", "рабоч"):
+        worker.search(NoteQuery(query))
+    wait_for(app, lambda: received)
+    worker.shutdown()
+
+    assert [result.ids for result in received] == [[notes[1].id]]
+
+
+def test_refined_query_searches_previous_results(app, monkeypatch):
+    """Тест уточнения: поиск идёт только среди результатов предыдущего запроса."""
+    index, notes = make_index()
+    worker = make_worker(index, notes)
+    received, candidates = [], []
+    search = index.search
+    monkeypatch.setattr(index, "search", lambda query, **kwargs: candidates.append(kwargs["candidates"]) or search(query, **kwargs))
+    worker.results_ready.connect(received.append)
+
+    worker.search_now(NoteQuery("раб"))
+    wait_for(app, lambda: len(received) == 1)
+    worker.search_now(NoteQuery("рабоч"))
+    wait_for(app, lambda: len(received) == 2)
+    index.add(Note("Рабочая встреча", ""))  # Индекс изменился: прежние результаты больше не подходят
+    worker.search_now(NoteQuery("рабоча"))
+    wait_for(app, lambda: len(received) == 3)
+    worker.shutdown()
+
+    assert candidates[0] is None
+    assert sorted(candidates[1]) == sorted([notes[0].id, notes[1].id])
+    assert candidates[2] is None
+    assert received[1].ids == [notes[1].id]
+    assert len(received[2].ids) == 1 and received[2].ids != [notes[1].id]
+
+
+def test_empty_query_shows_all_notes(app):
+    """Тест: запрос без текста выполняется сразу и возвращает все заметки."""
+    index, notes = make_index()
+    worker = make_worker(index, notes)
+    received = []
+    worker.results_ready.connect(received.append)
+    worker.search_now(NoteQuery("  "))
+    worker.shutdown()
+    assert [result.ids for result in received] == [[note.id for note in notes]]
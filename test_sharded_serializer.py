@@ -0,0 +1,130 @@
+import json
+import os
+import pytest
+from note import Note
+from data_serializer import DataSerializer
+from file_lock import FileLock
+from search_index import SearchIndex
+from sharded_serializer import ShardedSerializer, SHARD_BY_CATEGORY, SHARD_BY_HASH
+
+
+@pytest.fixture
+def shards_dir(tmp_path, monkeypatch):
+    """Каталог частей; по умолчанию всё выполняется в текущем процессе."""
+    monkeypatch.setattr(ShardedSerializer, "WORKERS", 1)
+    monkeypatch.setattr(ShardedSerializer, "_layouts", {})
+    monkeypatch.setattr(ShardedSerializer, "_locations", {})
+    return str(tmp_path / "notes.shards")
+
+
+def make_notes(count=40):
+    categories = ["Работа", "Дом", "Финансы"]
+    return [Note(f"Заметка {number}", f"текст {number} слово{number % 5}", category=categories[number % 3])
+            for number in range(count)]
+
+
+def test_hash_shards_roundtrip_and_journal(shards_dir):
+    """Тест разбиения по хэшу: сохранение, записи журнала по частям и загрузка."""
+    notes = make_notes(200)  # При 40 заметках часть из восьми изредка остаётся пустой
+    ShardedSerializer.save(notes, shards_dir)
+    assert len(ShardedSerializer.shard_paths(shards_dir)) == ShardedSerializer.SHARDS
+    for path in ShardedSerializer.shard_paths(shards_dir):
+        assert len(DataSerializer.load(path)) < len(notes)  # Каждая часть загружается отдельно
+
+    added = Note("Новая", "текст")
+    notes[0].title = "Изменённая"
+    ShardedSerializer.record_many([{"op": "add", "note": added.to_dict()},
+                                   {"op": "update", "note": notes[0].to_dict()},
+                                   {"op": "delete", "id": notes[1].id}], shards_dir)
+
+    loaded = {note.id: note for note in ShardedSerializer.load(shards_dir)}
+    assert set(loaded) == {note.id for note in notes[2:]} | {added.id, notes[0].id}
+    assert loaded[notes[0].id].title == "Изменённая"
+
+
+def test_hash_delete_in_missing_shard(shards_dir):
+    """Тест: удаление заметки из части, которой ещё нет, ничего не записывает и не падает."""
+    note = Note("Первая", "текст")
+    ShardedSerializer.save([note], shards_dir)
+    missing = next(f"unknown{number}" for number in range(100)
+                   if ShardedSerializer.shard_name(ShardedSerializer.layout(shards_dir), f"unknown{number}", "")
+                   not in ShardedSerializer.layout(shards_dir)["shards"])
+
+    ShardedSerializer.record_delete(missing, shards_dir)
+    assert len(ShardedSerializer.shard_paths(shards_dir)) == 1
+    assert [loaded.id for loaded in ShardedSerializer.load(shards_dir)] == [note.id]
+
+
+def test_category_shards_move_notes(shards_dir, monkeypatch):
+    """Тест разбиения по категории: смена категории переносит заметку в другую часть."""
+    monkeypatch.setattr(ShardedSerializer, "SHARD_BY", SHARD_BY_CATEGORY)
+    notes = make_notes(6)
+    ShardedSerializer.save(notes, shards_dir)
+    assert [os.path.basename(path) for path in ShardedSerializer.shard_paths(shards_dir)] == \
+        ["дом.json", "работа.json", "финансы.json"]
+
+    notes[0].category = "Здоровье и Спорт"
+    ShardedSerializer.record_update(notes[0], shards_dir)
+    assert os.path.exists(ShardedSerializer.shard_path(shards_dir, "здоровье_и_спорт"))
+
+    # Другой процесс (без загруженных заметок) не знает прежнюю часть заметки
+    monkeypatch.setattr(ShardedSerializer, "_layouts", {})
+    monkeypatch.setattr(ShardedSerializer, "_locations", {})
+    notes[1].category = "Работа"
+    ShardedSerializer.record_update(notes[1], shards_dir)
+
+    loaded = ShardedSerializer.load(shards_dir)
+    assert sorted(note.id for note in loaded) == sorted(note.id for note in notes)
+    assert {note.id: note.category for note in loaded}[notes[1].id] == "Работа"
+    paths = ShardedSerializer.shard_paths(shards_dir)
+    assert sum(len(DataSerializer.load(path)) for path in paths) == len(notes)
+
+
+def test_resave_changes_layout(shards_dir, monkeypatch):
+    """Тест: полное сохранение с другими настройками переразбивает заметки и удаляет старые части."""
+    notes = make_notes()
+    ShardedSerializer.save(notes, shards_dir)
+    monkeypatch.setattr(ShardedSerializer, "SHARDS", 2)
+    ShardedSerializer.save(notes, shards_dir)
+
+    files = [name for name in os.listdir(shards_dir) if not name.endswith(FileLock.SUFFIX)]
+    assert sorted(files) == ["00.json", "01.json", ShardedSerializer.MANIFEST]
+    with open(os.path.join(shards_dir, ShardedSerializer.MANIFEST), encoding="utf-8") as file:
+        assert json.load(file)["count"] == 2
+    assert sorted(note.id for note in ShardedSerializer.load(shards_dir)) == sorted(note.id for note in notes)
+
+
+def test_parallel_load_index_and_export(shards_dir, tmp_path, monkeypatch):
+    """Тест параллельной загрузки, построения индекса и выгрузки в нескольких процессах."""
+    notes = make_notes()
+    ShardedSerializer.save(notes, shards_dir)
+    sequential = ShardedSerializer.load(shards_dir)
+    monkeypatch.setattr(ShardedSerializer, "WORKERS", 2)
+
+    loaded = ShardedSerializer.load(shards_dir)
+    assert [note.to_dict() for note in loaded] == [note.to_dict() for note in sequential]
+
+    index = ShardedSerializer.search_index(loaded, shards_dir)
+    expected = SearchIndex()
+    for note in notes:
+        expected.add(note)
+    assert len(index) == len(notes)
+    assert sorted(index.search("слово3")) == sorted(expected.search("слово3"))
+
+    output = str(tmp_path / "export.json")
+    ShardedSerializer.export_json(shards_dir, output)
+    reference = str(tmp_path / "reference.json")
+    DataSerializer.export_json(sequential, reference)
+    with open(output, encoding="utf-8") as file, open(reference, encoding="utf-8") as expected_file:
+        assert file.read() == expected_file.read()
+
+
+def test_migrate_from_json(shards_dir, tmp_path):
+    """Тест однократного переноса заметок из JSON-файла в каталог частей."""
+    source = str(tmp_path / "notes.json")
+    notes = make_notes(10)
+    DataSerializer.save(notes, source)
+    assert ShardedSerializer.migrate_from_json(source, shards_dir) == 10
+    assert ShardedSerializer.migrate_from_json(source, shards_dir) == 0
+    assert ShardedSerializer.layout(shards_dir)["by"] == SHARD_BY_HASH
+    assert sorted(note.id for note in ShardedSerializer.load(shards_dir)) == sorted(note.id for note in notes)
@@ -0,0 +1,79 @@
+import pytest
+from note import Note
+from data_serializer import DataSerializer
+from sqlite_serializer import SqliteSerializer
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    """Путь к временной базе заметок."""
+    filename = str(tmp_path / "notes.db")
+    yield filename
+    SqliteSerializer.close(filename)
+
+
+def test_save_load_roundtrip(db_file):
+    """Тест сохранения и загрузки заметок через SQLite."""
+    notes = [Note("A", "Content A", category="Дом"), Note("B", "Content B")]
+    SqliteSerializer.save(notes, db_file)
+
+    loaded = SqliteSerializer.load(db_file)
+    assert [note.id for note in loaded] == [note.id for note in notes]
+    assert loaded[0].category == "Дом"
+    assert loaded[1].created_at == notes[1].created_at
+
+
+def test_row_level_changes(db_file):
+    """Тест построчного добавления, изменения и удаления."""
+    first, second = Note("A", "Content"), Note("B", "Content")
+    SqliteSerializer.save([first], db_file)
+    SqliteSerializer.record_add(second, db_file)
+    first.title = "A2"
+    SqliteSerializer.record_update(first, db_file)
+    SqliteSerializer.record_many([{"op": "delete", "id": second.id}], db_file)
+
+    assert [note.title for note in SqliteSerializer.load(db_file)] == ["A2"]
+
+
+def test_query_search_category_sort_and_paging(db_file):
+    """Тест поиска, фильтра по категории, сортировки и постраничного вывода в SQL."""
+    notes = [
+        Note("Проект Бета", "Задачи и встречи", category="Работа"),
+        Note("Проект Альфа", "Ёлка и подарки", category="Дом"),
+        Note("Отчёт", "Проектная документация", category="Работа"),
+    ]
+    SqliteSerializer.save(notes, db_file)
+
+    assert [n.title for n in SqliteSerializer.query(db_file, text="проект", categories=["Работа"], sort="title")] == \
+        ["Отчёт", "Проект Бета"]
+    assert [n.title for n in SqliteSerializer.query(db_file, text="елк")] == ["Проект Альфа"]
+    assert SqliteSerializer.query(db_file, text="проект")[0].title.startswith("Проект")
+    assert [n.title for n in SqliteSerializer.query(db_file, sort="title", limit=1, offset=1)] == ["Проект Альфа"]
+    assert SqliteSerializer.count(db_file, "Работа") == 2
+
+
+def test_query_without_fts_matches_word_prefixes(db_file, monkeypatch):
+    """Тест поиска через LIKE без FTS5: слова ищутся по началу, "_" и "%" не работают как шаблон."""
+    SqliteSerializer.save([
+        Note("Проект Бета", "Задачи и встречи"),
+        Note("Отчёт", "Подпроект, ёлка"),
+        Note("snake_case", "100% готово"),
+        Note("snakeXcase", "1000"),
+    ], db_file)
+    monkeypatch.setattr(SqliteSerializer, "has_fts", staticmethod(lambda filename: False))
+
+    assert [n.title for n in SqliteSerializer.query(db_file, text="проект")] == ["Проект Бета"]
+    assert [n.title for n in SqliteSerializer.query(db_file, text="елк")] == ["Отчёт"]
+    assert [n.title for n in SqliteSerializer.query(db_file, text="snake_c")] == ["snake_case"]
+    assert [n.title for n in SqliteSerializer.query(db_file, text="100%")] == ["snake_case", "snakeXcase"]
+
+
+def test_migrate_from_json(db_file, tmp_path):
+    """Тест однократного переноса заметок из JSON-файла."""
+    json_file = str(tmp_path / "notes.json")
+    notes = [Note(f"Note {i}", "Content") for i in range(5)]
+    DataSerializer.save(notes, json_file)
+
+    assert SqliteSerializer.migrate_from_json(json_file, db_file) == 5
+    assert SqliteSerializer.migrate_from_json(json_file, db_file) == 0
+    assert [note.id for note in SqliteSerializer.load(db_file)] == [note.id for note in notes]
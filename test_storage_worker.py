@@ -0,0 +1,101 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from note import Note
+from data_serializer import DataSerializer
+from storage_worker import StorageWorker
+
+
+@pytest.fixture
+def worker(tmp_path):
+    """Фоновое хранилище для временного файла данных."""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    storage = StorageWorker(str(tmp_path / "notes.json"))
+    yield storage
+    storage.shutdown()
+
+
+def test_burst_of_changes_is_written_once(worker):
+    """Тест объединения серии изменений в одну запись на диск."""
+    DataSerializer.save([], worker.filename)
+    note = Note("Title", "Content")
+    worker.record_add(note)
+    note.title = "Title 2"
+    worker.record_update(note)
+    assert len(DataSerializer.journal(worker.filename)) == 0  # Ещё ничего не записано
+
+    worker.flush().result()
+    assert len(DataSerializer.journal(worker.filename)) == 2
+    assert [n.title for n in DataSerializer.load(worker.filename)] == ["Title 2"]
+    assert worker.flush() is None  # Повторно записывать нечего
+
+
+def test_snapshot_replaces_pending_records(worker):
+    """Тест замены накопленных записей журнала полным снимком."""
+    notes = [Note("A", "Content"), Note("B", "Content")]
+    worker.record_add(notes[0])
+    worker.save_snapshot(notes)
+
+    worker.flush().result()
+    assert len(DataSerializer.journal(worker.filename)) == 0
+    assert [n.title for n in DataSerializer.load(worker.filename)] == ["A", "B"]
+
+
+def test_failed_load_blocks_snapshots(worker, monkeypatch):
+    """Тест: после ошибки загрузки снимок не записывается, изменения дописываются в журнал."""
+    notes = [Note("A", "Content"), Note("B", "Content")]
+    DataSerializer.save(notes, worker.filename)
+    with open(worker.filename, encoding="utf-8") as file:
+        snapshot = file.read()
+
+    def broken_load(filename):
+        yield notes[0]
+        raise OSError("Ошибка чтения")
+    monkeypatch.setattr(DataSerializer, "iter_load", broken_load)
+    finished, failed = [], []
+    worker.load_finished.connect(finished.append)
+    worker.failed.connect(failed.append)
+    worker.load()
+    worker.save_snapshot(notes[:1])
+    worker.record_add(Note("C", "Content"))
+    worker.flush().result()
+    QCoreApplication.processEvents()  # Сигналы рабочего потока доставляются через очередь событий
+
+    assert worker.load_error == "Ошибка чтения"
+    assert failed == ["Ошибка чтения"] and finished == []
+    with open(worker.filename, encoding="utf-8") as file:
+        assert file.read() == snapshot
+    assert len(DataSerializer.journal(worker.filename)) == 1
+
+
+def test_failed_snapshot_keeps_records(worker, monkeypatch):
+    """Тест: если снимок не записан, изменения, которые он должен был содержать, дописываются в журнал."""
+    DataSerializer.save([], worker.filename)
+    note = Note("A", "Content")
+    worker.record_add(note)
+    worker.save_snapshot([note])
+
+    def broken_save(data, filename):
+        raise TimeoutError("Файл занят другим процессом.")
+    monkeypatch.setattr(DataSerializer, "save", broken_save)
+    failed = []
+    worker.failed.connect(failed.append)
+    worker.flush().result()
+    QCoreApplication.processEvents()
+
+    assert failed == ["Файл занят другим процессом."]
+    assert [n.title for n in DataSerializer.load(worker.filename)] == ["A"]
+
+
+def test_failed_journal_write_is_retried(worker, monkeypatch):
+    """Тест: записи, которые не удалось дописать в журнал, записываются при следующей записи."""
+    DataSerializer.save([], worker.filename)
+    record_many = DataSerializer.record_many
+    monkeypatch.setattr(DataSerializer, "record_many", lambda records, filename: 1 / 0)
+    worker.record_add(Note("A", "Content"))
+    worker.flush().result()
+    assert DataSerializer.load(worker.filename) == []
+
+    monkeypatch.setattr(DataSerializer, "record_many", record_many)
+    worker.record_add(Note("B", "Content"))
+    worker.flush().result()
+    assert [n.title for n in DataSerializer.load(worker.filename)] == ["A", "B"]
@@ -0,0 +1,215 @@
+import contextlib
+import os
+import subprocess
+import sys
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from note import Note
+from note_events import NoteEvent
+from note_journal import NoteJournal
+from note_store import NoteStore
+from data_serializer import DataSerializer
+from file_lock import FileLock
+from storage_worker import StorageWorker
+from store_sync import StoreSync, SyncConflict
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    """Файл с тремя заметками; запись без fsync."""
+    monkeypatch.setattr(DataSerializer, "DURABILITY", "none")
+    filename = str(tmp_path / "notes.json")
+    DataSerializer.save([Note("Первая", "текст", "Дом"), Note("Вторая", "текст", "Работа"),
+                         Note("Третья", "текст", "Разное")], filename)
+    return filename
+
+
+def open_instance(filename):
+    """Хранилище «окна»: загрузка под блокировкой и запись своих изменений в журнал."""
+    store, records = NoteStore(), []
+    sync = StoreSync(store, filename)
+    with sync.lock():
+        store.load(DataSerializer.iter_load(filename))
+        sync.loaded()
+
+    def write(events):
+        for event in events:
+            if event.remote or event.kind == NoteEvent.LOADED:
+                continue
+            if event.kind == NoteEvent.REMOVED:
+                records.append(NoteJournal.delete_record(event.note_id))
+            else:
+                records.append(NoteJournal.update_record(event.note))
+        DataSerializer.record_many(records, filename)
+        records.clear()
+
+    store.subscribe(write)
+    return store, sync
+
+
+@contextlib.contextmanager
+def other_process(monkeypatch):
+    """Записи внутри блока выглядят как записи другого процесса."""
+    with monkeypatch.context() as patch:
+        patch.setattr(NoteJournal, "ORIGIN", "other")
+        yield
+
+
+def by_title(store, title):
+    return next(note for note in store if note.title == title)
+
+
+def test_lock_excludes_other_process(tmp_path):
+    """Тест: блокировку, захваченную другим процессом, не получить, пока он её не отпустит."""
+    filename = str(tmp_path / "notes.json")
+    code = ("import sys\nfrom file_lock import FileLock\n"
+            "lock = FileLock(sys.argv[1])\nlock.acquire()\nprint('locked', flush=True)\n"
+            "sys.stdin.readline()\nlock.release()\n")
+    child = subprocess.Popen([sys.executable, "-c", code, filename], stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    try:
+        assert child.stdout.readline().strip() == "locked"
+        lock = FileLock(filename)
+        assert not lock.acquire(timeout=0.05)
+        child.stdin.write("\n")
+        child.stdin.flush()
+        child.wait(timeout=10)
+        assert lock.acquire(timeout=5)
+        assert lock.acquire(timeout=0)  # Повторный захват в том же потоке не ждёт
+        lock.release()
+        lock.release()
+    finally:
+        child.kill()
+
+
+def test_poll_applies_only_foreign_records(data_file, monkeypatch):
+    """Тест: чужие записи журнала применяются без повторной записи, свои — пропускаются."""
+    store, sync = open_instance(data_file)
+    events = []
+    store.subscribe(events.extend)
+    assert not sync.changed()
+
+    by_title(store, "Первая").content = "своя правка"
+    assert sync.poll() == [] and not events[1:]
+
+    other = DataSerializer.load(data_file)
+    with other_process(monkeypatch):
+        DataSerializer.record_update(Note.from_dict(dict(other[1].to_dict(), title="Вторая*")), data_file)
+        DataSerializer.record_delete(other[2].id, data_file)
+        DataSerializer.record_add(Note("Новая", "из другого окна"), data_file)
+    journal_size = DataSerializer.journal(data_file).size()
+    assert sync.changed()
+    assert sync.poll() == []
+
+    assert sorted(note.title for note in store) == ["Вторая*", "Новая", "Первая"]
+    assert all(event.remote for event in events[1:])
+    assert DataSerializer.journal(data_file).size() == journal_size  # Чужие изменения не записаны повторно
+    assert not sync.changed()
+
+
+def test_concurrent_edits_converge(data_file, monkeypatch):
+    """Тест: правки разных полей сливаются, правки одного поля дают копию, оба окна приходят к одной версии."""
+    store, sync = open_instance(data_file)
+    with other_process(monkeypatch):
+        other_store, other_sync = open_instance(data_file)
+    first, second = by_title(store, "Первая"), by_title(store, "Вторая")
+    first.title = "Первая (здесь)"
+    second.title = "Вторая (здесь)"
+    with other_process(monkeypatch):
+        by_title(other_store, "Первая").content = "текст (там)"
+        by_title(other_store, "Вторая").title = "Вторая (там)"
+
+    assert sync.poll() == []  # Чужие записи сделаны после своих: сливает другое окно
+    with other_process(monkeypatch):
+        conflicts = other_sync.poll()
+    assert [(conflict.kind, conflict.note_id, conflict.fields) for conflict in conflicts] == \
+        [(SyncConflict.EDITED, second.id, ("title",))]
+    assert conflicts[0].copy.title == "Вторая (здесь)" + StoreSync.COPY_SUFFIX
+    assert sync.poll() == []
+
+    def state(notes):
+        return {note.id: (note.title, note.content, note.category) for note in notes}
+    assert state(store)[first.id] == ("Первая (здесь)", "текст (там)", "Дом")
+    assert state(store)[second.id] == ("Вторая (там)", "текст", "Работа")
+    assert state(store) == state(other_store) == state(DataSerializer.load(data_file))
+
+
+def test_delete_conflicts(data_file, monkeypatch):
+    """Тест: изменённая здесь заметка, удалённая в другом окне, сохраняется (и наоборот — восстанавливается)."""
+    store, sync = open_instance(data_file)
+    first, second = by_title(store, "Первая"), by_title(store, "Вторая")
+    with other_process(monkeypatch):
+        other = {note.id: note for note in DataSerializer.load(data_file)}
+        DataSerializer.record_delete(first.id, data_file)
+        other[second.id].content = "текст (там)"
+        DataSerializer.record_update(other[second.id], data_file)
+    first.category = "Финансы"
+    store.remove(second.id)
+
+    conflicts = sync.poll()
+    assert sorted((conflict.kind, conflict.note_id) for conflict in conflicts) == \
+        sorted([(SyncConflict.DELETED, first.id), (SyncConflict.RESTORED, second.id)])
+    assert store.get(first.id).category == "Финансы"
+    assert store.get(second.id).content == "текст (там)"
+    saved = {note.id: note.to_dict() for note in DataSerializer.load(data_file)}
+    assert saved[first.id]["category"] == "Финансы" and second.id in saved
+
+
+def test_foreign_snapshot_reload_and_guarded_save(data_file, monkeypatch):
+    """Тест: чужой снимок перезагружается сравнением, а свой снимок не затирает чужие записи."""
+    store, sync = open_instance(data_file)
+    with other_process(monkeypatch):
+        other = DataSerializer.load(data_file)
+        DataSerializer.record_update(Note.from_dict(dict(other[0].to_dict(), title="Первая*")), data_file)
+    assert not sync.save(store)  # В журнале чужая запись, которой ещё нет в хранилище
+    assert sync.poll() == []
+    assert sync.save(store)
+
+    generation = DataSerializer.generation(data_file)
+    with other_process(monkeypatch):
+        other = DataSerializer.load(data_file)
+        other[1].category = "Финансы"
+        DataSerializer.save(other[1:] + [Note("Из снимка", "")], data_file)
+    assert DataSerializer.generation(data_file) == generation + 1
+    assert sync.poll() == []
+    assert sorted((note.title, note.category) for note in store) == \
+        [("Вторая", "Финансы"), ("Из снимка", "Разное"), ("Третья", "Разное")]
+
+
+def test_snapshot_taken_before_poll_is_not_saved(data_file, monkeypatch):
+    """Тест: снимок, взятый до применения чужих изменений, не записывается и не теряет их."""
+    store, sync = open_instance(data_file)
+    notes, applied = list(store), sync.applied
+    with other_process(monkeypatch):
+        DataSerializer.record_add(Note("Новая", "из другого окна"), data_file)
+    assert sync.poll() == [] and sync.applied == applied + 1
+
+    assert not sync.save(notes, applied)
+    assert "Новая" in [note.title for note in DataSerializer.load(data_file)]
+    assert sync.save(list(store), sync.applied)
+    assert "Новая" in [note.title for note in DataSerializer.load(data_file)]
+
+
+def test_fetch_reads_without_changing_store(data_file, monkeypatch):
+    """Тест: fetch() только читает файл, хранилище меняет apply(), в том числе через фоновое хранилище."""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    store, sync = open_instance(data_file)
+    with other_process(monkeypatch):
+        DataSerializer.record_add(Note("Новая", "из другого окна"), data_file)
+
+    changes = sync.fetch()
+    assert "Новая" not in [note.title for note in store]
+    assert sync.apply(changes) == []
+    assert "Новая" in [note.title for note in store] and sync.applied == sync.fetched == 1
+
+    worker = StorageWorker(data_file, sync=sync)
+    fetched = []
+    worker.changes_fetched.connect(fetched.append)
+    with other_process(monkeypatch):
+        DataSerializer.record_delete(by_title(store, "Первая").id, data_file)
+    worker.poll()
+    worker.shutdown()
+    app.processEvents()  # Сигнал рабочего потока доставляется через очередь событий
+    assert len(fetched) == 1 and "Первая" in [note.title for note in store]
+    sync.apply(fetched[0])
+    assert "Первая" not in [note.title for note in store]